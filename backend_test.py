@@ -4,20 +4,1571 @@ Comprehensive Backend API Testing for School Management System
 Tests all endpoints with proper authentication and role-based access control
 """
 
+import argparse
+import asyncio
+import base64
+import codecs
+import copy
+import csv
+import hashlib
+import heapq
+import hmac
 import requests
 import json
+import math
+import mmap
+import os
+import random
+import re
+import socket
 import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from collections import OrderedDict, defaultdict
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlsplit
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 import uuid
 
+try:
+    import socketio
+except ImportError:  # optional: only --mode socket-load needs python-socketio
+    socketio = None
+try:
+    import aiohttp
+except ImportError:  # optional: only the asyncio load engine needs aiohttp
+    aiohttp = None
+try:
+    import bcrypt
+except ImportError:  # optional: --mode bench-auth times a local bcrypt reference when it is installed
+    bcrypt = None
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+
 # Configuration
 BASE_URL = "https://edumanage-ng.preview.emergentagent.com/api"
 HEADERS = {"Content-Type": "application/json"}
+POOL_SIZE = 10
+REQUEST_TIMEOUT = 30
+
+# Accounts registered by test_user_registration; load runs tag the emails per virtual user
+TEST_USERS = [
+    {
+        "role": "admin",
+        "name": "Admin User",
+        "email": "admin@school.edu.ng",
+        "password": "AdminPass123!",
+        "phoneNumber": "+2348012345678"
+    },
+    {
+        "role": "teacher", 
+        "name": "Teacher John",
+        "email": "teacher@school.edu.ng",
+        "password": "TeacherPass123!",
+        "phoneNumber": "+2348012345679"
+    },
+    {
+        "role": "parent",
+        "name": "Parent Mary",
+        "email": "parent@school.edu.ng", 
+        "password": "ParentPass123!",
+        "phoneNumber": "+2348012345680"
+    },
+    {
+        "role": "student",
+        "name": "Student David",
+        "email": "student@school.edu.ng",
+        "password": "StudentPass123!",
+        "phoneNumber": "+2348012345681"
+    }
+]
+
+# Platform developer account; auth/setup creates it once per deployment, so it is not registered like TEST_USERS
+DEVELOPER_USER = {
+    "role": "developer",
+    "name": "Platform Developer",
+    "email": "developer@school.edu.ng",
+    "password": "DeveloperPass123!"
+}
+
+# Seed data vocabulary: Nigerian names, a JSS/SSS class ladder and core subjects
+SEED_FIRST_NAMES = [
+    "Adebayo", "Chinedu", "Emeka", "Oluwaseun", "Ifeanyi", "Tunde", "Musa", "Ibrahim", "Yusuf", "Segun",
+    "Chiamaka", "Ngozi", "Aisha", "Funmilayo", "Blessing", "Amina", "Zainab", "Folake", "Nkechi", "Halima",
+    "Obinna", "Kelechi", "Babajide", "Damilola", "Temitope", "Uchenna", "Fatima", "Hauwa", "Efosa", "Osaze"
+]
+SEED_LAST_NAMES = [
+    "Okafor", "Adeyemi", "Balogun", "Nwosu", "Eze", "Abubakar", "Okonkwo", "Ogunleye", "Bello", "Danjuma",
+    "Olawale", "Chukwu", "Lawal", "Obi", "Adebanjo", "Mohammed", "Igwe", "Akinola", "Uzor", "Osagie",
+    "Nnamdi", "Afolabi", "Ogbonna", "Yakubu", "Ekwueme", "Fashola", "Oyelaran", "Umar", "Ibekwe", "Odum"
+]
+SEED_CLASS_LEVELS = [
+    ("JSS 1", "Junior Secondary 1"), ("JSS 2", "Junior Secondary 2"), ("JSS 3", "Junior Secondary 3"),
+    ("SSS 1", "Senior Secondary 1"), ("SSS 2", "Senior Secondary 2"), ("SSS 3", "Senior Secondary 3")
+]
+SEED_SUBJECTS = [
+    ("Mathematics", "MTH"), ("English Language", "ENG"), ("Basic Science", "BSC"), ("Civic Education", "CVE"),
+    ("Yoruba", "YOR"), ("Igbo", "IGB"), ("Hausa", "HAU"), ("Physics", "PHY"), ("Chemistry", "CHM"),
+    ("Biology", "BIO"), ("Economics", "ECO"), ("Government", "GOV"), ("Literature in English", "LIT"),
+    ("Agricultural Science", "AGR"), ("Computer Studies", "CMP"), ("Further Mathematics", "FMT")
+]
+TOKEN_STORE_PATH = "token_store.json"
+# Cached tokens this close to expiry are treated as expired
+TOKEN_EXPIRY_SKEW = 60
+
+SEED_PASSWORD = "SeedPass123!"
+SEED_STATE_PATH = "seed_state.json"
+SEED_TERM_START = "2024-09-09"
+
+# List endpoints that honour limit/skip, and the role allowed to read them
+PAGED_ENDPOINTS = {
+    "students": "admin",
+    "teachers": "admin",
+    "parents": "admin",
+    "attendance": "admin",
+    "notifications": "teacher"
+}
+
+# Fields app/api/search/route.js matches the query against, per entity type
+# (attendance matches through the joined student record)
+SEARCH_FIELDS = {
+    "students": ("firstName", "lastName", "email", "admissionNumber", "phoneNumber"),
+    "teachers": ("firstName", "lastName", "email", "employeeId", "phoneNumber", "specialization"),
+    "parents": ("name", "email", "phoneNumber"),
+    "attendance": ("firstName", "lastName", "admissionNumber", "status", "remarks"),
+    "classes": ("name", "description")
+}
+
+# Per-thread accumulator for time spent opening TCP/TLS connections, split into
+# DNS lookup, TCP handshake and TLS handshake
+_connect_timer = threading.local()
+
+
+def reset_connect_timer():
+    for name in ("elapsed", "dns", "tcp", "tls"):
+        setattr(_connect_timer, name, 0.0)
+    _connect_timer.count = 0
+
+
+class ConnectTimingMixin:
+    """Records how long connect() took, and how much of it was DNS and TCP (the rest is TLS)"""
+    def _new_conn(self):
+        started = time.perf_counter()
+        dns_host = self._dns_host
+        try:
+            addresses = [info[4][0] for info in socket.getaddrinfo(dns_host, self.port, type=socket.SOCK_STREAM)]
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        resolved = time.perf_counter()
+        _connect_timer.dns = getattr(_connect_timer, "dns", 0.0) + resolved - started
+        # Connect to the resolved addresses in turn, as create_connection would, so the lookup
+        # isn't repeated; TLS still verifies against self.host
+        try:
+            for address in dict.fromkeys(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    error = e
+            raise error
+        finally:
+            self._dns_host = dns_host
+            _connect_timer.tcp = getattr(_connect_timer, "tcp", 0.0) + time.perf_counter() - resolved
+
+    def connect(self):
+        started = time.perf_counter()
+        dns_tcp = getattr(_connect_timer, "dns", 0.0) + getattr(_connect_timer, "tcp", 0.0)
+        try:
+            super().connect()
+        finally:
+            elapsed = time.perf_counter() - started
+            opened = getattr(_connect_timer, "dns", 0.0) + getattr(_connect_timer, "tcp", 0.0) - dns_tcp
+            _connect_timer.elapsed = getattr(_connect_timer, "elapsed", 0.0) + elapsed
+            _connect_timer.tls = getattr(_connect_timer, "tls", 0.0) + max(elapsed - opened, 0.0)
+            _connect_timer.count = getattr(_connect_timer, "count", 0) + 1
+
+
+class TimedHTTPConnection(ConnectTimingMixin, HTTPConnection):
+    """HTTP connection that records how long connect() took"""
+
+
+class TimedHTTPSConnection(ConnectTimingMixin, HTTPSConnection):
+    """HTTPS connection that records how long connect() (TCP + TLS) took"""
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Connection-pooling adapter whose connections report their connect time"""
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool
+        }
+
+
+class Transport:
+    """Sends a single HTTP request for the tester; subclass to swap the HTTP stack"""
+    def request(self, method, url, headers=None, json=None, params=None, timeout=REQUEST_TIMEOUT, stream=False,
+                body=None):
+        raise NotImplementedError
+
+    def summary(self):
+        return {}
+
+    def close(self):
+        pass
+
+
+class PooledTransport(Transport):
+    """Shared keep-alive session with a bounded connection pool per host"""
+    def __init__(self, pool_size=POOL_SIZE, keep_alive=True):
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.session = requests.Session()
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "connections": 0,
+            "connect_time": 0.0,
+            "server_time": 0.0,
+            "transfer_time": 0.0
+        }
+
+    def request(self, method, url, headers=None, json=None, params=None, timeout=REQUEST_TIMEOUT, stream=False,
+                body=None):
+        """`body` is a raw request body (bytes or a file-like object, which is streamed) sent instead of `json`"""
+        reset_connect_timer()
+        started = time.perf_counter()
+        response = self.session.request(method, url, headers=headers, json=json, data=body, params=params,
+                                        timeout=timeout, stream=stream)
+        total = time.perf_counter() - started
+
+        # response.elapsed stops once headers arrive; the remainder is body transfer
+        # (zero for streamed responses, whose body is read later by the caller)
+        connect = _connect_timer.elapsed
+        until_headers = response.elapsed.total_seconds()
+        app = server_timing_ms(response)
+        response.timing = {
+            "connect": connect,
+            "dns": _connect_timer.dns,
+            "tcp": _connect_timer.tcp,
+            "tls": _connect_timer.tls,
+            # Request upload + server work + first byte; "app" is the part the server reports
+            "server": max(until_headers - connect, 0.0),
+            "app": app / 1000 if app is not None else None,
+            "server_timing": parse_server_timing(response.headers.get("Server-Timing")),
+            "transfer": max(total - until_headers, 0.0),
+            "total": total,
+            "reused": _connect_timer.count == 0
+        }
+
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["connections"] += _connect_timer.count
+            self.stats["connect_time"] += connect
+            self.stats["server_time"] += response.timing["server"]
+            self.stats["transfer_time"] += response.timing["transfer"]
+        return response
+
+    def summary(self):
+        with self._lock:
+            stats = dict(self.stats)
+        count = stats["requests"] or 1
+        stats["avg_connect_ms"] = stats["connect_time"] / count * 1000
+        stats["avg_server_ms"] = stats["server_time"] / count * 1000
+        stats["reuse_rate"] = 1 - stats["connections"] / count if stats["requests"] else 0.0
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+# Path segments that identify a record rather than a route (UUIDs, numeric ids, Mongo ObjectIds)
+ID_SEGMENT = re.compile(r"^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+|[0-9a-f]{24})$", re.I)
+
+
+def endpoint_key(endpoint):
+    """Normalise an endpoint so samples for different records share a histogram"""
+    path = endpoint.split("?", 1)[0].strip("/")
+    return "/".join(":id" if ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+def parse_server_timing(header):
+    """{metric: duration ms} from a Server-Timing header (metrics without dur map to None)"""
+    metrics = {}
+    for entry in (header or "").split(","):
+        name, *params = [part.strip() for part in entry.split(";")]
+        if not name:
+            continue
+        duration = None
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "dur":
+                try:
+                    duration = float(value.strip().strip('"'))
+                except ValueError:
+                    pass
+        metrics[name] = duration
+    return metrics
+
+
+def server_timing_ms(response):
+    """Server-reported handling time in ms: the Server-Timing `dur` total, else X-Response-Time
+    ("12.3ms") or X-Runtime (seconds); None when the server reports nothing"""
+    durations = [value for value in parse_server_timing(response.headers.get("Server-Timing")).values()
+                 if value is not None]
+    if durations:
+        return sum(durations)
+    response_time = response.headers.get("X-Response-Time")
+    if response_time:
+        match = re.match(r"\s*([0-9.]+)\s*(ms|s)?", response_time)
+        if match:
+            return float(match.group(1)) * (1000 if match.group(2) == "s" else 1)
+    runtime = response.headers.get("X-Runtime")
+    if runtime:
+        try:
+            return float(runtime) * 1000
+        except ValueError:
+            pass
+    return None
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of microsecond latencies.
+
+    Values keep `significant_figures` of precision; counts are stored sparsely,
+    so memory depends on the spread of latencies rather than the sample count.
+    """
+    def __init__(self, significant_figures=2):
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self.counts = defaultdict(int)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, value_us):
+        value = max(int(value_us), 0)
+        bucket = max(value.bit_length() - self.sub_bucket_bits, 0)
+        self.counts[(bucket, value >> bucket)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for key, count in other.counts.items():
+            self.counts[key] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        """Highest value equivalent to the sample at `percent` (clamped to the exact max)"""
+        if not self.count:
+            return 0
+        target = max(math.ceil(percent / 100 * self.count), 1)
+        seen = 0
+        for bucket, sub in sorted(self.counts):
+            seen += self.counts[(bucket, sub)]
+            if seen >= target:
+                return min(((sub + 1) << bucket) - 1, self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+
+def diagnose_timing(timing):
+    """Which part of a request dominated it: connection, route, transfer or network/queue"""
+    total = timing["total"] or 1e-9
+    if timing.get("connect", 0.0) >= total / 2:
+        return "connection"
+    if timing.get("transfer", 0.0) >= total / 2:
+        return "transfer"
+    if timing.get("app") is None:
+        return "server (no timing header)"
+    if timing["app"] >= total / 2:
+        return "route"
+    return "network/queue"
+
+
+class MetricsRegistry:
+    """Thread-safe latency histograms keyed by (method, endpoint, role)"""
+    PERCENTILES = (50, 90, 95, 99)
+    # Raw samples kept per key (reservoir-sampled) for significance tests against baselines
+    SAMPLE_LIMIT = 1000
+    # Per-request phases averaged in the breakdown table (seconds in response.timing)
+    PHASES = ("dns", "tcp", "tls", "server", "app", "transfer")
+    # Bodies kept for slow-call drill-down are cut to this many characters
+    SLOW_BODY_LIMIT = 64 * 1024
+
+    def __init__(self, slowest=5):
+        self.histograms = {}
+        self.errors = defaultdict(int)
+        self.benchmarks = {}
+        self.samples = defaultdict(list)
+        self.phases = {}
+        # Min-heaps of (seconds, sequence, call) holding the `slowest` slowest calls per key
+        self.slowest_k = slowest
+        self.slowest = defaultdict(list)
+        self._sequence = 0
+        # Latencies since the last take_interval(), split into "http" and "ws" (soak-mode drift windows)
+        self.intervals = defaultdict(LatencyHistogram)
+        self.interval_errors = defaultdict(int)
+        self.first_sample = None
+        self.last_sample = None
+        self._rng = random.Random(0)
+        self._lock = threading.Lock()
+
+    def record(self, method, endpoint, role, seconds, status=None):
+        key = (method, endpoint_key(endpoint), role)
+        now = time.monotonic()
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record(seconds * 1_000_000)
+            kind = "ws" if method == "WS" else "http"
+            self.intervals[kind].record(seconds * 1_000_000)
+            samples = self.samples[key]
+            if len(samples) < self.SAMPLE_LIMIT:
+                samples.append(seconds * 1000)
+            else:
+                slot = self._rng.randrange(histogram.count)
+                if slot < self.SAMPLE_LIMIT:
+                    samples[slot] = seconds * 1000
+            if status is None or status >= 500:
+                self.errors[key] += 1
+                self.interval_errors[kind] += 1
+            self.first_sample = self.first_sample or now
+            self.last_sample = now
+
+    def record_phases(self, method, endpoint, role, timing):
+        key = (method, endpoint_key(endpoint), role)
+        with self._lock:
+            totals = self.phases.get(key)
+            if totals is None:
+                totals = self.phases[key] = {"count": 0, "app_count": 0, **{phase: 0.0 for phase in self.PHASES}}
+            totals["count"] += 1
+            for phase in self.PHASES:
+                if timing.get(phase) is not None:
+                    totals[phase] += timing[phase]
+            totals["app_count"] += timing.get("app") is not None
+
+    def keep_if_slow(self, method, endpoint, role, seconds, describe):
+        """Keep the call if it is among the slowest for its key; `describe()` builds the record only then"""
+        key = (method, endpoint_key(endpoint), role)
+        with self._lock:
+            heap = self.slowest[key]
+            if len(heap) >= self.slowest_k and seconds <= heap[0][0]:
+                return
+            self._sequence += 1
+            sequence = self._sequence
+        call = describe()
+        with self._lock:
+            if len(heap) < self.slowest_k:
+                heapq.heappush(heap, (seconds, sequence, call))
+            elif seconds > heap[0][0]:
+                heapq.heapreplace(heap, (seconds, sequence, call))
+
+    def phase_rows(self):
+        """Mean phase durations (ms) per key; app_ms is averaged over responses that reported it"""
+        with self._lock:
+            items = sorted((key, dict(totals)) for key, totals in self.phases.items())
+        rows = []
+        for (method, endpoint, role), totals in items:
+            row = {"method": method, "endpoint": endpoint, "role": role, "count": totals["count"]}
+            for phase in self.PHASES:
+                divisor = totals["app_count"] if phase == "app" else totals["count"]
+                row[f"{phase}_ms"] = totals[phase] / divisor * 1000 if divisor else None
+            rows.append(row)
+        return rows
+
+    def slowest_calls(self):
+        """{"METHOD endpoint role": [calls, slowest first]}"""
+        with self._lock:
+            return {
+                " ".join(key): [call for _, _, call in sorted(heap, key=lambda item: item[:2], reverse=True)]
+                for key, heap in sorted(self.slowest.items()) if heap
+            }
+
+    def take_interval(self):
+        """(histograms, error counts) of everything recorded since the previous call, then start afresh"""
+        with self._lock:
+            intervals, self.intervals = self.intervals, defaultdict(LatencyHistogram)
+            errors, self.interval_errors = self.interval_errors, defaultdict(int)
+        return intervals, errors
+
+    def sample_sets(self):
+        """Copy of the raw sample reservoirs (ms) keyed by (method, endpoint, role)"""
+        with self._lock:
+            return {key: list(values) for key, values in self.samples.items()}
+
+    def window(self):
+        """Seconds between the first and last recorded sample"""
+        if self.first_sample is None:
+            return 0.0
+        return max(self.last_sample - self.first_sample, 1e-9)
+
+    def rows(self):
+        """One summary dict per (method, endpoint, role), latencies in milliseconds"""
+        window = self.window()
+        with self._lock:
+            items = sorted(self.histograms.items())
+            errors = dict(self.errors)
+        rows = []
+        for (method, endpoint, role), histogram in items:
+            row = {
+                "method": method,
+                "endpoint": endpoint,
+                "role": role,
+                "count": histogram.count,
+                "errors": errors.get((method, endpoint, role), 0),
+                "mean_ms": histogram.mean() / 1000,
+                "min_ms": (histogram.min or 0) / 1000,
+                "max_ms": histogram.max / 1000,
+                "throughput_rps": histogram.count / window if window else 0.0
+            }
+            for percent in self.PERCENTILES:
+                row[f"p{percent}_ms"] = histogram.percentile(percent) / 1000
+            rows.append(row)
+        return rows
+
+    def print_report(self):
+        rows = self.rows()
+        if not rows:
+            return
+        print("\n📈 LATENCY BY ENDPOINT (ms)")
+        print(f"{'METHOD':<7} {'ENDPOINT':<28} {'ROLE':<10} {'COUNT':>6} {'ERR':>4} "
+              f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'req/s':>7}")
+        for row in rows:
+            print(f"{row['method']:<7} {row['endpoint'][:28]:<28} {row['role'][:10]:<10} {row['count']:>6} {row['errors']:>4} "
+                  f"{row['p50_ms']:>8.1f} {row['p90_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} "
+                  f"{row['throughput_rps']:>7.2f}")
+
+    def print_breakdown(self):
+        """Mean phase split per endpoint, then the slowest call of each endpoint with its verdict"""
+        rows = self.phase_rows()
+        if not rows:
+            return
+        print("\n🔬 TIME BREAKDOWN BY ENDPOINT (mean ms; app = server-reported)")
+        print(f"{'METHOD':<7} {'ENDPOINT':<28} {'ROLE':<10} {'dns':>6} {'tcp':>6} {'tls':>6} {'ttfb':>8} {'app':>8} "
+              f"{'xfer':>7}")
+        for row in rows:
+            app = "-" if row["app_ms"] is None else f"{row['app_ms']:.1f}"
+            print(f"{row['method']:<7} {row['endpoint'][:28]:<28} {row['role'][:10]:<10} {row['dns_ms']:>6.1f} "
+                  f"{row['tcp_ms']:>6.1f} {row['tls_ms']:>6.1f} {row['server_ms']:>8.1f} {app:>8} "
+                  f"{row['transfer_ms']:>7.1f}")
+        
+        print(f"\n🐢 SLOWEST CALL PER ENDPOINT (top {self.slowest_k} kept for drill-down in --export-json)")
+        for key, calls in self.slowest_calls().items():
+            call = calls[0]
+            timing = call["timing"]
+            app = "-" if timing.get("app") is None else f"{timing['app'] * 1000:.1f}"
+            print(f"{key[:47]:<47} {timing['total'] * 1000:>8.1f}ms status={call['status']} "
+                  f"conn={timing.get('connect', 0) * 1000:.1f} ttfb={timing.get('server', 0) * 1000:.1f} "
+                  f"app={app} xfer={timing.get('transfer', 0) * 1000:.1f} → {call['verdict']}")
+
+    def add_benchmark(self, name, rows):
+        """Attach a benchmark's result table so it is exported alongside the endpoint rows"""
+        with self._lock:
+            self.benchmarks[name] = rows
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump({
+                "window_seconds": self.window(),
+                "endpoints": self.rows(),
+                "phases": self.phase_rows(),
+                "slowest": self.slowest_calls(),
+                "benchmarks": self.benchmarks
+            }, f, indent=2)
+
+    def export_csv(self, path):
+        rows = self.rows()
+        if not rows:
+            return
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def sample_percentile(values, percent):
+    """Nearest-rank percentile of raw samples"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)), 1) - 1]
+
+
+def mann_whitney_u(current, baseline):
+    """One-sided Mann-Whitney U test that `current` values tend to exceed `baseline` values.
+
+    Returns (U, p) from the normal approximation with tie and continuity corrections.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    rank_sum = 0.0
+    tie_term = 0.0
+    start = 0
+    while start < len(combined):
+        end = start
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        average_rank = (start + end) / 2 + 1
+        ties = end - start + 1
+        tie_term += ties ** 3 - ties
+        rank_sum += average_rank * sum(1 for _, group in combined[start:end + 1] if group == 0)
+        start = end + 1
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class BaselineStore:
+    """Append-only JSON-lines history of per-endpoint latency, keyed by label (mode/scenario) and endpoint.
+
+    Each line is one endpoint of one run: summary percentiles, throughput and the
+    raw sample reservoir. compare() pools the last `runs` runs of each key as the
+    baseline and flags a regression when p95 grew by more than `threshold` and a
+    Mann-Whitney test says the slowdown is significant at `alpha`.
+    """
+    def __init__(self, path):
+        self.path = path
+    
+    def history(self, label):
+        """{endpoint key: [entries, oldest first]} for one label"""
+        history = defaultdict(list)
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry.get("label") == label:
+                        history[entry["key"]].append(entry)
+        except FileNotFoundError:
+            pass
+        return history
+    
+    def snapshot(self, metrics, label, base_url):
+        """Entries for the current run, one per (method, endpoint, role)"""
+        run_id = uuid.uuid4().hex[:12]
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        samples = metrics.sample_sets()
+        entries = []
+        for row in metrics.rows():
+            key = (row["method"], row["endpoint"], row["role"])
+            entries.append({
+                "run_id": run_id,
+                "timestamp": timestamp,
+                "label": label,
+                "base_url": base_url,
+                "key": " ".join(key),
+                "count": row["count"],
+                "errors": row["errors"],
+                "p50_ms": row["p50_ms"],
+                "p95_ms": row["p95_ms"],
+                "p99_ms": row["p99_ms"],
+                "throughput_rps": row["throughput_rps"],
+                "samples": [round(value, 3) for value in samples.get(key, [])]
+            })
+        return entries
+    
+    def append(self, entries):
+        with open(self.path, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    
+    def compare(self, entries, runs=5, threshold=0.10, alpha=0.05, min_samples=5):
+        label = entries[0]["label"] if entries else None
+        history = self.history(label)
+        rows = []
+        for entry in entries:
+            previous = history.get(entry["key"], [])[-runs:]
+            if not previous:
+                rows.append({"key": entry["key"], "status": "new", "p95_ms": entry["p95_ms"]})
+                continue
+            baseline_samples = [value for old in previous for value in old["samples"]]
+            # Both sides from raw samples when available, so histogram bucketing can't skew the ratio
+            if baseline_samples and entry["samples"]:
+                baseline_p95 = sample_percentile(baseline_samples, 95)
+                current_p95 = sample_percentile(entry["samples"], 95)
+            else:
+                baseline_p95 = sum(old["p95_ms"] for old in previous) / len(previous)
+                current_p95 = entry["p95_ms"]
+            change = current_p95 / baseline_p95 - 1 if baseline_p95 else 0.0
+            _, p_value = mann_whitney_u(entry["samples"], baseline_samples)
+            enough = len(entry["samples"]) >= min_samples and len(baseline_samples) >= min_samples
+            if not enough:
+                status = "too few samples"
+            elif change > threshold and p_value < alpha:
+                status = "regression"
+            elif change < -threshold and mann_whitney_u(baseline_samples, entry["samples"])[1] < alpha:
+                status = "improved"
+            else:
+                status = "ok"
+            rows.append({
+                "key": entry["key"],
+                "status": status,
+                "runs": len(previous),
+                "baseline_p95_ms": baseline_p95,
+                "p95_ms": current_p95,
+                "change": change,
+                "p_value": p_value,
+                "throughput_change": entry["throughput_rps"] / previous[-1]["throughput_rps"] - 1
+                if previous[-1]["throughput_rps"] else 0.0
+            })
+        return rows
+    
+    @staticmethod
+    def print_comparison(rows, threshold):
+        print(f"\n📏 BASELINE COMPARISON (p95 regression threshold {threshold * 100:.0f}%)")
+        print(f"{'ENDPOINT':<44} {'RUNS':>4} {'BASE p95':>9} {'p95':>8} {'CHANGE':>8} {'p':>7} {'RPS Δ':>7}  STATUS")
+        markers = {"regression": "🔥", "improved": "🚀", "ok": "✅", "new": "🆕", "too few samples": "➖"}
+        for row in rows:
+            if row["status"] == "new":
+                print(f"{row['key'][:44]:<44} {'-':>4} {'-':>9} {row['p95_ms']:>8.1f} {'-':>8} {'-':>7} {'-':>7}  "
+                      f"{markers['new']} new")
+                continue
+            print(f"{row['key'][:44]:<44} {row['runs']:>4} {row['baseline_p95_ms']:>9.1f} {row['p95_ms']:>8.1f} "
+                  f"{row['change'] * 100:>+7.1f}% {row['p_value']:>7.3f} {row['throughput_change'] * 100:>+6.0f}%  "
+                  f"{markers[row['status']]} {row['status']}")
+
+
+class ResponseCache:
+    """Client-side LRU cache for GET responses honouring Cache-Control, ETag and Last-Modified.
+
+    Fresh entries are served without a request; stale entries with validators are
+    revalidated with If-None-Match / If-Modified-Since. `default_ttl` treats responses
+    that carry no caching headers as fresh for that long, to simulate a server-side
+    cache. Any write to an endpoint invalidates its cached reads.
+    """
+    def __init__(self, max_entries=256, default_ttl=0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.entries = OrderedDict()
+        self.stats = defaultdict(lambda: defaultdict(int))
+        # Body digest per key, kept for uncacheable responses too; LRU-capped like the entries
+        self.last_body = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, url, params, token):
+        return (url, tuple(sorted((params or {}).items())), token)
+
+    def lookup(self, key, endpoint):
+        """Returns (fresh cached response or None, conditional request headers)"""
+        stats_key = endpoint_key(endpoint)
+        with self._lock:
+            self.stats[stats_key]["requests"] += 1
+            entry = self.entries.get(key)
+            if entry is None:
+                return None, {}
+            self.entries.move_to_end(key)
+            if not entry["revalidate"] and time.monotonic() < entry["expires"]:
+                self.stats[stats_key]["fresh_hits"] += 1
+                return entry["response"], {}
+            conditional = {}
+            if entry["etag"]:
+                conditional["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                conditional["If-Modified-Since"] = entry["last_modified"]
+            return None, conditional
+
+    def freshness(self, response):
+        """(ttl seconds, must revalidate, storable) from the response's caching headers"""
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        directives = dict(
+            (part.split("=", 1) + [""])[:2]
+            for part in (item.strip() for item in cache_control.split(","))
+            if part
+        )
+        if "no-store" in directives:
+            return 0, True, False
+        if "max-age" in directives:
+            try:
+                return int(directives["max-age"]), "no-cache" in directives, True
+            except ValueError:
+                pass
+        if "Expires" in response.headers:
+            try:
+                expires = parsedate_to_datetime(response.headers["Expires"])
+                return max((expires - datetime.now(expires.tzinfo)).total_seconds(), 0), "no-cache" in directives, True
+            except (TypeError, ValueError):
+                pass
+        return self.default_ttl, "no-cache" in directives, True
+
+    def store(self, key, endpoint, response):
+        """Record a GET response; a 304 is answered from the cached entry"""
+        stats_key = endpoint_key(endpoint)
+        with self._lock:
+            stats = self.stats[stats_key]
+            entry = self.entries.get(key)
+            if response.status_code == 304 and entry is not None:
+                stats["revalidated"] += 1
+                ttl, _, _ = self.freshness(response)
+                entry["expires"] = time.monotonic() + (ttl or entry["ttl"])
+                return entry["response"]
+            if response.status_code != 200:
+                return response
+
+            digest = hashlib.sha1(response.content).hexdigest()
+            if self.last_body.get(key) == digest:
+                stats["unchanged"] += 1
+            self.last_body[key] = digest
+            self.last_body.move_to_end(key)
+            while len(self.last_body) > self.max_entries:
+                self.last_body.popitem(last=False)
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                stats["validators"] += 1
+            ttl, revalidate, storable = self.freshness(response)
+            if not storable or not (ttl or etag or last_modified):
+                return response
+            self.entries[key] = {
+                "endpoint": stats_key,
+                "response": response,
+                "etag": etag,
+                "last_modified": last_modified,
+                "ttl": ttl,
+                "expires": time.monotonic() + ttl,
+                "revalidate": revalidate
+            }
+            self.entries.move_to_end(key)
+            stats["stored"] += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return response
+
+    def invalidate(self, endpoint):
+        """Drop cached reads of an endpoint after a write to it"""
+        stats_key = endpoint_key(endpoint)
+        with self._lock:
+            stale = [key for key, entry in self.entries.items() if entry["endpoint"] == stats_key]
+            for key in stale:
+                del self.entries[key]
+            self.stats[stats_key]["invalidations"] += len(stale)
+
+    def rows(self):
+        with self._lock:
+            items = sorted((endpoint, dict(stats)) for endpoint, stats in self.stats.items())
+        rows = []
+        for endpoint, stats in items:
+            requests_made = stats.get("requests", 0)
+            if not requests_made:
+                continue
+            hits = stats.get("fresh_hits", 0) + stats.get("revalidated", 0)
+            rows.append({
+                "endpoint": endpoint,
+                "requests": requests_made,
+                "fresh_hits": stats.get("fresh_hits", 0),
+                "revalidated": stats.get("revalidated", 0),
+                "unchanged": stats.get("unchanged", 0),
+                "validators": stats.get("validators", 0),
+                "invalidations": stats.get("invalidations", 0),
+                "hit_ratio": hits / requests_made,
+                # Repeats that returned a byte-identical body could have been cache hits
+                "potential_hit_ratio": (hits + stats.get("unchanged", 0)) / requests_made
+            })
+        return rows
+
+    def print_report(self):
+        rows = self.rows()
+        if not rows:
+            return
+        print("\n🗄️  RESPONSE CACHE")
+        print(f"{'ENDPOINT':<28} {'REQS':>6} {'FRESH':>6} {'304':>5} {'SAME':>6} {'VALID':>6} {'HIT%':>6} {'POT%':>6}")
+        for row in rows:
+            print(f"{row['endpoint'][:28]:<28} {row['requests']:>6} {row['fresh_hits']:>6} {row['revalidated']:>5} "
+                  f"{row['unchanged']:>6} {row['validators']:>6} {row['hit_ratio'] * 100:>6.1f} "
+                  f"{row['potential_hit_ratio'] * 100:>6.1f}")
+
+
+def jwt_claims(token):
+    """Payload of a JWT, read without verifying the signature ({} if unreadable)"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError, AttributeError):
+        return {}
+
+
+def jwt_expiry(token):
+    """`exp` claim of a JWT (epoch seconds)"""
+    return jwt_claims(token).get("exp")
+
+
+def current_rss_kb():
+    """Resident set size of this process in KB (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def peak_rss_kb():
+    """High-water resident set size of this process in KB"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def process_usage(pid="self"):
+    """RSS (KB), open file descriptors and threads of a local process from /proc; missing values are None"""
+    usage = {"rss_kb": None, "fds": None, "threads": None}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    usage["rss_kb"] = int(line.split()[1])
+                elif line.startswith("Threads:"):
+                    usage["threads"] = int(line.split()[1])
+        usage["fds"] = len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        if pid == "self" and usage["rss_kb"] is None:
+            usage["rss_kb"] = current_rss_kb()
+            usage["threads"] = threading.active_count()
+    return usage
+
+
+def iter_json_array(chunks, path=()):
+    """Incrementally parse the JSON array reached by following object keys `path`.
+
+    `chunks` is an iterable of bytes (e.g. response.iter_content()); elements are
+    yielded as soon as they are complete. Sibling values met before the array
+    are decoded and discarded whole, so `path` should name an early key.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    exhausted = False
+    
+    def fill(at_least=1):
+        """Buffer at least `at_least` more characters; False once the input is exhausted"""
+        nonlocal buffer, position, exhausted
+        parts = [buffer[position:]]
+        added = 0
+        for chunk in chunks:
+            parts.append(text.decode(chunk))
+            added += len(parts[-1])
+            if added >= at_least:
+                break
+        else:
+            parts.append(text.decode(b"", final=True))
+            added += len(parts[-1])
+            exhausted = True
+        buffer = "".join(parts)
+        position = 0
+        return added > 0
+    
+    def peek():
+        """Next non-whitespace character, reading more input as needed ('' at end of input)"""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if exhausted or not fill():
+                return ""
+    
+    def expect(characters):
+        nonlocal position
+        found = peek()
+        if not found or found not in characters:
+            raise ValueError(f"Expected one of {characters!r} in JSON stream, found {found or 'end of input'!r}")
+        position += 1
+        return found
+    
+    def value():
+        nonlocal position
+        peek()
+        while True:
+            try:
+                result, end = decoder.raw_decode(buffer, position)
+                # A number running to the end of the buffer may continue in the next chunk
+                if end < len(buffer) or exhausted:
+                    position = end
+                    return result
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            # Grow geometrically so a record split across many small chunks is re-parsed only a few times
+            fill(max(len(buffer) - position, 1))
+    
+    for key in path:
+        expect("{")
+        while True:
+            if peek() == "}":
+                raise ValueError(f"Key {key!r} not found in JSON stream")
+            name = value()
+            expect(":")
+            if name == key:
+                break
+            value()
+            if expect(",}") == "}":
+                raise ValueError(f"Key {key!r} not found in JSON stream")
+    
+    expect("[")
+    if peek() == "]":
+        return
+    while True:
+        yield value()
+        if expect(",]") == "]":
+            return
+
+
+class StreamStats:
+    """Running count, order-sensitive checksum, field validation and RSS for a record stream"""
+    def __init__(self, required_fields=(), rss_every=1000):
+        self.required_fields = required_fields
+        self.rss_every = rss_every
+        self.records = 0
+        self.bytes = 0
+        self.missing = defaultdict(int)
+        self.digest = hashlib.sha256()
+        self.rss_start = current_rss_kb()
+        self.rss_peak = self.rss_start
+    
+    def count_bytes(self, chunks):
+        for chunk in chunks:
+            self.bytes += len(chunk)
+            yield chunk
+    
+    def add(self, record):
+        self.records += 1
+        self.digest.update(json.dumps(record, sort_keys=True, separators=(",", ":")).encode())
+        for name in self.required_fields:
+            if not isinstance(record, dict) or record.get(name) in (None, ""):
+                self.missing[name] += 1
+        if self.records % self.rss_every == 0:
+            self.rss_peak = max(self.rss_peak, current_rss_kb())
+    
+    def consume(self, records):
+        """Fold a record iterator into the stats without keeping the records"""
+        for record in records:
+            self.add(record)
+        self.rss_peak = max(self.rss_peak, current_rss_kb())
+        return self
+    
+    @property
+    def checksum(self):
+        return self.digest.hexdigest()[:16]
+    
+    @property
+    def invalid(self):
+        return sum(self.missing.values())
+
+
+class GeneratedFile:
+    """`size` bytes of deterministic content, produced one read at a time (never held whole)"""
+    BLOCK = 64 * 1024
+
+    def __init__(self, size, seed=0, header=b""):
+        self.size = size
+        self.header = header
+        self.block = random.Random(seed).randbytes(self.BLOCK)
+        self.position = 0
+
+    def read(self, n=-1):
+        n = self.size - self.position if n is None or n < 0 else min(n, self.size - self.position)
+        out = bytearray()
+        while len(out) < n:
+            at = self.position + len(out)
+            if at < len(self.header):
+                out += self.header[at:at + n - len(out)]
+            else:
+                offset = (at - len(self.header)) % self.BLOCK
+                out += self.block[offset:offset + n - len(out)]
+        self.position += n
+        return bytes(out)
+
+    def seek(self, offset):
+        self.position = offset
+
+
+class MappedFile:
+    """The first `size` bytes of a memory-mapped file; the OS pages it in as it is read"""
+    def __init__(self, mapping, size=None):
+        self.mapping = mapping
+        self.size = len(mapping) if size is None else min(size, len(mapping))
+        self.position = 0
+
+    def read(self, n=-1):
+        end = self.size if n is None or n < 0 else min(self.position + n, self.size)
+        chunk = self.mapping[self.position:end]
+        self.position = end
+        return chunk
+
+    def seek(self, offset):
+        self.position = offset
+
+
+class MultipartBody:
+    """multipart/form-data request body that streams its file part from a GeneratedFile or MappedFile.
+
+    requests sends it with a Content-Length and reads it block by block, so the
+    client never holds more than a block of the file.
+    """
+    def __init__(self, source, filename, content_type, fields=None, field_name="file"):
+        boundary = uuid.uuid4().hex
+        parts = [f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+                 for name, value in (fields or {}).items()]
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{field_name}"; '
+                     f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n')
+        self.segments = ["".join(parts).encode(), source, f"\r\n--{boundary}--\r\n".encode()]
+        self.source = source
+        self.filename = filename
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self.position = 0
+
+    def __len__(self):
+        return len(self.segments[0]) + self.source.size + len(self.segments[2])
+
+    def __str__(self):
+        return f"<multipart {self.filename}: {self.source.size} byte file>"
+
+    def read(self, n=-1):
+        n = len(self) - self.position if n is None or n < 0 else n
+        out = bytearray()
+        while len(out) < n and self.position < len(self):
+            head, file_end = len(self.segments[0]), len(self.segments[0]) + self.source.size
+            if self.position < head:
+                chunk = self.segments[0][self.position:self.position + n - len(out)]
+            elif self.position < file_end:
+                chunk = self.source.read(n - len(out))
+            else:
+                start = self.position - file_end
+                chunk = self.segments[2][start:start + n - len(out)]
+            out += chunk
+            self.position += len(chunk)
+        return bytes(out)
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=0):
+        # Only rewinding is needed (retries and redirects)
+        self.position = 0
+        self.source.seek(0)
+
+
+class BufferedResponse:
+    """The parts of a requests.Response that check_step reads, for bodies read by aiohttp"""
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", "replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class TokenStore:
+    """On-disk JWT cache keyed by base URL + email, so runs can skip register/login"""
+    def __init__(self, path=TOKEN_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    def key(self, base_url, email):
+        return f"{base_url}|{email}"
+
+    def get(self, base_url, email):
+        """Cached (token, user) pair if it is not about to expire, else None"""
+        with self._lock:
+            entry = self.entries.get(self.key(base_url, email))
+        if not entry:
+            return None
+        expires = entry.get("expires")
+        if expires and expires - TOKEN_EXPIRY_SKEW <= time.time():
+            return None
+        return entry["token"], entry.get("user")
+
+    def put(self, base_url, email, token, user=None):
+        with self._lock:
+            self.entries[self.key(base_url, email)] = {"token": token, "user": user, "expires": jwt_expiry(token)}
+
+    def discard(self, base_url, email):
+        with self._lock:
+            self.entries.pop(self.key(base_url, email), None)
+
+    def save(self):
+        """Write atomically so concurrent or interrupted runs never leave a torn file"""
+        with self._lock:
+            snapshot = json.dumps(self.entries)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(snapshot)
+        os.replace(temp_path, self.path)
+
+
+class RateLimiter:
+    """Paces callers to a target rate shared across threads (no bursts)"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Claim the next slot; returns seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        return slot - now
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# A template string that is exactly "{path}" or "{path|fallback}"
+TEMPLATE_PLACEHOLDER = re.compile(r"^\{([^{}]+)\}$")
+
+
+@dataclass
+class Step:
+    """One request in a scenario.
+
+    `body`/`params` may contain "{path}" strings resolved against the tester's
+    test_data (e.g. "{created_class.id}", "{notifications.0.id}"); "{uuid}" and
+    "{today}" are generated, and "{a|b}" falls back to b when a is missing.
+    `expect` is "list", "object" or "success", and `fields` are keys the JSON
+    object must have; `capture` stores the JSON response
+    in test_data; a failed `required` step ends the scenario. A step with `when`
+    (a test_data path) is skipped, and logged as passed, while that path is empty. `message` may
+    reference "{count}" (list length or the response's "count").
+    """
+    name: str
+    method: str
+    endpoint: str
+    role: str = "admin"
+    body: dict = None
+    params: dict = None
+    expect_status: int = 200
+    expect: str = None
+    fields: tuple = ()
+    capture: str = None
+    required: bool = False
+    optional: bool = False
+    when: str = None
+    think_time: float = 0
+    message: str = "OK"
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+@dataclass
+class Scenario:
+    name: str
+    steps: list = field(default_factory=list)
+    title: str = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(name=data["name"], title=data.get("title"),
+                   steps=[Step.from_dict(step) for step in data["steps"]])
+
+
+def template_roots(value):
+    """test_data keys a Step body/params reads through "{path}" templates (fallbacks included)"""
+    if isinstance(value, dict):
+        return {root for item in value.values() for root in template_roots(item)}
+    if isinstance(value, list):
+        return {root for item in value for root in template_roots(item)}
+    match = TEMPLATE_PLACEHOLDER.match(value) if isinstance(value, str) else None
+    if not match:
+        return set()
+    return {path.split(".")[0] for path in match.group(1).split("|")} - {"uuid", "today"}
+
+
+@dataclass
+class TestNode:
+    """A test method in run_all_tests' dependency graph.
+
+    `inputs` are the test_data keys it reads and `outputs` the keys it writes;
+    a node runs once every earlier node producing one of its inputs has finished.
+    Nodes built from a scenario run it directly; `method` then only names the node.
+    """
+    __test__ = False  # not a pytest test class despite the name
+    method: str
+    inputs: tuple = ()
+    outputs: tuple = ()
+    scenario: Scenario = None
+
+    @classmethod
+    def from_scenario(cls, method, scenario, inputs=()):
+        """Derive inputs/outputs from a scenario's templates and captures"""
+        reads = set(inputs)
+        writes = set()
+        for step in scenario.steps:
+            reads |= template_roots(step.body) | template_roots(step.params)
+            if step.capture:
+                writes.add(step.capture)
+        return cls(method, tuple(sorted(reads - writes)), tuple(sorted(writes)), scenario)
+
+
+def load_scenarios(path):
+    """Load scenarios from a JSON file: {"scenarios": [{"name", "title", "steps": [...]}]}"""
+    with open(path) as f:
+        data = json.load(f)
+    return [Scenario.from_dict(scenario) for scenario in data["scenarios"]]
+
+
+AUTH_ME_SCENARIO = Scenario("Auth Me", [
+    Step(f"Auth me {role}", "GET", "auth/me", role=role, optional=True, fields=("id", "role"),
+         message=f"Successfully retrieved {role} user data")
+    for role in ("admin", "teacher", "parent", "student")
+], title="Testing Auth Me Endpoint")
+
+STUDENT_SCENARIO = Scenario("Student Management", [
+    Step("Create Student", "POST", "students", body={
+        "firstName": "John",
+        "lastName": "Doe",
+        "email": "john.doe@student.edu.ng",
+        "dateOfBirth": "2010-05-15",
+        "gender": "Male",
+        "address": "123 Lagos Street, Lagos",
+        "phoneNumber": "+2348012345682",
+        "classId": "{uuid}",
+        "parentId": "{parent_user.id|uuid}",
+        "admissionNumber": "STU001",
+        "admissionDate": "2024-01-15"
+    }, capture="created_student", required=True, message="Successfully created student"),
+    Step("Get Students", "GET", "students", expect="list", message="Retrieved {count} students"),
+    Step("Update Student", "PUT", "students", body={"firstName": "Jane", "lastName": "Smith"},
+         params={"id": "{created_student.id}"}, message="Successfully updated student"),
+    Step("Delete Student", "DELETE", "students", params={"id": "{created_student.id}"},
+         message="Successfully deleted student")
+])
+
+TEACHER_SCENARIO = Scenario("Teacher Management", [
+    Step("Create Teacher", "POST", "teachers", body={
+        "firstName": "Sarah",
+        "lastName": "Johnson",
+        "email": "sarah.johnson@school.edu.ng",
+        "phoneNumber": "+2348012345683",
+        "address": "456 Abuja Street, Abuja",
+        "qualification": "B.Ed Mathematics",
+        "experience": "5 years",
+        "specialization": "Mathematics",
+        "employeeId": "TCH001",
+        "dateOfJoining": "2024-01-01"
+    }, capture="created_teacher", required=True, message="Successfully created teacher"),
+    Step("Get Teachers", "GET", "teachers", expect="list", message="Retrieved {count} teachers"),
+    Step("Update Teacher", "PUT", "teachers", body={"specialization": "Physics", "experience": "6 years"},
+         params={"id": "{created_teacher.id}"}, message="Successfully updated teacher"),
+    Step("Delete Teacher", "DELETE", "teachers", params={"id": "{created_teacher.id}"},
+         message="Successfully deleted teacher")
+])
+
+CLASS_SCENARIO = Scenario("Class Management", [
+    Step("Create Class", "POST", "classes", body={
+        "name": "JSS 1A",
+        "level": "Junior Secondary 1",
+        "section": "A",
+        "capacity": 30,
+        "academicYear": "2024/2025",
+        "classTeacherId": "{created_teacher.id|uuid}"
+    }, capture="created_class", required=True, message="Successfully created class"),
+    Step("Get Classes", "GET", "classes", expect="list", message="Retrieved {count} classes"),
+    Step("Update Class", "PUT", "classes", body={"capacity": 35, "section": "B"},
+         params={"id": "{created_class.id}"}, message="Successfully updated class"),
+    Step("Delete Class", "DELETE", "classes", params={"id": "{created_class.id}"},
+         message="Successfully deleted class")
+])
+
+SUBJECT_SCENARIO = Scenario("Subject Management", [
+    Step("Create Subject", "POST", "subjects", body={
+        "name": "Mathematics",
+        "code": "MATH101",
+        "description": "Basic Mathematics for Junior Secondary",
+        "credits": 3,
+        "level": "Junior Secondary"
+    }, capture="created_subject", required=True, message="Successfully created subject"),
+    Step("Get Subjects", "GET", "subjects", expect="list", message="Retrieved {count} subjects")
+])
+
+TEACHER_ASSIGNMENT_SCENARIO = Scenario("Teacher Assignments", [
+    Step("Create Teacher Assignment", "POST", "teacher-assignments", body={
+        "teacherId": "{created_teacher.id|uuid}",
+        "subjectId": "{created_subject.id|uuid}",
+        "classId": "{created_class.id|uuid}",
+        "subjectName": "Mathematics",
+        "className": "JSS 1A",
+        "academicYear": "2024/2025"
+    }, capture="created_assignment", required=True, message="Successfully created teacher assignment"),
+    Step("Get Teacher Assignments", "GET", "teacher-assignments", expect="list",
+         message="Retrieved {count} assignments")
+])
+
+ATTENDANCE_SCENARIO = Scenario("Attendance Management", [
+    Step("Mark Individual Attendance", "POST", "attendance", body={
+        "studentId": "{created_student.id|uuid}",
+        "classId": "{created_class.id|uuid}",
+        "subjectId": "{created_subject.id|uuid}",
+        "date": "{today}",
+        "status": "present",
+        "remarks": "On time"
+    }, required=True, message="Successfully marked individual attendance"),
+    Step("Get Attendance", "GET", "attendance", expect="list", message="Retrieved {count} attendance records"),
+    Step("Bulk Attendance Marking", "POST", "attendance/bulk", body={
+        "attendanceList": [
+            {
+                "studentId": "{uuid}",
+                "classId": "{created_class.id|uuid}",
+                "subjectId": "{created_subject.id|uuid}",
+                "date": "{today}",
+                "status": "present"
+            },
+            {
+                "studentId": "{uuid}",
+                "classId": "{created_class.id|uuid}",
+                "subjectId": "{created_subject.id|uuid}",
+                "date": "{today}",
+                "status": "absent"
+            }
+        ]
+    }, expect="success", message="Successfully marked bulk attendance for {count} students")
+])
+
+DASHBOARD_SCENARIO = Scenario("Dashboard Statistics", [
+    Step(f"Dashboard Stats {role}", "GET", "dashboard/stats", role=role, optional=True, expect="object",
+         message=f"Retrieved dashboard statistics for {role}")
+    for role in ("admin", "teacher", "parent", "student")
+])
+
+RBAC_SCENARIO = Scenario("Role-Based Access Control", [
+    Step("RBAC - Student Access Control", "POST", "teachers", role="student", optional=True,
+         body={"firstName": "Test", "lastName": "Teacher", "email": "test@test.com"}, expect_status=401,
+         message="Student correctly denied access to create teachers"),
+    Step("RBAC - Teacher Student Access", "GET", "students", role="teacher", optional=True,
+         message="Teacher correctly allowed to view students")
+])
+
+PARENT_PORTAL_SCENARIO = Scenario("Parent Portal", [
+    Step("Parent Students", "GET", "parent/students", role="parent", expect="list",
+         message="Retrieved {count} students for parent")
+])
+
+NOTIFICATION_SCENARIO = Scenario("Notification System", [
+    Step("Get Notifications", "GET", "notifications", role="teacher", expect="list", capture="notifications",
+         required=True, message="Retrieved {count} notifications"),
+    Step("Mark Notification Read", "POST", "notifications/mark-read", role="teacher",
+         body={"notificationId": "{notifications.0.id}"}, when="notifications.0.id", expect="success",
+         message="Successfully marked notification as read")
+])
+
+
+# run_all_tests' suite after authentication; list order is the sequential order,
+# so an input is produced by the nearest earlier node that outputs it
+SUITE_NODES = [
+    TestNode.from_scenario("test_auth_me", AUTH_ME_SCENARIO),
+    TestNode.from_scenario("test_student_management", STUDENT_SCENARIO),
+    TestNode.from_scenario("test_teacher_management", TEACHER_SCENARIO),
+    TestNode.from_scenario("test_class_management", CLASS_SCENARIO),
+    TestNode.from_scenario("test_subject_management", SUBJECT_SCENARIO),
+    TestNode.from_scenario("test_teacher_assignments", TEACHER_ASSIGNMENT_SCENARIO),
+    TestNode.from_scenario("test_attendance_management", ATTENDANCE_SCENARIO),
+    # Creating an assignment notifies the teacher, giving mark-read something to mark
+    TestNode.from_scenario("notification_system", NOTIFICATION_SCENARIO, inputs=("created_assignment",)),
+    TestNode.from_scenario("test_dashboard_statistics", DASHBOARD_SCENARIO),
+    TestNode.from_scenario("test_role_based_access_control", RBAC_SCENARIO),
+    TestNode.from_scenario("test_parent_portal", PARENT_PORTAL_SCENARIO)
+]
+
+# Scenarios each virtual user loops over in load mode (registration/login happen once at setup)
+LOAD_SCENARIOS = [
+    AUTH_ME_SCENARIO,
+    STUDENT_SCENARIO,
+    TEACHER_SCENARIO,
+    CLASS_SCENARIO,
+    SUBJECT_SCENARIO,
+    TEACHER_ASSIGNMENT_SCENARIO,
+    ATTENDANCE_SCENARIO,
+    NOTIFICATION_SCENARIO,
+    DASHBOARD_SCENARIO,
+    RBAC_SCENARIO,
+    PARENT_PORTAL_SCENARIO
+]
+
 
 class SchoolManagementTester:
-    def __init__(self):
-        self.base_url = BASE_URL
+    def __init__(self, base_url=BASE_URL, transport=None, account_tag=None, verbose=True, rate_limiter=None,
+                 metrics=None, cache=None, token_store=None):
+        self.base_url = base_url
         self.headers = HEADERS.copy()
+        self.transport = transport or PooledTransport()
+        self.metrics = metrics or MetricsRegistry()
+        self.cache = cache
+        self.token_store = token_store
+        # Tokens replaced after a 401, so callers still holding the old one get the new one
+        self.replaced_tokens = {}
+        self.account_tag = account_tag
+        self.verbose = verbose
+        self.rate_limiter = rate_limiter
+        self.last_error = None
         self.tokens = {}
         self.test_data = {}
         self.results = {
@@ -25,76 +1576,258 @@ class SchoolManagementTester:
             "failed": 0,
             "errors": []
         }
+        # Lines held back while running as a scheduler branch (see branch())
+        self.output = None
+    
+    def emit(self, line):
+        if self.output is not None:
+            self.output.append(line)
+        else:
+            print(line)
+    
+    def branch(self, test_data):
+        """A tester sharing this one's connection, tokens and metrics with its own test_data and results.
+
+        Output is buffered in `output` so parallel branches don't interleave.
+        """
+        clone = copy.copy(self)
+        clone.test_data = dict(test_data)
+        clone.results = {"passed": 0, "failed": 0, "errors": []}
+        clone.last_error = None
+        clone.output = []
+        return clone
+    
+    def log_section(self, title):
+        """Print a section header"""
+        if self.verbose:
+            self.emit(f"\n=== {title} ===")
     
     def log_result(self, test_name, success, message="", error_details=""):
         """Log test results"""
         if success:
             self.results["passed"] += 1
-            print(f"✅ {test_name}: {message}")
+            if self.verbose:
+                self.emit(f"✅ {test_name}: {message}")
         else:
             self.results["failed"] += 1
             error_msg = f"❌ {test_name}: {message}"
             if error_details:
                 error_msg += f" | Details: {error_details}"
-            print(error_msg)
+            if self.verbose:
+                self.emit(error_msg)
             self.results["errors"].append(f"{test_name}: {message} - {error_details}")
     
-    def make_request(self, method, endpoint, data=None, token=None, params=None):
-        """Make HTTP request with proper error handling"""
+    def test_users(self):
+        """Registration fixtures, with emails tagged per virtual user when account_tag is set"""
+        users = [dict(user) for user in TEST_USERS]
+        if self.account_tag:
+            for user in users:
+                local, domain = user["email"].split("@")
+                user["email"] = f"{local}+{self.account_tag}@{domain}"
+        return users
+    
+    def role_for_token(self, token):
+        """Role whose token is being used, for bucketing latency samples"""
+        if not token:
+            return "anonymous"
+        for role, role_token in self.tokens.items():
+            if role_token == token:
+                return role
+        return "other"
+    
+    def remember_token(self, user_data, token, user=None):
+        """Keep a role's token for this run and, if configured, in the on-disk store"""
+        self.tokens[user_data["role"]] = token
+        if user:
+            self.test_data[f"{user_data['role']}_user"] = user
+        if self.token_store:
+            self.token_store.put(self.base_url, user_data["email"], token, user)
+    
+    def load_cached_tokens(self):
+        """Fill self.tokens from the token store; returns the fixtures that still need auth"""
+        missing = []
+        for user_data in self.test_users():
+            cached = self.token_store.get(self.base_url, user_data["email"]) if self.token_store else None
+            if cached:
+                token, user = cached
+                self.tokens[user_data["role"]] = token
+                if user:
+                    self.test_data[f"{user_data['role']}_user"] = user
+            else:
+                missing.append(user_data)
+        return missing
+    
+    def refresh_token(self, token):
+        """Re-login the role behind a rejected token; returns the new token or None"""
+        role = self.role_for_token(token)
+        user_data = next((user for user in self.test_users() if user["role"] == role), None)
+        if not user_data:
+            return None
+        # auth/me tells an expired/revoked token apart from an expected RBAC 401
+        check = self.make_request("GET", "auth/me", token=token, retry_auth=False)
+        if check is None or check.status_code != 401:
+            return None
+        if self.token_store:
+            self.token_store.discard(self.base_url, user_data["email"])
+        response = self.make_request("POST", "auth/login", {
+            "email": user_data["email"],
+            "password": user_data["password"]
+        }, retry_auth=False)
+        if response is None or response.status_code != 200 or "token" not in response.json():
+            return None
+        new_token = response.json()["token"]
+        self.remember_token(user_data, new_token, response.json().get("user"))
+        self.replaced_tokens[token] = new_token
+        return new_token
+    
+    def make_request(self, method, endpoint, data=None, token=None, params=None, retry_auth=True, stream=False,
+                     upload=None, raw=None, extra_headers=None):
+        """Make HTTP request with proper error handling; `stream` leaves the body unread and bypasses the cache.
+
+        `upload` (a MultipartBody) is streamed as the request body in place of JSON `data`;
+        `raw` bytes are sent exactly as given (signed webhooks), with `extra_headers` added.
+        """
         url = f"{self.base_url}/{endpoint}"
         headers = self.headers.copy()
+        headers.update(extra_headers or {})
+        body, logged = raw, data if raw is None else raw.decode("utf-8", "replace")
+        if upload is not None:
+            headers["Content-Type"] = upload.content_type
+            body, logged = upload, str(upload)
+        token = self.replaced_tokens.get(token, token)
+        role = self.role_for_token(token)
         
         if token:
             headers["Authorization"] = f"Bearer {token}"
         
+        cache_key = None
+        if self.cache and method == "GET" and not stream:
+            cache_key = self.cache.key(url, params, token)
+            cached, conditional = self.cache.lookup(cache_key, endpoint)
+            if cached is not None:
+                return cached
+            headers.update(conditional)
+        
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        
+        started = time.perf_counter()
         try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, params=params, timeout=30)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=30)
-            elif method == "PUT":
-                response = requests.put(url, headers=headers, json=data, params=params, timeout=30)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, params=params, timeout=30)
-            
+            response = self.transport.request(
+                method,
+                url,
+                headers=headers,
+                json=data if method in ("POST", "PUT", "PATCH") and body is None else None,
+                params=params,
+                timeout=REQUEST_TIMEOUT,
+                stream=stream,
+                body=body
+            )
+            elapsed = time.perf_counter() - started
+            self.metrics.record(method, endpoint, role, elapsed, response.status_code)
+            timing = getattr(response, "timing", None)
+            if timing:
+                self.metrics.record_phases(method, endpoint, role, timing)
+                self.metrics.keep_if_slow(method, endpoint, role, elapsed, lambda: self.describe_call(
+                    method, url, headers, logged, params, response, stream))
+            self.last_error = None
+            if cache_key:
+                response = self.cache.store(cache_key, endpoint, response)
+            elif self.cache and method != "GET":
+                self.cache.invalidate(endpoint)
+            if response.status_code == 401 and token and retry_auth and self.token_store:
+                new_token = self.refresh_token(token)
+                if new_token:
+                    if upload is not None:
+                        upload.seek(0)
+                    return self.make_request(method, endpoint, data, new_token, params, retry_auth=False,
+                                             stream=stream, upload=upload, raw=raw, extra_headers=extra_headers)
             return response
         except requests.exceptions.RequestException as e:
-            return None, str(e)
+            self.metrics.record(method, endpoint, role, time.perf_counter() - started)
+            self.last_error = str(e)
+            return None
     
-    def test_user_registration(self):
-        """Test user registration for all roles"""
-        print("\n=== Testing User Registration ===")
+    async def make_request_async(self, session, method, endpoint, data=None, token=None, params=None):
+        """make_request on a shared aiohttp session for the asyncio load engine.
+
+        Latency is recorded the same way; the response cache, token refresh and
+        per-phase timing stay with the threaded transport.
+        """
+        headers = self.headers.copy()
+        token = self.replaced_tokens.get(token, token)
+        role = self.role_for_token(token)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async()
         
-        test_users = [
-            {
-                "role": "admin",
-                "name": "Admin User",
-                "email": "admin@school.edu.ng",
-                "password": "AdminPass123!",
-                "phoneNumber": "+2348012345678"
-            },
-            {
-                "role": "teacher", 
-                "name": "Teacher John",
-                "email": "teacher@school.edu.ng",
-                "password": "TeacherPass123!",
-                "phoneNumber": "+2348012345679"
-            },
-            {
-                "role": "parent",
-                "name": "Parent Mary",
-                "email": "parent@school.edu.ng", 
-                "password": "ParentPass123!",
-                "phoneNumber": "+2348012345680"
+        started = time.perf_counter()
+        try:
+            async with session.request(
+                method,
+                f"{self.base_url}/{endpoint}",
+                headers=headers,
+                json=data if method in ("POST", "PUT", "PATCH") else None,
+                # requests drops None-valued params; aiohttp rejects them
+                params={key: str(value) for key, value in (params or {}).items() if value is not None}
+            ) as response:
+                content = await response.read()
+            self.metrics.record(method, endpoint, role, time.perf_counter() - started, response.status)
+            self.last_error = None
+            return BufferedResponse(response.status, content, response.headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.metrics.record(method, endpoint, role, time.perf_counter() - started)
+            self.last_error = str(e) or type(e).__name__
+            return None
+    
+    def describe_call(self, method, url, headers, data, params, response, stream=False):
+        """Request/response record kept for slow-call drill-down (tokens redacted, bodies truncated)"""
+        limit = self.metrics.SLOW_BODY_LIMIT
+        request_headers = dict(headers)
+        if "Authorization" in request_headers:
+            request_headers["Authorization"] = f"Bearer …{request_headers['Authorization'][-6:]}"
+        body = "<streamed>" if stream else response.text
+        return {
+            "at": datetime.now().isoformat(timespec="milliseconds"),
+            "request": {
+                "method": method,
+                "url": url,
+                "params": params,
+                "headers": request_headers,
+                "body": data
             },
-            {
-                "role": "student",
-                "name": "Student David",
-                "email": "student@school.edu.ng",
-                "password": "StudentPass123!",
-                "phoneNumber": "+2348012345681"
-            }
-        ]
+            "status": response.status_code,
+            "response_headers": dict(response.headers),
+            "response_body": body[:limit],
+            "response_truncated": len(body) > limit,
+            "timing": dict(response.timing),
+            "verdict": diagnose_timing(response.timing)
+        }
+    
+    def iter_records(self, endpoint, token=None, params=None, path=(), stats=None):
+        """Stream the JSON array at `path` of a GET response one record at a time.
+
+        Nothing but the current record and a read buffer is held in memory. Raises
+        ValueError when the request fails or the body is not the expected array.
+        """
+        response = self.make_request("GET", endpoint, token=token, params=params, stream=True)
+        if response is None or response.status_code != 200:
+            status = self.last_error if response is None else response.status_code
+            raise ValueError(f"GET {endpoint} failed: {status}")
+        chunks = response.iter_content(chunk_size=64 * 1024)
+        if stats is not None:
+            chunks = stats.count_bytes(chunks)
+        try:
+            yield from iter_json_array(chunks, path)
+        finally:
+            response.close()
+    
+    def test_user_registration(self, users=None):
+        """Test user registration for all roles"""
+        self.log_section("Testing User Registration")
+        
+        test_users = users or self.test_users()
         
         for user_data in test_users:
             response = self.make_request("POST", "auth/register", user_data)
@@ -102,8 +1835,7 @@ class SchoolManagementTester:
             if response and response.status_code == 200:
                 result = response.json()
                 if "token" in result and "user" in result:
-                    self.tokens[user_data["role"]] = result["token"]
-                    self.test_data[f"{user_data['role']}_user"] = result["user"]
+                    self.remember_token(user_data, result["token"], result["user"])
                     self.log_result(
                         f"Register {user_data['role']}",
                         True,
@@ -125,16 +1857,11 @@ class SchoolManagementTester:
                     error_msg
                 )
     
-    def test_user_login(self):
+    def test_user_login(self, users=None):
         """Test user login for all roles"""
-        print("\n=== Testing User Login ===")
+        self.log_section("Testing User Login")
         
-        login_data = [
-            {"email": "admin@school.edu.ng", "password": "AdminPass123!", "role": "admin"},
-            {"email": "teacher@school.edu.ng", "password": "TeacherPass123!", "role": "teacher"},
-            {"email": "parent@school.edu.ng", "password": "ParentPass123!", "role": "parent"},
-            {"email": "student@school.edu.ng", "password": "StudentPass123!", "role": "student"}
-        ]
+        login_data = users or self.test_users()
         
         for login in login_data:
             response = self.make_request("POST", "auth/login", {
@@ -145,7 +1872,7 @@ class SchoolManagementTester:
             if response and response.status_code == 200:
                 result = response.json()
                 if "token" in result:
-                    self.tokens[login["role"]] = result["token"]
+                    self.remember_token(login, result["token"], result.get("user"))
                     self.log_result(
                         f"Login {login['role']}",
                         True,
@@ -169,534 +1896,4012 @@ class SchoolManagementTester:
     
     def test_auth_me(self):
         """Test auth/me endpoint for all roles"""
-        print("\n=== Testing Auth Me Endpoint ===")
+        self.run_scenario(AUTH_ME_SCENARIO)
+    
+    def scenario_steps(self, scenario):
+        """Generator behind run_scenario/run_scenario_async: yields (step, token) for each request to send,
+        receives its response, checks and logs it; returns whether the scenario completed"""
+        self.log_section(scenario.title or f"Testing {scenario.name}")
         
-        for role, token in self.tokens.items():
-            response = self.make_request("GET", "auth/me", token=token)
+        for step in scenario.steps:
+            if step.when and not self.lookup_template(step.when):
+                self.log_result(step.name, True, f"Skipped: nothing at {step.when}")
+                continue
+            token = None
+            if step.role:
+                token = self.tokens.get(step.role)
+                if not token:
+                    if step.optional:
+                        continue
+                    self.log_result(scenario.name, False, f"{step.role.title()} token not available")
+                    return False
             
-            if response and response.status_code == 200:
-                user_data = response.json()
-                if "id" in user_data and "role" in user_data:
-                    self.log_result(
-                        f"Auth me {role}",
-                        True,
-                        f"Successfully retrieved {role} user data"
-                    )
-                else:
-                    self.log_result(
-                        f"Auth me {role}",
-                        False,
-                        "User data missing required fields",
-                        str(user_data)
-                    )
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result(
-                    f"Auth me {role}",
-                    False,
-                    f"Auth me failed with status {response.status_code if response else 'N/A'}",
-                    error_msg
+            response = yield step, token
+            ok, message, details = self.check_step(step, response)
+            self.log_result(step.name, ok, message, details)
+            if not ok and step.required:
+                return False
+        return True
+    
+    def run_scenario(self, scenario):
+        """Run a declarative scenario: resolve templates, send each step, check and log it"""
+        steps = self.scenario_steps(scenario)
+        try:
+            step, token = next(steps)
+            while True:
+                response = self.make_request(
+                    step.method,
+                    step.endpoint,
+                    self.resolve_template(step.body),
+                    token,
+                    self.resolve_template(step.params)
+                )
+                if step.think_time:
+                    time.sleep(step.think_time)
+                step, token = steps.send(response)
+        except StopIteration as done:
+            return done.value
+    
+    async def run_scenario_async(self, session, scenario):
+        """run_scenario over a shared aiohttp session (the asyncio load engine)"""
+        steps = self.scenario_steps(scenario)
+        try:
+            step, token = next(steps)
+            while True:
+                response = await self.make_request_async(
+                    session,
+                    step.method,
+                    step.endpoint,
+                    self.resolve_template(step.body),
+                    token,
+                    self.resolve_template(step.params)
                 )
+                if step.think_time:
+                    await asyncio.sleep(step.think_time)
+                step, token = steps.send(response)
+        except StopIteration as done:
+            return done.value
+    
+    def check_step(self, step, response):
+        """Returns (passed, message, details) for a step's response"""
+        if response is None or response.status_code != step.expect_status:
+            status = response.status_code if response is not None else "N/A"
+            error_msg = response.text if response is not None else (self.last_error or "Request failed")
+            return False, f"Failed with status {status}", error_msg
+        
+        try:
+            result = response.json() if step.expect or step.fields or step.capture or "{count}" in step.message \
+                else None
+        except ValueError:
+            return False, "Response is not JSON", response.text[:200]
+        if step.expect == "list" and not isinstance(result, list):
+            return False, "Response is not a list", str(result)
+        if step.expect == "object" and not (isinstance(result, dict) and result):
+            return False, "Empty or invalid response", str(result)
+        if step.expect == "success" and not (isinstance(result, dict) and result.get("success")):
+            return False, "Response missing success flag", str(result)
+        missing = [key for key in step.fields if not (isinstance(result, dict) and key in result)]
+        if missing:
+            return False, f"Response missing required fields: {', '.join(missing)}", str(result)
+        
+        if step.capture:
+            self.test_data[step.capture] = result
+        count = len(result) if isinstance(result, list) else (result or {}).get("count", 0) if isinstance(result, dict) else 0
+        return True, step.message.replace("{count}", str(count)), ""
+    
+    def resolve_template(self, value):
+        """Replace "{path}" strings with captured test_data values (see Step)"""
+        if isinstance(value, dict):
+            return {key: self.resolve_template(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve_template(item) for item in value]
+        if isinstance(value, str):
+            match = TEMPLATE_PLACEHOLDER.match(value)
+            if match:
+                return self.lookup_template(match.group(1))
+        return value
+    
+    def lookup_template(self, expression):
+        path, _, fallback = expression.partition("|")
+        if path == "uuid":
+            return str(uuid.uuid4())
+        if path == "today":
+            return datetime.now().strftime("%Y-%m-%d")
+        value = self.test_data
+        for part in path.split("."):
+            if isinstance(value, list) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            elif isinstance(value, dict) and part in value:
+                value = value[part]
+            else:
+                value = None
+                break
+        if value is None and fallback:
+            return self.lookup_template(fallback)
+        return value
     
     def test_student_management(self):
         """Test student CRUD operations"""
-        print("\n=== Testing Student Management ===")
+        self.run_scenario(STUDENT_SCENARIO)
+    
+    def test_teacher_management(self):
+        """Test teacher CRUD operations"""
+        self.run_scenario(TEACHER_SCENARIO)
+    
+    def test_class_management(self):
+        """Test class CRUD operations"""
+        self.run_scenario(CLASS_SCENARIO)
+    
+    def test_subject_management(self):
+        """Test subject CRUD operations"""
+        self.run_scenario(SUBJECT_SCENARIO)
+    
+    def test_teacher_assignments(self):
+        """Test teacher assignment system"""
+        self.run_scenario(TEACHER_ASSIGNMENT_SCENARIO)
+    
+    def test_attendance_management(self):
+        """Test attendance management system"""
+        self.run_scenario(ATTENDANCE_SCENARIO)
+    
+    def test_dashboard_statistics(self):
+        """Test dashboard statistics for all roles"""
+        self.run_scenario(DASHBOARD_SCENARIO)
+    
+    def test_role_based_access_control(self):
+        """Test role-based access control"""
+        self.run_scenario(RBAC_SCENARIO)
+    
+    def test_parent_portal(self):
+        """Test parent portal functionality"""
+        self.run_scenario(PARENT_PORTAL_SCENARIO)
+    
+    def authenticate(self):
+        """Reuse cached tokens, then register the remaining role accounts, falling back to login"""
+        missing = self.load_cached_tokens()
+        if missing:
+            self.test_user_registration(missing)
+            missing = [user for user in missing if user["role"] not in self.tokens]
+            if missing:
+                self.test_user_login(missing)
+        if self.token_store:
+            self.token_store.save()
+        return self.tokens
+    
+    def authenticate_developer(self, developer=None):
+        """Log in the platform developer, first creating it through auth/setup if the deployment has none.
+
+        Returns the token, or None when setup is closed (a developer already exists)
+        and these credentials don't log in.
+        """
+        developer = developer or DEVELOPER_USER
+        if "developer" not in self.tokens:
+            self.make_request("POST", "auth/setup", {
+                "devName": developer.get("name", "Platform Developer"),
+                "devEmail": developer["email"],
+                "devPassword": developer["password"]
+            })
+            self.test_user_login([developer])
+        return self.tokens.get("developer")
+    
+    def run_all_tests(self, workers=4):
+        """Run all test suites; after authentication independent tests overlap on `workers` threads"""
+        print("🚀 Starting Comprehensive School Management System Backend Tests")
+        print(f"📍 Testing API at: {self.base_url}")
+        print("=" * 80)
+        
+        # Run tests in logical order
+        if self.token_store and not self.load_cached_tokens():
+            self.log_section("Using Cached Tokens")
+            self.log_result("Token cache", True, f"Reused cached tokens for {len(self.tokens)} roles")
+        else:
+            self.test_user_registration()
+            self.test_user_login()
+            if self.token_store:
+                self.token_store.save()
+        TestScheduler(self, SUITE_NODES, workers=workers).run()
+        
+        return self.print_summary()
+    
+    def run_scenarios(self, scenarios):
+        """Authenticate, then run data-driven scenarios instead of the built-in tests"""
+        print("🚀 Starting Scenario Run")
+        print(f"📍 Testing API at: {self.base_url}")
+        print("=" * 80)
+        
+        self.authenticate()
+        for scenario in scenarios:
+            self.run_scenario(scenario)
+        
+        return self.print_summary()
+    
+    def print_summary(self):
+        """Print final results and timing reports"""
+        print("\n" + "=" * 80)
+        print("📊 FINAL TEST RESULTS")
+        print("=" * 80)
+        print(f"✅ Passed: {self.results['passed']}")
+        print(f"❌ Failed: {self.results['failed']}")
+        print(f"📈 Success Rate: {(self.results['passed'] / (self.results['passed'] + self.results['failed']) * 100):.1f}%")
+        
+        if self.results["errors"]:
+            print(f"\n🔍 DETAILED ERROR SUMMARY:")
+            for i, error in enumerate(self.results["errors"], 1):
+                print(f"{i}. {error}")
+        
+        transport_stats = self.transport.summary()
+        if transport_stats.get("requests"):
+            print(f"\n🔌 Connections: {transport_stats['connections']} opened for {transport_stats['requests']} requests "
+                  f"({transport_stats['reuse_rate'] * 100:.1f}% reused)")
+            print(f"⏱️  Avg connect: {transport_stats['avg_connect_ms']:.1f}ms | Avg server: {transport_stats['avg_server_ms']:.1f}ms")
+        
+        self.metrics.print_report()
+        self.metrics.print_breakdown()
+        if self.cache:
+            self.cache.print_report()
+        
+        return self.results
+
+
+class TestScheduler:
+    """Runs TestNodes on a worker pool as soon as the nodes producing their inputs have finished.
+
+    Each node runs on a tester branch seeded with the base test_data plus the
+    final test_data of its direct dependencies, so sibling branches never see
+    each other's captures. Results and buffered output are merged back into the
+    tester as nodes complete; with one worker the nodes run in list order.
+    """
+    __test__ = False
+    
+    def __init__(self, tester, nodes, workers=4):
+        self.tester = tester
+        self.nodes = nodes
+        self.workers = max(workers, 1)
+        self.timings = {}
+    
+    def dependencies(self):
+        """node method -> methods of the nearest earlier nodes producing its inputs"""
+        producers = {}
+        graph = {}
+        for node in self.nodes:
+            graph[node.method] = [producers[key] for key in node.inputs if key in producers]
+            for key in node.outputs:
+                producers[key] = node.method
+        return graph
+    
+    def run_node(self, node, branch):
+        started = time.perf_counter()
+        if node.scenario:
+            branch.run_scenario(node.scenario)
+        else:
+            getattr(branch, node.method)()
+        self.timings[node.method] = time.perf_counter() - started
+        return branch
+    
+    def merge(self, branch):
+        results = self.tester.results
+        results["passed"] += branch.results["passed"]
+        results["failed"] += branch.results["failed"]
+        results["errors"].extend(branch.results["errors"])
+        for line in branch.output:
+            print(line)
+    
+    def run(self):
+        graph = self.dependencies()
+        order = {node.method: index for index, node in enumerate(self.nodes)}
+        waiting = {node.method: set(graph[node.method]) for node in self.nodes}
+        by_method = {node.method: node for node in self.nodes}
+        finished = {}
+        running = {}
+        base = dict(self.tester.test_data)
+        started = time.perf_counter()
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while waiting or running:
+                for method in sorted((m for m, deps in waiting.items() if not deps), key=order.get):
+                    if len(running) >= self.workers:
+                        break
+                    data = dict(base)
+                    for dependency in graph[method]:
+                        data.update(finished[dependency].test_data)
+                    del waiting[method]
+                    future = executor.submit(self.run_node, by_method[method], self.tester.branch(data))
+                    running[future] = method
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda future: order[running[future]]):
+                    method = running.pop(future)
+                    finished[method] = future.result()
+                    self.merge(finished[method])
+                    for deps in waiting.values():
+                        deps.discard(method)
         
-        if "admin" not in self.tokens:
-            self.log_result("Student Management", False, "Admin token not available")
+        for node in self.nodes:
+            self.tester.test_data.update(finished[node.method].test_data)
+        wall = time.perf_counter() - started
+        serial = sum(self.timings.values())
+        if self.tester.verbose:
+            print(f"\n⏱️  {len(self.nodes)} tests on {self.workers} workers in {wall:.2f}s "
+                  f"(sum of test times {serial:.2f}s, {serial / wall if wall else 1:.1f}x overlap)")
+        return wall
+
+
+class LoadTestRunner:
+    """Drives the test_* scenarios with N concurrent virtual users, each holding its own tokens.
+
+    The "thread" engine gives every virtual user an OS thread on the pooled
+    requests transport. The "asyncio" engine runs every user as a coroutine on one
+    event loop sharing an aiohttp session, so thousands of users cost no threads;
+    it logs every user in before the clock starts and only runs Scenario objects.
+    """
+    def __init__(self, base_url=BASE_URL, users=10, engine="thread", rps=0, ramp_up=0, duration=60,
+                 pool_size=POOL_SIZE, keep_alive=True, scenarios=None, cache=None, token_store=None,
+                 account_prefix=None, warm_concurrency=16):
+        self.base_url = base_url
+        self.users = users
+        self.engine = engine
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.scenarios = scenarios or LOAD_SCENARIOS
+        # A fixed prefix reuses the same accounts (and cached tokens) across runs
+        self.run_id = account_prefix or uuid.uuid4().hex[:8]
+        self.token_store = token_store
+        self.warm_concurrency = warm_concurrency
+        self.prepared = {}
+        self.pool_size = max(pool_size, users)
+        self.keep_alive = keep_alive
+        self.transport = PooledTransport(pool_size=self.pool_size, keep_alive=keep_alive)
+        self.metrics = MetricsRegistry()
+        self.cache = cache
+        self.rate_limiter = RateLimiter(rps) if rps else None
+        self.testers = []
+        self.iterations = 0
+        self._lock = threading.Lock()
+    
+    def start_delay(self, index):
+        """Spread virtual user start times evenly across the ramp-up window"""
+        if not self.ramp_up or self.users <= 1:
+            return 0.0
+        return self.ramp_up * index / (self.users - 1)
+    
+    def setup_user(self, index):
+        """Register (or log in) one virtual user's four role accounts"""
+        tester = SchoolManagementTester(
+            base_url=self.base_url,
+            transport=self.transport,
+            account_tag=f"vu{index}-{self.run_id}",
+            verbose=False,
+            rate_limiter=self.rate_limiter,
+            metrics=self.metrics,
+            cache=self.cache,
+            token_store=self.token_store
+        )
+        with self._lock:
+            self.testers.append(tester)
+        tester.authenticate()
+        return tester
+    
+    def warm_tokens(self):
+        """Authenticate every virtual user in parallel before the clock starts"""
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=min(self.warm_concurrency, self.users)) as executor:
+            for index, tester in enumerate(executor.map(self.setup_user, range(self.users))):
+                self.prepared[index] = tester
+        if self.token_store:
+            self.token_store.save()
+        ready = sum(1 for tester in self.prepared.values() if tester.tokens)
+        print(f"🔑 Warmed {ready}/{self.users} virtual users in {time.monotonic() - started:.1f}s")
+    
+    def tester_for(self, index):
+        return self.prepared.get(index) or self.setup_user(index)
+    
+    def run_iteration(self, tester, deadline):
+        """Run one pass over the scenarios; returns False once the deadline is reached"""
+        for scenario in self.scenarios:
+            if time.monotonic() >= deadline:
+                return False
+            if isinstance(scenario, Scenario):
+                tester.run_scenario(scenario)
+            else:
+                getattr(tester, scenario)()
+        with self._lock:
+            self.iterations += 1
+        return True
+    
+    def run_user_thread(self, index, deadline):
+        time.sleep(self.start_delay(index))
+        tester = self.tester_for(index)
+        # A user without tokens would only spin through "token not available" failures
+        if not tester.tokens:
+            return
+        while time.monotonic() < deadline and self.run_iteration(tester, deadline):
+            pass
+    
+    async def run_iteration_async(self, session, tester, deadline):
+        for scenario in self.scenarios:
+            if time.monotonic() >= deadline:
+                return False
+            await tester.run_scenario_async(session, scenario)
+        with self._lock:
+            self.iterations += 1
+        return True
+    
+    async def run_user_async(self, session, index, deadline):
+        await asyncio.sleep(self.start_delay(index))
+        tester = self.prepared.get(index)
+        if tester is None or not tester.tokens:
             return
+        while time.monotonic() < deadline and await self.run_iteration_async(session, tester, deadline):
+            pass
+    
+    async def run_async(self, deadline):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, force_close=not self.keep_alive)
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await asyncio.gather(*[self.run_user_async(session, index, deadline) for index in range(self.users)])
+    
+    def run(self):
+        """Run the load test and print a summary"""
+        print("🚀 Starting Load Test")
+        print(f"📍 Testing API at: {self.base_url}")
+        print(f"👥 {self.users} virtual users | engine={self.engine} | ramp-up={self.ramp_up}s | duration={self.duration}s"
+              f" | target RPS={1 / self.rate_limiter.interval if self.rate_limiter else 'unthrottled'}")
+        print("=" * 80)
+        
+        # Logins run on the threaded transport, so asyncio users are all logged in up front
+        if self.token_store or self.engine == "asyncio":
+            self.warm_tokens()
         
-        admin_token = self.tokens["admin"]
-        
-        # Test Create Student
-        student_data = {
-            "firstName": "John",
-            "lastName": "Doe",
-            "email": "john.doe@student.edu.ng",
-            "dateOfBirth": "2010-05-15",
-            "gender": "Male",
-            "address": "123 Lagos Street, Lagos",
-            "phoneNumber": "+2348012345682",
-            "classId": str(uuid.uuid4()),
-            "parentId": self.test_data.get("parent_user", {}).get("id", str(uuid.uuid4())),
-            "admissionNumber": "STU001",
-            "admissionDate": "2024-01-15"
+        # Both engines record every request sent in self.metrics; logins sent by
+        # warm_tokens() before the clock starts are left out of the rate
+        setup_requests = sum(row["count"] for row in self.metrics.rows())
+        started = time.monotonic()
+        deadline = started + self.ramp_up + self.duration
+        if self.engine == "asyncio":
+            asyncio.run(self.run_async(deadline))
+        else:
+            with ThreadPoolExecutor(max_workers=self.users) as executor:
+                futures = [executor.submit(self.run_user_thread, index, deadline) for index in range(self.users)]
+                for future in futures:
+                    future.result()
+        elapsed = time.monotonic() - started
+        
+        results = {
+            "passed": sum(tester.results["passed"] for tester in self.testers),
+            "failed": sum(tester.results["failed"] for tester in self.testers),
+            "errors": [error for tester in self.testers for error in tester.results["errors"]],
+            "iterations": self.iterations,
+            "elapsed": elapsed,
+            "transport": self.transport.summary()
         }
+        requests_sent = sum(row["count"] for row in self.metrics.rows()) - setup_requests
+        results["rps"] = requests_sent / elapsed if elapsed else 0.0
         
-        response = self.make_request("POST", "students", student_data, admin_token)
+        print("\n" + "=" * 80)
+        print("📊 LOAD TEST RESULTS")
+        print("=" * 80)
+        print(f"🔁 Scenario iterations: {results['iterations']}")
+        print(f"📨 Requests: {requests_sent} in {elapsed:.1f}s ({results['rps']:.1f} req/s)")
+        print(f"✅ Passed checks: {results['passed']}")
+        print(f"❌ Failed checks: {results['failed']}")
+        if requests_sent and self.engine == "thread":
+            print(f"⏱️  Avg connect: {results['transport']['avg_connect_ms']:.1f}ms | Avg server: {results['transport']['avg_server_ms']:.1f}ms")
         
-        if response and response.status_code == 200:
-            created_student = response.json()
-            self.test_data["created_student"] = created_student
-            self.log_result("Create Student", True, "Successfully created student")
-            
-            # Test Get Students
-            response = self.make_request("GET", "students", token=admin_token)
-            if response and response.status_code == 200:
-                students = response.json()
-                if isinstance(students, list):
-                    self.log_result("Get Students", True, f"Retrieved {len(students)} students")
+        # Identical failures repeat across users; show each distinct one once
+        distinct_errors = sorted(set(results["errors"]))
+        if distinct_errors:
+            print(f"\n🔍 DISTINCT ERRORS ({len(distinct_errors)}):")
+            for i, error in enumerate(distinct_errors[:20], 1):
+                print(f"{i}. {error}")
+        
+        self.metrics.print_report()
+        self.metrics.print_breakdown()
+        if self.cache:
+            self.cache.print_report()
+        if self.token_store:
+            self.token_store.save()
+        self.transport.close()
+        return results
+
+
+class SeedDataGenerator:
+    """Fills a school with deterministic, school-scale data through the public API.
+
+    The plan is derived entirely from `seed`, so two runs with the same settings
+    post the same records. Created ids are checkpointed to `state_path` after every
+    batch; rerunning with the same settings resumes where an interrupted run stopped.
+    """
+    def __init__(self, tester, token, seed=42, classes=12, subjects=10, teachers=30, students=600, parents=400,
+                 attendance_days=60, term_start=SEED_TERM_START, batch_size=50, concurrency=8,
+                 state_path=SEED_STATE_PATH):
+        self.tester = tester
+        self.token = token
+        self.seed = seed
+        self.config = {
+            "seed": seed,
+            "classes": classes,
+            "subjects": subjects,
+            "teachers": teachers,
+            "students": students,
+            "parents": parents,
+            "attendance_days": attendance_days,
+            "term_start": term_start
+        }
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.state_path = state_path
+        self.state = self.load_state()
+        self.plan = self.build_plan()
+        self.failures = 0
+        self.posted = 0
+    
+    def load_state(self):
+        """Load the checkpoint for this exact configuration, or start a fresh one"""
+        if self.state_path:
+            try:
+                with open(self.state_path) as f:
+                    state = json.load(f)
+                if state.get("config") == self.config:
+                    return state
+                print(f"⚠️  Ignoring {self.state_path}: it was written for a different seed configuration")
+            except FileNotFoundError:
+                pass
+        return {"config": self.config, "created": {}, "attendance": {}}
+    
+    def save_state(self):
+        if not self.state_path:
+            return
+        with open(self.state_path, "w") as f:
+            json.dump(self.state, f)
+    
+    def build_plan(self):
+        """Generate every record up front from the seeded RNG"""
+        rng = random.Random(self.seed)
+        config = self.config
+        tag = f"seed{self.seed}"
+        
+        def person(index, kind):
+            first, last = rng.choice(SEED_FIRST_NAMES), rng.choice(SEED_LAST_NAMES)
+            return {
+                "firstName": first,
+                "lastName": last,
+                "email": f"{first.lower()}.{last.lower()}.{kind}{index}@{tag}.school.edu.ng",
+                "phoneNumber": f"+23480{rng.randrange(10 ** 8):08d}",
+                "address": f"{rng.randint(1, 250)} {rng.choice(['Lagos', 'Abuja', 'Ibadan', 'Kano', 'Enugu', 'Port Harcourt'])} Road"
+            }
+        
+        classes = []
+        for index in range(config["classes"]):
+            name, level = SEED_CLASS_LEVELS[index % len(SEED_CLASS_LEVELS)]
+            section = chr(ord("A") + index // len(SEED_CLASS_LEVELS))
+            classes.append({
+                "name": f"{name}{section}",
+                "level": level,
+                "section": section,
+                "capacity": rng.choice([30, 35, 40, 45]),
+                "academicYear": "2024/2025"
+            })
+        
+        subjects = []
+        for index in range(config["subjects"]):
+            name, code = SEED_SUBJECTS[index % len(SEED_SUBJECTS)]
+            cycle = index // len(SEED_SUBJECTS)
+            subjects.append({
+                "name": name if not cycle else f"{name} {cycle + 1}",
+                "code": f"{code}{101 + cycle}",
+                "description": f"{name} for secondary school",
+                "credits": rng.choice([2, 3, 4]),
+                "level": "Secondary"
+            })
+        
+        teachers = []
+        for index in range(config["teachers"]):
+            teacher = person(index, "tch")
+            teacher.update({
+                "qualification": rng.choice(["B.Ed", "B.Sc", "M.Ed", "NCE"]),
+                "experience": f"{rng.randint(1, 25)} years",
+                "specialization": rng.choice(SEED_SUBJECTS)[0],
+                "employeeId": f"TCH{index + 1:05d}",
+                "dateOfJoining": f"20{rng.randint(10, 24)}-{rng.randint(1, 12):02d}-01"
+            })
+            teachers.append(teacher)
+        
+        parents = [person(index, "par") for index in range(config["parents"])]
+        
+        students = []
+        for index in range(config["students"]):
+            student = person(index, "stu")
+            student.update({
+                "dateOfBirth": f"20{rng.randint(6, 14):02d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "gender": rng.choice(["Male", "Female"]),
+                "admissionNumber": f"STU{index + 1:06d}",
+                "admissionDate": "2024-09-09",
+                "class_ref": index % max(config["classes"], 1),
+                "parent_ref": rng.randrange(config["parents"]) if config["parents"] else None
+            })
+            students.append(student)
+        
+        days = []
+        day = datetime.strptime(config["term_start"], "%Y-%m-%d")
+        while len(days) < config["attendance_days"]:
+            if day.weekday() < 5:
+                days.append(day.strftime("%Y-%m-%d"))
+            day += timedelta(days=1)
+        
+        return {
+            "classes": classes,
+            "subjects": subjects,
+            "teachers": teachers,
+            "parents": parents,
+            "students": students,
+            "days": days,
+            "attendance_seed": rng.getrandbits(32)
+        }
+    
+    def created_id(self, collection, index):
+        return self.state["created"].get(collection, {}).get(str(index))
+    
+    def post(self, endpoint, payload):
+        """POST one record; returns the parsed response or None"""
+        response = self.tester.make_request("POST", endpoint, payload, self.token)
+        if response is not None and response.status_code == 200:
+            return response.json()
+        return None
+    
+    def run_batches(self, executor, jobs, on_result):
+        """Run (key, endpoint, payload) jobs in bounded-concurrency batches, checkpointing after each"""
+        for start in range(0, len(jobs), self.batch_size):
+            batch = jobs[start:start + self.batch_size]
+            results = executor.map(lambda job: (job[0], self.post(job[1], job[2])), batch)
+            for key, result in results:
+                self.posted += 1
+                if result is None:
+                    self.failures += 1
                 else:
-                    self.log_result("Get Students", False, "Response is not a list", str(students))
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Get Students", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-            
-            # Test Update Student
-            update_data = {"firstName": "Jane", "lastName": "Smith"}
-            response = self.make_request("PUT", "students", update_data, admin_token, {"id": created_student["id"]})
-            
-            if response and response.status_code == 200:
-                self.log_result("Update Student", True, "Successfully updated student")
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Update Student", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-            
-            # Test Delete Student
-            response = self.make_request("DELETE", "students", token=admin_token, params={"id": created_student["id"]})
-            
-            if response and response.status_code == 200:
-                self.log_result("Delete Student", True, "Successfully deleted student")
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Delete Student", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+                    on_result(key, result)
+            self.save_state()
+    
+    def seed_collection(self, executor, collection, endpoint, payload_for):
+        created = self.state["created"].setdefault(collection, {})
+        jobs = []
+        for index, record in enumerate(self.plan[collection]):
+            if str(index) in created:
+                continue
+            payload = payload_for(record)
+            if payload is not None:
+                jobs.append((index, endpoint, payload))
+        
+        def on_result(index, result):
+            # teachers/parents respond with {"teacher": {...}} / {"parent": {...}}
+            record = result.get("teacher") or result.get("parent") or result
+            created[str(index)] = record.get("id")
+        
+        self.run_batches(executor, jobs, on_result)
+        print(f"🌱 {collection}: {len(created)}/{len(self.plan[collection])} created")
+    
+    def teacher_payload(self, teacher):
+        return {
+            "teacherData": teacher,
+            "credentials": {"email": teacher["email"], "password": SEED_PASSWORD}
+        }
+    
+    def parent_payload(self, parent):
+        return {
+            "parentData": {
+                "name": f"{parent['firstName']} {parent['lastName']}",
+                "phoneNumber": parent["phoneNumber"],
+                "address": parent["address"]
+            },
+            "parentCredentials": {"email": parent["email"], "password": SEED_PASSWORD}
+        }
+    
+    def student_payload(self, student):
+        payload = {key: value for key, value in student.items() if not key.endswith("_ref")}
+        payload["classId"] = self.created_id("classes", student["class_ref"])
+        if student["parent_ref"] is not None:
+            payload["parentId"] = self.created_id("parents", student["parent_ref"])
+        # Students whose class failed to seed are retried on the next (resumed) run
+        return payload if payload["classId"] else None
+    
+    def seed_attendance(self, executor):
+        """One attendance/bulk POST per class per school day"""
+        done = self.state["attendance"]
+        rosters = defaultdict(list)
+        for index, student in enumerate(self.plan["students"]):
+            student_id = self.created_id("students", index)
+            if student_id:
+                rosters[student["class_ref"]].append(student_id)
+        
+        jobs = []
+        for day in self.plan["days"]:
+            # Per-day RNG keeps statuses identical whether or not earlier days were skipped on resume
+            rng = random.Random(f"{self.plan['attendance_seed']}-{day}")
+            for class_index, roster in sorted(rosters.items()):
+                class_id = self.created_id("classes", class_index)
+                key = f"{day}|{class_index}"
+                statuses = [rng.choices(["present", "late", "absent"], weights=[90, 4, 6])[0] for _ in roster]
+                if key in done or not class_id:
+                    continue
+                jobs.append((key, "attendance/bulk", {
+                    "attendanceList": [
+                        {"studentId": student_id, "classId": class_id, "date": day, "status": status}
+                        for student_id, status in zip(roster, statuses)
+                    ]
+                }))
+        
+        def on_result(key, result):
+            done[key] = result.get("count", 0)
+        
+        self.run_batches(executor, jobs, on_result)
+        print(f"🌱 attendance: {len(done)}/{len(self.plan['days']) * len(rosters)} class-days, "
+              f"{sum(done.values())} records")
+    
+    def run(self):
+        """Seed every collection in dependency order and print a summary"""
+        print(f"🌱 Seeding school data (seed={self.seed}, state={self.state_path or 'disabled'})")
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self.seed_collection(executor, "classes", "classes", dict)
+            self.seed_collection(executor, "subjects", "subjects", dict)
+            self.seed_collection(executor, "teachers", "teachers", self.teacher_payload)
+            self.seed_collection(executor, "parents", "parents", self.parent_payload)
+            self.seed_collection(executor, "students", "students", self.student_payload)
+            self.seed_attendance(executor)
+        elapsed = time.monotonic() - started
+        print(f"✅ Seeding posted {self.posted} requests in {elapsed:.1f}s "
+              f"({self.posted / elapsed if elapsed else 0:.1f} req/s), {self.failures} failed")
+        return {"passed": self.posted - self.failures, "failed": self.failures, "errors": []}
+
+
+class BulkAttendanceBenchmark:
+    """Sweeps attendance/bulk batch size and concurrency to find the best client batch size"""
+    def __init__(self, tester, token, batch_sizes=(10, 50, 100, 500, 1000, 5000), concurrency_levels=(1, 4, 16),
+                 requests_per_point=20):
+        self.tester = tester
+        self.token = token
+        self.batch_sizes = batch_sizes
+        self.concurrency_levels = concurrency_levels
+        self.requests_per_point = requests_per_point
+        self.rows = []
+    
+    def build_payload(self, batch_size, sequence):
+        """A full class register for one day; every request gets its own class and date"""
+        class_id = str(uuid.uuid4())
+        date = (datetime(2000, 1, 3) + timedelta(days=sequence)).strftime("%Y-%m-%d")
+        statuses = ("present", "present", "present", "present", "late", "absent")
+        return {
+            "attendanceList": [
+                {
+                    "studentId": str(uuid.uuid4()),
+                    "classId": class_id,
+                    "date": date,
+                    "status": statuses[index % len(statuses)],
+                    "remarks": ""
+                }
+                for index in range(batch_size)
+            ]
+        }
+    
+    def send(self, batch_size, sequence):
+        payload = self.build_payload(batch_size, sequence)
+        payload_bytes = len(json.dumps(payload).encode())
+        started = time.perf_counter()
+        response = self.tester.make_request("POST", "attendance/bulk", payload, self.token)
+        latency = time.perf_counter() - started
+        ok = response is not None and response.status_code == 200
+        server = getattr(response, "timing", {}).get("server", latency) if response is not None else latency
+        return ok, payload_bytes, latency, server
+    
+    def run_point(self, batch_size, concurrency, sequence_start):
+        latency = LatencyHistogram()
+        server = LatencyHistogram()
+        ok_count = 0
+        payload_bytes = 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            sequences = range(sequence_start, sequence_start + self.requests_per_point)
+            for ok, size, elapsed, server_elapsed in executor.map(lambda seq: self.send(batch_size, seq), sequences):
+                ok_count += ok
+                payload_bytes += size
+                latency.record(elapsed * 1_000_000)
+                server.record(server_elapsed * 1_000_000)
+        wall = time.perf_counter() - started
+        return {
+            "batch_size": batch_size,
+            "concurrency": concurrency,
+            "requests": self.requests_per_point,
+            "error_rate": 1 - ok_count / self.requests_per_point,
+            "records_per_sec": ok_count * batch_size / wall if wall else 0.0,
+            "payload_bytes": payload_bytes // self.requests_per_point,
+            "p50_ms": latency.percentile(50) / 1000,
+            "p99_ms": latency.percentile(99) / 1000,
+            "server_p50_ms": server.percentile(50) / 1000
+        }
+    
+    def run(self):
+        """Run every (batch size, concurrency) point and print the sweep table"""
+        print("📦 Bulk attendance sweep: batch sizes "
+              f"{list(self.batch_sizes)} x concurrency {list(self.concurrency_levels)}, "
+              f"{self.requests_per_point} requests per point")
+        sequence = 0
+        for batch_size in self.batch_sizes:
+            for concurrency in self.concurrency_levels:
+                self.rows.append(self.run_point(batch_size, concurrency, sequence))
+                sequence += self.requests_per_point
+        
+        print(f"\n{'BATCH':>6} {'CONC':>5} {'ERR%':>6} {'REC/S':>10} {'KB/REQ':>8} {'p50ms':>8} {'p99ms':>8} {'SRVp50':>8}")
+        for row in self.rows:
+            print(f"{row['batch_size']:>6} {row['concurrency']:>5} {row['error_rate'] * 100:>6.1f} "
+                  f"{row['records_per_sec']:>10.0f} {row['payload_bytes'] / 1024:>8.1f} "
+                  f"{row['p50_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['server_p50_ms']:>8.1f}")
+        
+        clean = [row for row in self.rows if row["error_rate"] == 0]
+        if clean:
+            best = max(clean, key=lambda row: row["records_per_sec"])
+            print(f"🏁 Best error-free point: batch={best['batch_size']} concurrency={best['concurrency']} "
+                  f"({best['records_per_sec']:.0f} records/s)")
+        else:
+            print("⚠️  Every point had errors")
+        self.tester.metrics.add_benchmark("bulk_attendance", self.rows)
+        
+        failed = sum(1 for row in self.rows if row["error_rate"] > 0)
+        return {"passed": len(self.rows) - failed, "failed": failed, "errors": []}
+
+
+class PaginationBenchmark:
+    """Walks list endpoints page by page and charts latency against skip depth"""
+    def __init__(self, tester, endpoints=None, page_size=50, max_pages=1000, depth_buckets=10):
+        self.tester = tester
+        self.endpoints = endpoints or PAGED_ENDPOINTS
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.depth_buckets = depth_buckets
+        self.rows = []
+    
+    def scan(self, endpoint, token):
+        """Fetch pages until a short page; returns [(skip, latency_seconds, records)] and scan stats"""
+        pages = []
+        seen_ids = set()
+        duplicates = 0
+        failed = False
+        for page in range(self.max_pages):
+            skip = page * self.page_size
+            started = time.perf_counter()
+            response = self.tester.make_request("GET", endpoint, token=token,
+                                                params={"limit": self.page_size, "skip": skip})
+            latency = time.perf_counter() - started
+            if response is None or response.status_code != 200:
+                failed = True
+                break
+            records = response.json()
+            if not isinstance(records, list):
+                failed = True
+                break
+            for record in records:
+                record_id = record.get("id") if isinstance(record, dict) else None
+                if record_id in seen_ids:
+                    duplicates += 1
+                elif record_id is not None:
+                    seen_ids.add(record_id)
+            pages.append((skip, latency, len(records)))
+            if len(records) < self.page_size:
+                break
+        return pages, {"records": sum(page[2] for page in pages), "duplicates": duplicates, "failed": failed}
+    
+    def depth_profile(self, pages):
+        """Median latency for evenly sized skip-depth buckets"""
+        if not pages:
+            return []
+        per_bucket = max(math.ceil(len(pages) / self.depth_buckets), 1)
+        profile = []
+        for start in range(0, len(pages), per_bucket):
+            bucket = pages[start:start + per_bucket]
+            latencies = sorted(latency for _, latency, _ in bucket)
+            profile.append({
+                "skip_from": bucket[0][0],
+                "skip_to": bucket[-1][0] + self.page_size - 1,
+                "p50_ms": latencies[len(latencies) // 2] * 1000,
+                "max_ms": latencies[-1] * 1000
+            })
+        return profile
+    
+    def print_chart(self, endpoint, stats, profile):
+        print(f"\n📜 {endpoint}: {stats['pages']} pages x {self.page_size}, {stats['records']} records, "
+              f"{stats['duplicates']} duplicate ids{' (scan failed)' if stats['failed'] else ''}")
+        if not profile:
+            return
+        widest = max(point["p50_ms"] for point in profile) or 1
+        for point in profile:
+            bar = "█" * max(int(point["p50_ms"] / widest * 40), 1)
+            print(f"  skip {point['skip_from']:>7}-{point['skip_to']:<7} | {bar} {point['p50_ms']:.1f}ms")
+        print(f"  deep/shallow p50 ratio: {stats['depth_ratio']:.2f}x")
+    
+    def run(self):
+        print(f"📜 Pagination scan: page size {self.page_size}, up to {self.max_pages} pages per endpoint")
+        failed_endpoints = 0
+        skipped = []
+        for endpoint, role in self.endpoints.items():
+            token = self.tester.tokens.get(role)
+            if not token:
+                print(f"⚠️  Skipping {endpoint}: no {role} token")
+                skipped.append(f"{endpoint}: no {role} token")
+                continue
+            pages, stats = self.scan(endpoint, token)
+            profile = self.depth_profile(pages)
+            stats["pages"] = len(pages)
+            stats["depth_ratio"] = profile[-1]["p50_ms"] / profile[0]["p50_ms"] if profile and profile[0]["p50_ms"] else 1.0
+            self.print_chart(endpoint, stats, profile)
+            self.rows.append({"endpoint": endpoint, "role": role, "page_size": self.page_size, **stats, "profile": profile})
+            failed_endpoints += bool(stats["failed"])
+        self.tester.metrics.add_benchmark("pagination", self.rows)
+        # A skipped endpoint has no row; it fails the run without counting against the scanned ones
+        return {"passed": len(self.rows) - failed_endpoints, "failed": failed_endpoints + len(skipped),
+                "errors": skipped}
+
+
+# Aggregation endpoints timed at each data scale: (label, endpoint, params, role)
+STATS_QUERIES = [
+    ("dashboard/stats", "dashboard/stats", None, "developer"),
+    ("dashboard/stats", "dashboard/stats", None, "admin"),
+    ("dashboard/stats", "dashboard/stats", None, "teacher"),
+    ("dashboard/stats", "dashboard/stats", None, "parent"),
+    ("school-stats?type=overview", "reports/school-stats", {"type": "overview"}, "admin"),
+    ("school-stats?type=detailed", "reports/school-stats", {"type": "detailed"}, "admin"),
+    ("school-stats?type=trends", "reports/school-stats", {"type": "trends"}, "admin")
+]
+
+# Per-collection counts seeded at 1x by bench-dashboard; every scale multiplies them
+DASHBOARD_BASE_COUNTS = {"classes": 2, "subjects": 4, "teachers": 3, "students": 30, "parents": 15}
+
+
+def time_samples(call, samples, warmup=1):
+    """Time `samples` calls of `call()` after `warmup` untimed ones, so connection
+    setup and server-side warm-up stay out of the numbers.
+
+    Returns (LatencyHistogram in microseconds, errors); an error is a missing
+    response or any status but 200.
+    """
+    for _ in range(warmup):
+        call()
+    latency = LatencyHistogram()
+    errors = 0
+    for _ in range(samples):
+        started = time.perf_counter()
+        response = call()
+        latency.record((time.perf_counter() - started) * 1_000_000)
+        errors += response is None or response.status_code != 200
+    return latency, errors
+
+
+def growth_exponents(rows, size_key, threshold, series_keys):
+    """Fit latency ~ size^k between consecutive rows of each series.
+
+    Rows are grouped by their `series_keys` values and taken in order; every
+    step to a larger `size_key` gives k = log(p50 ratio) / log(size ratio),
+    flagged super-linear above `threshold`.
+    """
+    series = defaultdict(list)
+    for row in rows:
+        series[tuple(row[key] for key in series_keys)].append(row)
+    growth = []
+    for names, points in series.items():
+        for low, high in zip(points, points[1:]):
+            if low[size_key] <= 0 or high[size_key] <= low[size_key] or low["p50_ms"] <= 0 or high["p50_ms"] <= 0:
+                continue
+            exponent = math.log(high["p50_ms"] / low["p50_ms"]) / math.log(high[size_key] / low[size_key])
+            growth.append({
+                **dict(zip(series_keys, names)),
+                f"from_{size_key}": low[size_key],
+                f"to_{size_key}": high[size_key],
+                "latency_ratio": high["p50_ms"] / low["p50_ms"],
+                "size_ratio": high[size_key] / low[size_key],
+                "exponent": exponent,
+                "super_linear": exponent > threshold
+            })
+    return growth
+
+
+def print_growth(growth, columns, size_key, unit=None):
+    """One line per growth_exponents() point, 🔥 on super-linear ones; `columns` are (key, width) naming the series"""
+    for point in growth:
+        marker = "🔥" if point["super_linear"] else "  "
+        names = " ".join(f"{str(point[key])[:width]:<{width}}" for key, width in columns)
+        print(f"{marker} {names} {point['from_' + size_key]}→{point['to_' + size_key]} {unit or size_key} "
+              f"latency x{point['latency_ratio']:.2f} k={point['exponent']:.2f}")
+
+
+class DashboardScaleBenchmark:
+    """Seeds the school at growing multiples of a base dataset and times every role's stats queries.
+
+    Each scale tops the school up to `scale` x `base_counts` with SeedDataGenerator
+    (one checkpoint per scale), links the harness teacher to the new classes so the
+    teacher dashboard has work to do, then samples every STATS_QUERIES entry.
+    Growth between scales is reported as the exponent k in latency ~ records^k;
+    k above `growth_threshold` is flagged as super-linear. The developer dashboard
+    logs in `developer` (DEVELOPER_USER by default); a query whose role has no
+    token is reported as skipped and fails the run.
+    """
+    def __init__(self, tester, scales=(1, 10, 100), base_counts=None, attendance_days=5, samples=20, seed=42,
+                 growth_threshold=1.1, batch_size=50, concurrency=8, state_prefix="seed_state_dashboard",
+                 queries=None, developer=None):
+        self.tester = tester
+        self.scales = sorted(scales)
+        self.base_counts = base_counts or DASHBOARD_BASE_COUNTS
+        self.attendance_days = attendance_days
+        self.samples = samples
+        self.seed = seed
+        self.growth_threshold = growth_threshold
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.state_prefix = state_prefix
+        self.queries = queries or STATS_QUERIES
+        self.developer = developer
+        self.records = 0
+        self.rows = []
+        self.growth = []
+    
+    def seed_scale(self, scale, previous):
+        """Top the school up from `previous` x to `scale` x the base counts; returns records added"""
+        token = self.tester.tokens["admin"]
+        counts = {name: count * scale - count * previous for name, count in self.base_counts.items()}
+        seeder = SeedDataGenerator(
+            self.tester,
+            token,
+            # A distinct seed per scale keeps emails and admission numbers unique across top-ups
+            seed=self.seed * 1000 + scale,
+            attendance_days=self.attendance_days,
+            batch_size=self.batch_size,
+            concurrency=self.concurrency,
+            state_path=f"{self.state_prefix}_x{scale}.json" if self.state_prefix else None,
+            **counts
+        )
+        seeder.run()
+        self.assign_teacher(seeder)
+        created = sum(len(ids) for ids in seeder.state["created"].values())
+        return created + sum(seeder.state["attendance"].values())
+    
+    def assign_teacher(self, seeder):
+        """Give the harness teacher every newly seeded class so its dashboard grows with the school"""
+        teacher = self.tester.test_data.get("teacher_user")
+        subject_id = seeder.created_id("subjects", 0)
+        if not teacher or not subject_id:
+            return
+        jobs = [
+            ("teacher-assignments", {
+                "teacherId": teacher["id"],
+                "subjectId": subject_id,
+                "classId": class_id,
+                "subjectName": seeder.plan["subjects"][0]["name"],
+                "className": seeder.plan["classes"][int(index)]["name"],
+                "academicYear": "2024/2025"
+            })
+            for index, class_id in seeder.state["created"].get("classes", {}).items()
+        ]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            list(executor.map(lambda job: seeder.post(*job), jobs))
+    
+    def measure(self, scale, label, endpoint, params, role):
+        token = self.tester.tokens[role]
+        latency, errors = time_samples(
+            lambda: self.tester.make_request("GET", endpoint, token=token, params=params), self.samples)
+        return {
+            "scale": scale,
+            "records": self.records,
+            "query": label,
+            "role": role,
+            "samples": self.samples,
+            "errors": errors,
+            "p50_ms": latency.percentile(50) / 1000,
+            "p95_ms": latency.percentile(95) / 1000
+        }
+    
+    def analyse(self):
+        self.growth = growth_exponents(self.rows, "records", self.growth_threshold, ("query", "role"))
+    
+    def print_report(self):
+        print(f"\n{'QUERY':<28} {'ROLE':<10} {'SCALE':>6} {'RECORDS':>9} {'ERR':>4} {'p50ms':>8} {'p95ms':>8}")
+        for row in sorted(self.rows, key=lambda row: (row["query"], row["role"], row["scale"])):
+            print(f"{row['query']:<28} {row['role']:<10} {str(row['scale']) + 'x':>6} {row['records']:>9} "
+                  f"{row['errors']:>4} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f}")
+        
+        print(f"\n📈 Latency growth (latency ~ records^k, super-linear above k={self.growth_threshold}):")
+        print_growth(self.growth, (("query", 28), ("role", 10)), "records")
+        flagged = sorted({f"{point['query']} ({point['role']})" for point in self.growth if point["super_linear"]})
+        if flagged:
+            print(f"⚠️  Super-linear stats queries (index or precomputed rollup needed): {', '.join(flagged)}")
+        else:
+            print("✅ No stats query grew faster than the data")
+    
+    def run(self):
+        if "admin" not in self.tester.tokens:
+            print("❌ The dashboard benchmark needs an admin token to seed data")
+            return {"passed": 0, "failed": 1, "errors": ["no admin token"]}
+        print(f"📊 Dashboard stats scaling: scales {[f'{scale}x' for scale in self.scales]}, "
+              f"{self.samples} samples per query")
+        if any(role == "developer" for *_, role in self.queries):
+            self.tester.authenticate_developer(self.developer)
+        skipped = sorted({f"{label} ({role}): no {role} token" for label, _, _, role in self.queries
+                          if role not in self.tester.tokens})
+        for reason in skipped:
+            print(f"⚠️  Skipping {reason}")
+        previous = 0
+        for scale in self.scales:
+            self.records += self.seed_scale(scale, previous)
+            previous = scale
+            for label, endpoint, params, role in self.queries:
+                if role in self.tester.tokens:
+                    self.rows.append(self.measure(scale, label, endpoint, params, role))
+        
+        self.analyse()
+        self.print_report()
+        self.tester.metrics.add_benchmark("dashboard_scaling", self.rows)
+        self.tester.metrics.add_benchmark("dashboard_growth", self.growth)
+        errored = sum(1 for row in self.rows if row["errors"])
+        super_linear = sum(1 for point in self.growth if point["super_linear"])
+        # A query with no token has no rows; it fails the run like the pagination benchmark's skips
+        return {"passed": len(self.rows) - errored, "failed": errored + super_linear + len(skipped),
+                "errors": skipped}
+
+
+# Fields every streamed record must carry, per endpoint (others only need an id)
+STREAM_REQUIRED_FIELDS = {
+    "students": ("id", "firstName", "lastName", "classId", "admissionNumber"),
+    "teachers": ("id", "firstName", "lastName", "email"),
+    "parents": ("id", "name", "email"),
+    "attendance": ("id", "studentId", "classId", "date", "status"),
+    "reports/payments": ("id", "amount", "status")
+}
+
+
+class StreamingListCheck:
+    """Streams whole collections through iter_json_array and reports counts, checksums and memory.
+
+    Each target is "endpoint" or "endpoint:key.path" for arrays nested in an
+    object (e.g. "reports/payments:recentTransactions"). With `compare_buffered`
+    the same response is also read with response.json() to show the RSS cost
+    streaming avoids and to cross-check the count and checksum.
+    """
+    def __init__(self, tester, targets=("students", "teachers", "parents", "attendance"), limit=1_000_000,
+                 role="admin", compare_buffered=False):
+        self.tester = tester
+        self.targets = targets
+        self.limit = limit
+        self.role = role
+        self.compare_buffered = compare_buffered
+        self.rows = []
+    
+    def buffered(self, endpoint, token, params, path):
+        """Count and checksum via a fully parsed response, with the RSS growth it caused"""
+        rss_start = current_rss_kb()
+        response = self.tester.make_request("GET", endpoint, token=token, params=params)
+        if response is None or response.status_code != 200:
+            return None
+        records = response.json()
+        for key in path:
+            records = records[key]
+        rss_peak = current_rss_kb()
+        stats = StreamStats(rss_every=len(records) + 1).consume(records)
+        del records, response
+        return {"records": stats.records, "checksum": stats.checksum, "rss_kb": rss_peak - rss_start}
+    
+    def check(self, target):
+        endpoint, _, key_path = target.partition(":")
+        path = tuple(key_path.split(".")) if key_path else ()
+        token = self.tester.tokens.get(self.role)
+        params = {"limit": self.limit} if not path else None
+        stats = StreamStats(STREAM_REQUIRED_FIELDS.get(endpoint, ("id",)))
+        started = time.perf_counter()
+        error = None
+        try:
+            stats.consume(self.tester.iter_records(endpoint, token=token, params=params, path=path, stats=stats))
+        except ValueError as e:
+            error = str(e)
+        elapsed = time.perf_counter() - started
+        row = {
+            "target": target,
+            "records": stats.records,
+            "bytes": stats.bytes,
+            "checksum": stats.checksum,
+            "invalid": stats.invalid,
+            "missing": dict(stats.missing),
+            "seconds": elapsed,
+            "records_per_sec": stats.records / elapsed if elapsed else 0.0,
+            "stream_rss_kb": stats.rss_peak - stats.rss_start,
+            "error": error
+        }
+        if self.compare_buffered and not error:
+            buffered = self.buffered(endpoint, token, params, path)
+            row["buffered_rss_kb"] = buffered["rss_kb"] if buffered else None
+            row["buffered_match"] = bool(buffered) and (buffered["records"], buffered["checksum"]) == \
+                (stats.records, stats.checksum)
+        return row
+    
+    def run(self):
+        if self.role not in self.tester.tokens:
+            print(f"❌ Streaming checks need a {self.role} token")
+            return {"passed": 0, "failed": 1, "errors": [f"no {self.role} token"]}
+        print(f"🌊 Streaming {', '.join(self.targets)} (limit {self.limit}), baseline RSS {current_rss_kb() / 1024:.1f} MB")
+        for target in self.targets:
+            self.rows.append(self.check(target))
+        
+        print(f"\n{'TARGET':<34} {'RECORDS':>9} {'MB':>7} {'REC/S':>9} {'INVALID':>8} {'+RSS MB':>8} "
+              f"{'BUF+RSS':>8} {'CHECKSUM':<16}")
+        for row in self.rows:
+            if row["error"]:
+                print(f"{row['target']:<34} ❌ {row['error']}")
+                continue
+            buffered = row.get("buffered_rss_kb")
+            print(f"{row['target']:<34} {row['records']:>9} {row['bytes'] / 1024 / 1024:>7.1f} "
+                  f"{row['records_per_sec']:>9.0f} {row['invalid']:>8} {row['stream_rss_kb'] / 1024:>8.1f} "
+                  f"{'-' if buffered is None else f'{buffered / 1024:.1f}':>8} {row['checksum']:<16}")
+            if row["missing"]:
+                print(f"  ⚠️  missing fields: {', '.join(f'{name} x{count}' for name, count in row['missing'].items())}")
+            if row.get("buffered_match") is False:
+                print("  ❌ buffered parse disagrees with the streamed count/checksum")
+        print(f"📈 Process peak RSS {peak_rss_kb() / 1024:.1f} MB")
+        self.tester.metrics.add_benchmark("streaming", self.rows)
+        
+        failed = sum(1 for row in self.rows if row["error"] or row["invalid"] or row.get("buffered_match") is False)
+        errors = [row["error"] for row in self.rows if row["error"]]
+        return {"passed": len(self.rows) - failed, "failed": failed, "errors": errors}
+
+
+class SearchBenchmark:
+    """Replays a search-as-you-type corpus against api/search and checks hit counts against seeded data.
+
+    Expected counts come from the seeder's deterministic plan, restricted to the
+    records its checkpoint says were created. The school may hold other records
+    too, so a query passes when it returns at least min(expected, limit) hits and
+    every hit actually matches. Typo queries are scored against the term they
+    misspell; their recall measures typo tolerance and never fails the run.
+    """
+    SEARCH_TYPES = ("all", "students", "teachers", "parents", "attendance", "classes")
+
+    def __init__(self, tester, seeder, queries_per_kind=8, limit=50, seed=42, types=None):
+        self.tester = tester
+        self.seeder = seeder
+        self.queries_per_kind = queries_per_kind
+        self.limit = limit
+        self.rng = random.Random(seed)
+        self.types = types or self.SEARCH_TYPES
+        self.latency = defaultdict(LatencyHistogram)
+        self.rows = []
+        self.records = self.seeded_records()
+    
+    def seeded_records(self):
+        """Plan records that were actually created, shaped like the documents search matches"""
+        plan = self.seeder.plan
+        created = {
+            collection: [record for index, record in enumerate(plan[collection])
+                         if self.seeder.created_id(collection, index)]
+            for collection in ("students", "teachers", "parents", "classes")
+        }
+        created["parents"] = [
+            {"name": f"{parent['firstName']} {parent['lastName']}", **parent} for parent in created["parents"]
+        ]
+        days_by_class = defaultdict(int)
+        for key in self.seeder.state["attendance"]:
+            days_by_class[int(key.split("|")[1])] += 1
+        created["attendance_days"] = days_by_class
+        return created
+    
+    def build_corpus(self):
+        """(kind, query, intended) tuples; intended differs from query only for typos"""
+        students = self.records["students"]
+        teachers = self.records["teachers"]
+        if not students:
+            return []
+        sample = lambda records: self.rng.sample(records, min(self.queries_per_kind, len(records)))
+        corpus = []
+        for student in sample(students)[:3]:
+            # Every keystroke of a first name, as a search box would send them
+            name = student["firstName"]
+            corpus.extend(("prefix", name[:length], name[:length]) for length in range(2, len(name) + 1))
+        for student in sample(students):
+            name = self.rng.choice([student["firstName"], student["lastName"]])
+            corpus.append(("name", name, name))
+        for student in sample(students):
+            number = student["admissionNumber"]
+            corpus.append(("admission", number, number))
+            corpus.append(("admission", number[:-1], number[:-1]))
+        for teacher in sample(teachers):
+            corpus.append(("admission", teacher["employeeId"], teacher["employeeId"]))
+        for record in sample(self.records["classes"]):
+            corpus.append(("class", record["name"], record["name"]))
+        for student in sample(students):
+            name = student["lastName"]
+            position = self.rng.randrange(1, len(name) - 1)
+            typo = name[:position] + name[position + 1] + name[position] + name[position + 2:]
+            if typo.lower() != name.lower():
+                corpus.append(("typo", typo, name))
+        return corpus
+    
+    def expected(self, entity, intended):
+        """Seeded records of `entity` the query should find"""
+        pattern = re.compile(intended, re.I)
+        
+        def matches(record, fields):
+            return any(pattern.search(str(record.get(field) or "")) for field in fields)
+        
+        if entity == "attendance":
+            days = self.records["attendance_days"]
+            return sum(days[student["class_ref"]] for student in self.records["students"]
+                       if matches(student, SEARCH_FIELDS["attendance"]))
+        return sum(1 for record in self.records[entity] if matches(record, SEARCH_FIELDS[entity]))
+    
+    def check(self, kind, query, intended, search_type):
+        token = self.tester.tokens["admin"]
+        started = time.perf_counter()
+        response = self.tester.make_request("GET", "search", token=token,
+                                            params={"q": query, "type": search_type, "limit": self.limit})
+        self.latency[search_type].record((time.perf_counter() - started) * 1_000_000)
+        if response is None or response.status_code != 200:
+            return [{"kind": kind, "query": query, "type": search_type, "error": True}]
+        results = response.json().get("results", {})
+        pattern = re.compile(query, re.I)
+        per_type = self.limit if search_type != "all" else math.ceil(self.limit / 5)
+        rows = []
+        for entity in ([search_type] if search_type != "all" else self.SEARCH_TYPES[1:]):
+            hits = results.get(entity) or []
+            wanted = min(self.expected(entity, intended), per_type)
+            # A hit is relevant when some returned field still matches; projections rename attendance fields
+            irrelevant = sum(1 for hit in hits
+                             if not any(pattern.search(str(value)) for value in hit.values() if isinstance(value, str)))
+            rows.append({
+                "kind": kind,
+                "query": query,
+                "type": search_type,
+                "entity": entity,
+                "expected": wanted,
+                "returned": len(hits),
+                "irrelevant": irrelevant,
+                "error": False
+            })
+        return rows
+    
+    def print_report(self):
+        print(f"\n{'TYPE':<12} {'REQS':>6} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8}")
+        for search_type in self.types:
+            histogram = self.latency[search_type]
+            if histogram.count:
+                print(f"{search_type:<12} {histogram.count:>6} {histogram.percentile(50) / 1000:>8.1f} "
+                      f"{histogram.percentile(95) / 1000:>8.1f} {histogram.percentile(99) / 1000:>8.1f}")
+        
+        print(f"\n{'KIND':<10} {'CHECKS':>7} {'RECALL%':>8} {'SHORT':>6} {'IRRELEVANT':>11}")
+        for kind in sorted({row["kind"] for row in self.rows}):
+            rows = [row for row in self.rows if row["kind"] == kind and not row["error"]]
+            wanted = sum(row["expected"] for row in rows)
+            found = sum(min(row["returned"], row["expected"]) for row in rows)
+            print(f"{kind:<10} {len(rows):>7} {found / wanted * 100 if wanted else 100:>8.1f} "
+                  f"{sum(1 for row in rows if row['returned'] < row['expected']):>6} "
+                  f"{sum(row['irrelevant'] for row in rows):>11}")
+        for row in self.failures()[:10]:
+            detail = "request failed" if row["error"] else \
+                f"{row['returned']}/{row['expected']} hits, {row['irrelevant']} irrelevant"
+            print(f"  ❌ {row['query']!r} type={row['type']}{'' if row['error'] else ' ' + row['entity']}: {detail}")
+    
+    def failures(self):
+        return [
+            row for row in self.rows
+            if row["error"] or row["kind"] != "typo" and (row["returned"] < row["expected"] or row["irrelevant"])
+        ]
+    
+    def run(self):
+        if "admin" not in self.tester.tokens:
+            print("❌ The search benchmark needs an admin token")
+            return {"passed": 0, "failed": 1, "errors": ["no admin token"]}
+        corpus = self.build_corpus()
+        if not corpus:
+            print("❌ No seeded students to build a search corpus from")
+            return {"passed": 0, "failed": 1, "errors": ["nothing seeded"]}
+        print(f"🔎 Search benchmark: {len(corpus)} queries x {len(self.types)} types, limit {self.limit}")
+        for kind, query, intended in corpus:
+            for search_type in self.types:
+                self.rows.extend(self.check(kind, query, intended, search_type))
+        
+        self.print_report()
+        self.tester.metrics.add_benchmark("search", self.rows)
+        failed = len(self.failures())
+        return {"passed": len(self.rows) - failed, "failed": failed, "errors": []}
+
+
+# Report date windows in days, counted from the benchmark's start date
+REPORT_RANGES = {"day": 1, "week": 7, "term": 91, "year": 365}
+
+
+class ReportBenchmark:
+    """Times reports/attendance and reports/payments across date ranges, scopes and concurrent admins.
+
+    Every (report, scope, range) case is sent `requests_per_point` times at each
+    concurrency level with the admin token. Rows carry client latency, response
+    size, the row count in `data` and server time from the Server-Timing header
+    (falling back to time-to-headers when the server sends none).
+    """
+    def __init__(self, tester, start=SEED_TERM_START, ranges=None, concurrency_levels=(1, 4, 16),
+                 requests_per_point=10, report_types=("summary", "detailed", "class")):
+        self.tester = tester
+        self.start = datetime.strptime(start, "%Y-%m-%d")
+        self.ranges = ranges or REPORT_RANGES
+        self.concurrency_levels = concurrency_levels
+        self.requests_per_point = requests_per_point
+        self.report_types = report_types
+        self.rows = []
+    
+    def cases(self, class_id):
+        """(report, scope, range, endpoint, params) for every combination the reports accept"""
+        cases = []
+        for report_type in self.report_types:
+            for scope in ("school", "class"):
+                # The class report is per class by definition
+                if scope == "class" and not class_id or report_type == "class" and scope == "school":
+                    continue
+                for range_name, days in self.ranges.items():
+                    params = {
+                        "type": report_type,
+                        "startDate": self.start.strftime("%Y-%m-%d"),
+                        "endDate": (self.start + timedelta(days=days - 1)).strftime("%Y-%m-%d")
+                    }
+                    if scope == "class":
+                        params["classId"] = class_id
+                    cases.append((f"attendance/{report_type}", scope, range_name, "reports/attendance", params))
+        cases.append(("payments", "school", "all", "reports/payments", None))
+        return cases
+    
+    def send(self, endpoint, params):
+        token = self.tester.tokens["admin"]
+        started = time.perf_counter()
+        response = self.tester.make_request("GET", endpoint, token=token, params=params)
+        latency = time.perf_counter() - started
+        if response is None or response.status_code != 200:
+            return None
+        server = server_timing_ms(response)
+        if server is None:
+            server = response.timing["server"] * 1000 if hasattr(response, "timing") else latency * 1000
+        data = response.json().get("data")
+        return latency, len(response.content), server, len(data) if isinstance(data, list) else None
+    
+    def run_point(self, case, concurrency):
+        report, scope, range_name, endpoint, params = case
+        latency = LatencyHistogram()
+        server = LatencyHistogram()
+        sizes = []
+        records = None
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(lambda _: self.send(endpoint, params), range(self.requests_per_point)))
+        for sample in samples:
+            if sample is None:
+                continue
+            elapsed, size, server_ms, records = sample
+            latency.record(elapsed * 1_000_000)
+            server.record(server_ms * 1000)
+            sizes.append(size)
+        return {
+            "report": report,
+            "scope": scope,
+            "range": range_name,
+            "params": params,
+            "concurrency": concurrency,
+            "requests": self.requests_per_point,
+            "errors": samples.count(None),
+            "records": records,
+            "response_kb": sum(sizes) / len(sizes) / 1024 if sizes else 0.0,
+            "p50_ms": latency.percentile(50) / 1000,
+            "p95_ms": latency.percentile(95) / 1000,
+            "server_p50_ms": server.percentile(50) / 1000
+        }
+    
+    def run(self):
+        if "admin" not in self.tester.tokens:
+            print("❌ The report benchmark needs an admin token")
+            return {"passed": 0, "failed": 1, "errors": ["no admin token"]}
+        classes = self.tester.make_request("GET", "classes", token=self.tester.tokens["admin"])
+        class_list = classes.json() if classes is not None and classes.status_code == 200 else []
+        class_id = class_list[0]["id"] if class_list else None
+        if not class_id:
+            print("⚠️  No classes found; skipping per-class reports")
+        cases = self.cases(class_id)
+        print(f"🧾 Report benchmark: {len(cases)} cases x concurrency {list(self.concurrency_levels)}, "
+              f"{self.requests_per_point} requests per point from {self.start:%Y-%m-%d}")
+        for case in cases:
+            for concurrency in self.concurrency_levels:
+                self.rows.append(self.run_point(case, concurrency))
+        
+        print(f"\n{'REPORT':<22} {'SCOPE':<7} {'RANGE':<6} {'CONC':>5} {'ERR':>4} {'ROWS':>7} {'KB':>9} "
+              f"{'p50ms':>8} {'p95ms':>8} {'SRVp50':>8}")
+        for row in self.rows:
+            print(f"{row['report']:<22} {row['scope']:<7} {row['range']:<6} {row['concurrency']:>5} {row['errors']:>4} "
+                  f"{'-' if row['records'] is None else row['records']:>7} {row['response_kb']:>9.1f} "
+                  f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['server_p50_ms']:>8.1f}")
+        slowest = max(self.rows, key=lambda row: row["p95_ms"])
+        print(f"🐢 Slowest: {slowest['report']} {slowest['scope']}/{slowest['range']} at concurrency "
+              f"{slowest['concurrency']} (p95 {slowest['p95_ms']:.1f}ms)")
+        self.tester.metrics.add_benchmark("reports", self.rows)
+        
+        failed = sum(1 for row in self.rows if row["errors"])
+        return {"passed": len(self.rows) - failed, "failed": failed, "errors": []}
+
+
+class ChatBenchmark:
+    """Sizes in-app chat: conversation fan-out, message bursts and history depth.
+
+    The admin opens `conversations` group chats with the harness teacher and parent
+    (plus the parent's private chat with the teacher). Each step tops every
+    conversation up to the next of `history_lengths` with bursts of messages sent
+    `concurrency` at a time by rotating members, then times the first and last
+    history pages, a full paged walk, and the parent's unread views
+    (chat/conversations unreadCount and notifications). Growth against history
+    length is reported as k in latency ~ length^k, as in DashboardScaleBenchmark.
+    """
+    def __init__(self, tester, conversations=10, history_lengths=(10, 100, 1000), concurrency=8, page_size=50,
+                 samples=10, growth_threshold=1.1):
+        self.tester = tester
+        self.conversations = conversations
+        self.history_lengths = sorted(history_lengths)
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.samples = samples
+        self.growth_threshold = growth_threshold
+        self.chats = []
+        self.lengths = {}
+        self.walk_errors = []
+        self.rows = []
+        self.growth = []
+    
+    def open_conversations(self):
+        """Returns (conversation id, sender roles) for every conversation that was created"""
+        tokens = self.tester.tokens
+        teacher_id = jwt_claims(tokens["teacher"]).get("id")
+        parent_id = jwt_claims(tokens["parent"]).get("id")
+        plans = [("parent", {"type": "private", "participants": [teacher_id]}, ("parent", "teacher"))]
+        plans += [
+            ("admin", {"type": "group", "name": f"Chat benchmark {number}", "participants": [teacher_id, parent_id]},
+             ("admin", "teacher", "parent"))
+            for number in range(self.conversations - 1)
+        ]
+        
+        def create(plan):
+            role, payload, senders = plan
+            response = self.tester.make_request("POST", "chat/conversations", payload, tokens[role])
+            if response is None or response.status_code != 200:
+                return None
+            return response.json().get("id"), senders
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self.chats = [chat for chat in executor.map(create, plans) if chat and chat[0]]
+        self.lengths = {conversation_id: 0 for conversation_id, _ in self.chats}
+    
+    def send(self, job):
+        conversation_id, role, number = job
+        started = time.perf_counter()
+        response = self.tester.make_request("POST", "chat/messages", {
+            "conversationId": conversation_id,
+            "messageType": "text",
+            "content": f"Chat benchmark message {number}"
+        }, self.tester.tokens[role])
+        return time.perf_counter() - started, response is not None and response.status_code == 200
+    
+    def fill(self, length):
+        """Top every conversation up to `length` messages; returns the send latency histogram and error count"""
+        jobs = []
+        # Interleave conversations so each burst spreads across them, as a busy evening would
+        for number in range(max(self.lengths.values()), length):
+            for conversation_id, senders in self.chats:
+                if self.lengths[conversation_id] <= number:
+                    jobs.append((conversation_id, senders[number % len(senders)], number))
+        latency = LatencyHistogram()
+        errors = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for elapsed, ok in executor.map(self.send, jobs):
+                latency.record(elapsed * 1_000_000)
+                errors += not ok
+        for conversation_id in self.lengths:
+            self.lengths[conversation_id] = length
+        return latency, errors
+    
+    def time_query(self, endpoint, params, role):
+        token = self.tester.tokens[role]
+        return time_samples(lambda: self.tester.make_request("GET", endpoint, token=token, params=params), self.samples)
+    
+    def walk(self, conversation_id, length):
+        """Page through one whole history; returns elapsed seconds, flags a wrong message count"""
+        started = time.perf_counter()
+        seen = 0
+        for page in range(length // self.page_size + 1):
+            response = self.tester.make_request("GET", "chat/messages", token=self.tester.tokens["parent"], params={
+                "conversationId": conversation_id, "limit": self.page_size, "skip": page * self.page_size})
+            if response is None or response.status_code != 200:
+                break
+            batch = response.json()
+            seen += len(batch)
+            if len(batch) < self.page_size:
+                break
+        if seen != length:
+            self.walk_errors.append(f"Chat history walk: {seen}/{length} messages in {conversation_id}")
+        return time.perf_counter() - started
+    
+    def row(self, length, query, latency, errors, samples=None):
+        return {
+            "length": length,
+            "messages": length * len(self.chats),
+            "query": query,
+            "samples": latency.count if samples is None else samples,
+            "errors": errors,
+            "p50_ms": latency.percentile(50) / 1000,
+            "p95_ms": latency.percentile(95) / 1000
+        }
+    
+    def measure(self, length):
+        conversation_id = self.chats[0][0]
+        history = {"conversationId": conversation_id, "limit": self.page_size}
+        self.rows.append(self.row(length, "history first page", *self.time_query("chat/messages", history, "parent")))
+        last_page = {**history, "skip": max(length - self.page_size, 0)}
+        self.rows.append(self.row(length, "history last page", *self.time_query("chat/messages", last_page, "parent")))
+        walks = LatencyHistogram()
+        for _ in range(max(self.samples // 5, 1)):
+            walks.record(self.walk(conversation_id, length) * 1_000_000)
+        self.rows.append(self.row(length, "history full walk", walks, 0))
+        self.rows.append(self.row(length, "unread conversations", *self.time_query("chat/conversations", None, "parent")))
+        self.rows.append(self.row(length, "unread notifications",
+                                  *self.time_query("notifications", {"limit": self.page_size}, "parent")))
+    
+    def analyse(self):
+        self.growth = growth_exponents(self.rows, "length", self.growth_threshold, ("query",))
+    
+    def print_report(self):
+        print(f"\n{'QUERY':<22} {'LENGTH':>7} {'MESSAGES':>9} {'N':>6} {'ERR':>4} {'p50ms':>9} {'p95ms':>9}")
+        for row in sorted(self.rows, key=lambda row: (row["query"], row["length"])):
+            print(f"{row['query']:<22} {row['length']:>7} {row['messages']:>9} {row['samples']:>6} {row['errors']:>4} "
+                  f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f}")
+        
+        print(f"\n📈 Latency growth with history length (latency ~ length^k, super-linear above k={self.growth_threshold}):")
+        print_growth(self.growth, (("query", 22),), "length", "messages")
+        for error in self.walk_errors:
+            print(f"❌ {error}")
+    
+    def run(self):
+        missing = [role for role in ("admin", "teacher", "parent") if role not in self.tester.tokens]
+        if missing:
+            print(f"❌ The chat benchmark needs {', '.join(missing)} tokens")
+            return {"passed": 0, "failed": 1, "errors": [f"no {role} token" for role in missing]}
+        self.open_conversations()
+        if not self.chats:
+            print("❌ No chat conversations could be created")
+            return {"passed": 0, "failed": 1, "errors": ["chat/conversations create failed"]}
+        print(f"💬 Chat benchmark: {len(self.chats)} conversations grown to {self.history_lengths} messages, "
+              f"{self.concurrency} senders in flight, pages of {self.page_size}")
+        for length in self.history_lengths:
+            started = time.perf_counter()
+            latency, errors = self.fill(length)
+            print(f"✉️  {length} messages per conversation: {latency.count} sent in {time.perf_counter() - started:.1f}s")
+            self.rows.append(self.row(length, "send", latency, errors))
+            self.measure(length)
+        
+        self.analyse()
+        self.print_report()
+        self.tester.metrics.add_benchmark("chat", self.rows)
+        self.tester.metrics.add_benchmark("chat_growth", self.growth)
+        errored = sum(1 for row in self.rows if row["errors"])
+        super_linear = sum(1 for point in self.growth if point["super_linear"])
+        return {"passed": len(self.rows) - errored, "failed": errored + super_linear + len(self.walk_errors),
+                "errors": self.walk_errors}
+
+
+# Leaderboard reads the gamification dashboard makes: (label, endpoint, params)
+LEADERBOARD_VIEWS = [
+    ("leaderboard points", "gamification/leaderboard", {"type": "points", "period": "all"}),
+    ("leaderboard attendance", "gamification/leaderboard", {"type": "attendance", "period": "all"}),
+    ("leaderboard achievements", "gamification/leaderboard", {"type": "achievements", "period": "all"}),
+    ("leaderboard points/week", "gamification/leaderboard", {"type": "points", "period": "week"}),
+    ("my points and position", "gamification/points", None)
+]
+
+
+class GamificationBenchmark:
+    """Points write contention and leaderboard reads as a school's points table grows.
+
+    At each of `school_sizes` the table gains new students, then every student earns
+    `awards_per_student` awards in a morning rush (attendance first, so the streak
+    read-then-update path runs), sent `concurrency` at a time with each student's
+    awards adjacent so they race on the same user_points document. `pollers`
+    threads fetch the leaderboard throughout the rush; afterwards each view in
+    LEADERBOARD_VIEWS is timed at rest. A sample of students is then read back:
+    totalPoints must equal the points awarded plus one bonus per distinct
+    achievement, and no achievement may be granted twice.
+    """
+    AWARD_TYPES = ("attendance", "homework", "participation")
+    ACHIEVEMENT_BONUS = {"streak_5": 50, "streak_10": 100, "streak_30": 500,
+                         "points_100": 25, "points_500": 100, "points_1000": 250}
+
+    def __init__(self, tester, school_sizes=(100, 1000, 5000), awards_per_student=3, points=40, concurrency=32,
+                 pollers=4, samples=10, verify_users=200, growth_threshold=1.1, seed=42):
+        self.tester = tester
+        self.school_sizes = sorted(school_sizes)
+        self.awards_per_student = awards_per_student
+        self.points = points
+        self.concurrency = concurrency
+        self.pollers = pollers
+        self.samples = samples
+        self.verify_users = verify_users
+        self.growth_threshold = growth_threshold
+        self.rng = random.Random(seed)
+        # Fresh ids per run so earlier runs' documents never count towards this run's totals
+        self.run_id = uuid.uuid4().hex[:8]
+        self.awarded = {}
+        self.rush_rows = []
+        self.rows = []
+        self.growth = []
+        self.anomalies = []
+    
+    def award(self, job):
+        user_id, activity = job
+        started = time.perf_counter()
+        response = self.tester.make_request("POST", "gamification/points", {
+            "userId": user_id,
+            "activityType": activity,
+            "points": self.points,
+            "metadata": {"source": "benchmark"}
+        }, self.tester.tokens["teacher"])
+        ok = response is not None and response.status_code == 200
+        return user_id, time.perf_counter() - started, ok
+    
+    def poll(self, stop, role):
+        """Fetch leaderboard views round-robin until `stop` is set; returns (histogram, errors)"""
+        latency = LatencyHistogram()
+        errors = 0
+        token = self.tester.tokens[role]
+        while not stop.is_set():
+            for _, endpoint, params in LEADERBOARD_VIEWS[:-1]:
+                started = time.perf_counter()
+                response = self.tester.make_request("GET", endpoint, token=token, params=params)
+                latency.record((time.perf_counter() - started) * 1_000_000)
+                errors += response is None or response.status_code != 200
+                if stop.is_set():
+                    break
+        return latency, errors
+    
+    def rush(self, size):
+        """Grow the table to `size` students, then award every student in one concurrent burst"""
+        for index in range(len(self.awarded), size):
+            self.awarded[f"bench-{self.run_id}-{index}"] = 0
+        jobs = [(user_id, self.AWARD_TYPES[number % len(self.AWARD_TYPES)])
+                for user_id in self.awarded for number in range(self.awards_per_student)]
+        
+        writes = LatencyHistogram()
+        errors = 0
+        stop = threading.Event()
+        roles = [role for role in ("admin", "parent", "student") if role in self.tester.tokens]
+        with ThreadPoolExecutor(max_workers=self.pollers or 1) as polling:
+            polls = [polling.submit(self.poll, stop, roles[number % len(roles)])
+                     for number in range(self.pollers if roles else 0)]
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for user_id, elapsed, ok in executor.map(self.award, jobs):
+                    writes.record(elapsed * 1_000_000)
+                    if ok:
+                        self.awarded[user_id] += self.points
+                    errors += not ok
+            elapsed = time.perf_counter() - started
+            stop.set()
+            reads = LatencyHistogram()
+            read_errors = 0
+            for future in polls:
+                histogram, poll_errors = future.result()
+                reads.merge(histogram)
+                read_errors += poll_errors
+        
+        row = {
+            "students": size,
+            "awards": len(jobs),
+            "errors": errors,
+            "seconds": elapsed,
+            "writes_per_s": len(jobs) / elapsed if elapsed else 0.0,
+            "write_p50_ms": writes.percentile(50) / 1000,
+            "write_p95_ms": writes.percentile(95) / 1000,
+            "reads": reads.count,
+            "read_errors": read_errors,
+            "read_p50_ms": reads.percentile(50) / 1000,
+            "read_p95_ms": reads.percentile(95) / 1000
+        }
+        self.rush_rows.append(row)
+        print(f"🏃 {size} students: {len(jobs)} awards in {elapsed:.1f}s ({row['writes_per_s']:.0f}/s, "
+              f"{errors} errors) while {reads.count} leaderboard reads ran (p95 {row['read_p95_ms']:.1f}ms)")
+    
+    def measure(self, size):
+        token = self.tester.tokens.get("admin") or self.tester.tokens["teacher"]
+        for label, endpoint, params in LEADERBOARD_VIEWS:
+            latency, errors = time_samples(
+                lambda: self.tester.make_request("GET", endpoint, token=token, params=params), self.samples)
+            self.rows.append({
+                "students": size,
+                "view": label,
+                "samples": self.samples,
+                "errors": errors,
+                "p50_ms": latency.percentile(50) / 1000,
+                "p95_ms": latency.percentile(95) / 1000
+            })
+    
+    def verify(self):
+        """Read back a sample of students and record totalPoints and duplicate-achievement anomalies"""
+        token = self.tester.tokens["teacher"]
+        user_ids = list(self.awarded)
+        checked = self.rng.sample(user_ids, min(self.verify_users, len(user_ids)))
+        
+        def check(user_id):
+            response = self.tester.make_request("GET", "gamification/points", token=token, params={"userId": user_id})
+            if response is None or response.status_code != 200:
+                return [f"{user_id}: points read failed"]
+            body = response.json()
+            kinds = [achievement.get("achievementType") for achievement in body.get("achievements", [])]
+            problems = [f"{user_id}: {kind} granted {kinds.count(kind)} times"
+                        for kind in sorted(set(kinds)) if kinds.count(kind) > 1]
+            expected = self.awarded[user_id] + sum(self.ACHIEVEMENT_BONUS.get(kind, 0) for kind in set(kinds))
+            total = body.get("points", {}).get("totalPoints", 0)
+            if total != expected:
+                problems.append(f"{user_id}: totalPoints {total}, expected {expected}")
+            return problems
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for problems in executor.map(check, checked):
+                self.anomalies.extend(problems)
+        return len(checked)
+    
+    def analyse(self):
+        self.growth = growth_exponents(self.rows, "students", self.growth_threshold, ("view",))
+    
+    def print_report(self, verified):
+        print(f"\n{'STUDENTS':>8} {'AWARDS':>7} {'ERR':>4} {'writes/s':>9} {'w p50':>8} {'w p95':>8} "
+              f"{'READS':>6} {'r p50':>8} {'r p95':>8}")
+        for row in self.rush_rows:
+            print(f"{row['students']:>8} {row['awards']:>7} {row['errors']:>4} {row['writes_per_s']:>9.1f} "
+                  f"{row['write_p50_ms']:>8.1f} {row['write_p95_ms']:>8.1f} {row['reads']:>6} "
+                  f"{row['read_p50_ms']:>8.1f} {row['read_p95_ms']:>8.1f}")
+        
+        print(f"\n{'VIEW (at rest)':<26} {'STUDENTS':>8} {'ERR':>4} {'p50ms':>8} {'p95ms':>8}")
+        for row in sorted(self.rows, key=lambda row: (row["view"], row["students"])):
+            print(f"{row['view']:<26} {row['students']:>8} {row['errors']:>4} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f}")
+        
+        print(f"\n📈 Leaderboard growth (latency ~ students^k, super-linear above k={self.growth_threshold}):")
+        print_growth(self.growth, (("view", 26),), "students")
+        
+        if self.anomalies:
+            print(f"\n❌ {len(self.anomalies)} consistency anomalies in {verified} students read back:")
+            for anomaly in self.anomalies[:20]:
+                print(f"   {anomaly}")
         else:
-            error_msg = response.text if response else "Request failed"
-            self.log_result("Create Student", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+            print(f"\n✅ totalPoints and achievements consistent for {verified} students read back")
+    
+    def run(self):
+        if "teacher" not in self.tester.tokens:
+            print("❌ The gamification benchmark needs a teacher token to award points")
+            return {"passed": 0, "failed": 1, "errors": ["no teacher token"]}
+        print(f"🏆 Gamification benchmark: {self.school_sizes} students, {self.awards_per_student} awards each at "
+              f"{self.concurrency} in flight, {self.pollers} leaderboard pollers")
+        for size in self.school_sizes:
+            self.rush(size)
+            self.measure(size)
+        verified = self.verify()
+        
+        self.analyse()
+        self.print_report(verified)
+        self.tester.metrics.add_benchmark("gamification_rush", self.rush_rows)
+        self.tester.metrics.add_benchmark("gamification_leaderboard", self.rows)
+        self.tester.metrics.add_benchmark("gamification_growth", self.growth)
+        errored = sum(1 for row in self.rush_rows + self.rows if row["errors"])
+        super_linear = sum(1 for point in self.growth if point["super_linear"])
+        return {"passed": len(self.rush_rows) + len(self.rows) - errored,
+                "failed": errored + super_linear + (1 if self.anomalies else 0),
+                "errors": self.anomalies[:20]}
+
+
+# Generated upload content per MIME type: (extension, leading magic bytes)
+UPLOAD_CONTENT = {
+    "image/jpeg": ("jpg", b"\xff\xd8\xff\xe0\x00\x10JFIF\x00"),
+    "image/png": ("png", b"\x89PNG\r\n\x1a\n"),
+    "application/pdf": ("pdf", b"%PDF-1.4\n")
+}
+
+
+class UploadBenchmark:
+    """Sweeps storage/upload over file size and concurrent uploaders with streamed multipart bodies.
+
+    Files are generated (or sliced from a memory-mapped `path`) block by block as
+    they are sent, so the client's peak RSS stays flat whatever the size; its growth
+    is reported to confirm that. Each point reports MB/s across all uploaders,
+    per-upload latency, rejections (4xx such as the 10MB limit) and server failures
+    (5xx, resets, timeouts); the first point with failures marks where the server
+    gives out. Rejections only count as failures for sizes within `limit_kb`, the
+    server's upload limit. Files uploaded at a point are deleted before the next one.
+    """
+    def __init__(self, tester, sizes_kb=(100, 1024, 5120, 10240, 12288), concurrency_levels=(1, 4, 16),
+                 uploads_per_point=10, path=None, content_type="image/jpeg", file_type="image", role="admin",
+                 cleanup=True, seed=42, limit_kb=10240):
+        self.tester = tester
+        self.limit_kb = limit_kb
+        self.sizes_kb = sorted(sizes_kb)
+        self.concurrency_levels = concurrency_levels
+        self.uploads_per_point = uploads_per_point
+        self.path = path
+        self.content_type = content_type
+        self.file_type = file_type
+        self.role = role
+        self.cleanup = cleanup
+        self.seed = seed
+        self.mapping = None
+        self.rows = []
+    
+    def source(self, size, number):
+        if self.mapping is not None:
+            return MappedFile(self.mapping, size)
+        extension, magic = UPLOAD_CONTENT.get(self.content_type, ("bin", b""))
+        return GeneratedFile(size, seed=self.seed + number, header=magic)
+    
+    def send(self, size, number):
+        """One upload; returns (seconds, bytes, outcome, detail, file id)"""
+        source = self.source(size, number)
+        extension = UPLOAD_CONTENT.get(self.content_type, ("bin", b""))[0]
+        filename = os.path.basename(self.path) if self.path else f"benchmark-{size}-{number}.{extension}"
+        body = MultipartBody(source, filename, self.content_type, fields={"fileType": self.file_type})
+        started = time.perf_counter()
+        response = self.tester.make_request("POST", "storage/upload", token=self.tester.tokens[self.role], upload=body)
+        elapsed = time.perf_counter() - started
+        if response is None:
+            return elapsed, source.size, "failed", self.tester.last_error, None
+        if response.status_code >= 500:
+            return elapsed, source.size, "failed", f"HTTP {response.status_code}", None
+        if response.status_code != 200:
+            try:
+                detail = response.json().get("error")
+            except ValueError:
+                detail = None
+            return elapsed, source.size, "rejected", f"HTTP {response.status_code}: {detail}", None
+        return elapsed, source.size, "ok", None, (response.json().get("file") or {}).get("id")
+    
+    def delete(self, file_ids):
+        token = self.tester.tokens[self.role]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda file_id: self.tester.make_request(
+                "DELETE", "storage/upload", token=token, params={"fileId": file_id}), file_ids))
+    
+    def run_point(self, size_kb, concurrency, rss_start):
+        size = size_kb * 1024
+        latency = LatencyHistogram()
+        outcomes = defaultdict(int)
+        details = set()
+        uploaded = 0
+        file_ids = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda number: self.send(size, number), range(self.uploads_per_point)))
+        wall = time.perf_counter() - started
+        for elapsed, sent, outcome, detail, file_id in results:
+            outcomes[outcome] += 1
+            if outcome == "ok":
+                latency.record(elapsed * 1_000_000)
+                uploaded += sent
+                if file_id:
+                    file_ids.append(file_id)
+            elif detail:
+                details.add(detail)
+        if self.cleanup and file_ids:
+            self.delete(file_ids)
+        return {
+            "size_kb": results[0][1] // 1024 if results else size_kb,
+            "concurrency": concurrency,
+            "uploads": self.uploads_per_point,
+            "ok": outcomes["ok"],
+            "rejected": outcomes["rejected"],
+            "failed": outcomes["failed"],
+            "details": sorted(details),
+            "mb_per_s": uploaded / wall / (1024 * 1024) if wall else 0.0,
+            "p50_ms": latency.percentile(50) / 1000,
+            "p95_ms": latency.percentile(95) / 1000,
+            "client_peak_rss_growth_kb": peak_rss_kb() - rss_start
+        }
+    
+    def run(self):
+        if self.role not in self.tester.tokens:
+            print(f"❌ The upload benchmark needs a {self.role} token")
+            return {"passed": 0, "failed": 1, "errors": [f"no {self.role} token"]}
+        source = "generated content"
+        if self.path:
+            with open(self.path, "rb") as f:
+                self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            source = f"{self.path} (memory-mapped, {len(self.mapping) // 1024} KB)"
+        print(f"📤 Upload benchmark: {self.sizes_kb} KB x concurrency {list(self.concurrency_levels)}, "
+              f"{self.uploads_per_point} uploads per point from {source}")
+        rss_start = current_rss_kb()
+        try:
+            for size_kb in self.sizes_kb:
+                for concurrency in self.concurrency_levels:
+                    row = self.run_point(size_kb, concurrency, rss_start)
+                    self.rows.append(row)
+                    print(f"   {row['size_kb']:>7} KB x{concurrency:<3} {row['mb_per_s']:>8.1f} MB/s "
+                          f"p95 {row['p95_ms']:.0f}ms ok={row['ok']} rejected={row['rejected']} failed={row['failed']}")
+        finally:
+            if self.mapping is not None:
+                self.mapping.close()
+        
+        print(f"\n{'SIZE KB':>8} {'CONC':>5} {'OK':>4} {'REJ':>4} {'FAIL':>5} {'MB/s':>8} {'p50ms':>9} {'p95ms':>9} "
+              f"{'CLIENT RSS+KB':>14}")
+        for row in self.rows:
+            print(f"{row['size_kb']:>8} {row['concurrency']:>5} {row['ok']:>4} {row['rejected']:>4} {row['failed']:>5} "
+                  f"{row['mb_per_s']:>8.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+                  f"{row['client_peak_rss_growth_kb']:>14}")
+        rejected = next((row for row in self.rows if row["rejected"]), None)
+        if rejected:
+            print(f"🚫 Rejected from {rejected['size_kb']} KB: {', '.join(rejected['details'])}")
+        failing = next((row for row in self.rows if row["failed"]), None)
+        if failing:
+            print(f"🔥 Server failures from {failing['size_kb']} KB at {failing['concurrency']} concurrent uploads: "
+                  f"{', '.join(failing['details'][:3])}")
+        else:
+            print("✅ No server failures across the sweep")
+        best = max(self.rows, key=lambda row: row["mb_per_s"], default=None)
+        if best:
+            print(f"🏁 Peak throughput {best['mb_per_s']:.1f} MB/s at {best['size_kb']} KB x{best['concurrency']}")
+        self.tester.metrics.add_benchmark("uploads", self.rows)
+        
+        # Rejecting files over the limit is the route working; rejecting smaller ones is not
+        failed = sum(1 for row in self.rows if row["failed"] or row["rejected"] and row["size_kb"] <= self.limit_kb)
+        return {"passed": len(self.rows) - failed, "failed": failed, "errors": []}
+
+
+PAYSTACK_WEBHOOK = "payments/paystack-webhook"
+
+
+def paystack_signature(secret, raw):
+    """x-paystack-signature: hex HMAC-SHA512 of the exact request body"""
+    return hmac.new(secret.encode(), raw, hashlib.sha512).hexdigest()
+
+
+class WebhookReplay:
+    """Bursts of signed Paystack webhooks against payments/paystack-webhook.
+
+    Every event is signed over the exact bytes sent, as Paystack signs them. The
+    synthetic stream creates `payments` pending payments per pass and delivers one
+    charge.success each; `retry_rate` of them fail first (charge.failed, then the
+    success) and `reorder_rate` of those retries arrive success-first. A recorded
+    stream (JSON lines of events) is replayed in file order instead. Either way
+    `duplicate_rate` of the events are redelivered later in the stream, and
+    `forged_rate` extra copies carry a bad signature that must be refused. Each
+    pass sends open-loop at one of `rates` events/s, so slow acks pile up the way
+    provider deliveries do. Acks slower than `ack_timeout` count as deliveries the
+    provider would retry. After a synthetic pass every payment must be completed.
+    """
+    def __init__(self, tester, secret, rates=(10, 50, 200), payments=100, retry_rate=0.2, reorder_rate=0.5,
+                 duplicate_rate=0.1, forged_rate=0.02, ack_timeout=5.0, concurrency=64, events_path=None, seed=42):
+        self.tester = tester
+        self.secret = secret
+        self.rates = rates
+        self.payments = payments
+        self.retry_rate = retry_rate
+        self.reorder_rate = reorder_rate
+        self.duplicate_rate = duplicate_rate
+        self.forged_rate = forged_rate
+        self.ack_timeout = ack_timeout
+        self.concurrency = concurrency
+        self.events_path = events_path
+        self.rng = random.Random(seed)
+        self.plan_id = None
+        self.rows = []
+        self.anomalies = []
+    
+    def event(self, name, payment_id, amount):
+        reference = f"ps_{uuid.uuid4().hex[:16]}"
+        return {"event": name, "data": {
+            "id": self.rng.randrange(10 ** 9, 10 ** 10),
+            "reference": reference,
+            "amount": int(amount * 100),
+            "currency": "NGN",
+            "status": "success" if name == "charge.success" else "failed",
+            "gateway_response": "Approved" if name == "charge.success" else "Declined",
+            "paid_at": datetime.now().isoformat(),
+            "metadata": {"paymentId": payment_id, "schoolId": jwt_claims(self.tester.tokens["admin"]).get("schoolId"),
+                         "planId": self.plan_id}
+        }}
+    
+    def create_payments(self):
+        """Pending payments to settle by webhook; empty when the API will not create them"""
+        def create(_):
+            amount = self.rng.choice((15000, 25000, 40000))
+            response = self.tester.make_request("POST", "payments", {
+                "amount": amount, "currency": "ngn", "planId": self.plan_id, "provider": "manual",
+                "metadata": {"source": "webhook-replay"}
+            }, self.tester.tokens["admin"])
+            if response is None or response.status_code != 200:
+                return None
+            return response.json().get("payment", {}).get("id") or response.json().get("id"), amount
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return [payment for payment in executor.map(create, range(self.payments)) if payment and payment[0]]
+    
+    def synthetic_stream(self, payments):
+        """Per payment: [failed, success] for retried ones (maybe swapped), else [success]; interleaved"""
+        queues = []
+        for payment_id, amount in payments:
+            events = [self.event("charge.success", payment_id, amount)]
+            if self.rng.random() < self.retry_rate:
+                events.insert(0, self.event("charge.failed", payment_id, amount))
+                if self.rng.random() < self.reorder_rate:
+                    events.reverse()
+            queues.append(events)
+        # Deliver payments interleaved, each payment's own events in its chosen order
+        stream = []
+        while queues:
+            queue = self.rng.choice(queues)
+            stream.append({"kind": "original", "body": queue.pop(0)})
+            if not queue:
+                queues.remove(queue)
+        return stream
+    
+    def recorded_stream(self):
+        with open(self.events_path) as f:
+            return [{"kind": "original", "body": json.loads(line)} for line in f if line.strip()]
+    
+    def shape(self, stream):
+        """Sign everything, then splice in later redeliveries and forged copies"""
+        for item in stream:
+            item["raw"] = json.dumps(item["body"], separators=(",", ":")).encode()
+            item["signature"] = paystack_signature(self.secret, item["raw"])
+        shaped = list(stream)
+        for item in stream:
+            if self.rng.random() < self.duplicate_rate:
+                at = min(shaped.index(item) + self.rng.randint(1, 20), len(shaped))
+                shaped.insert(at, {**item, "kind": "duplicate"})
+            if self.rng.random() < self.forged_rate:
+                at = self.rng.randint(0, len(shaped))
+                shaped.insert(at, {**item, "kind": "forged", "signature": paystack_signature("forged", item["raw"])})
+        return shaped
     
-    def test_teacher_management(self):
-        """Test teacher CRUD operations"""
-        print("\n=== Testing Teacher Management ===")
+    def run_pass(self, rate, stream):
+        start = time.monotonic() + 0.05
         
-        if "admin" not in self.tokens:
-            self.log_result("Teacher Management", False, "Admin token not available")
-            return
+        def deliver(job):
+            index, item = job
+            delay = start + index / rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            started = time.perf_counter()
+            response = self.tester.make_request("POST", PAYSTACK_WEBHOOK, raw=item["raw"],
+                                                extra_headers={"x-paystack-signature": item["signature"]})
+            return item["kind"], time.perf_counter() - started, max(-delay, 0.0), \
+                None if response is None else response.status_code
         
-        admin_token = self.tokens["admin"]
-        
-        # Test Create Teacher
-        teacher_data = {
-            "firstName": "Sarah",
-            "lastName": "Johnson",
-            "email": "sarah.johnson@school.edu.ng",
-            "phoneNumber": "+2348012345683",
-            "address": "456 Abuja Street, Abuja",
-            "qualification": "B.Ed Mathematics",
-            "experience": "5 years",
-            "specialization": "Mathematics",
-            "employeeId": "TCH001",
-            "dateOfJoining": "2024-01-01"
-        }
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(deliver, enumerate(stream)))
+        wall = time.monotonic() - start
         
-        response = self.make_request("POST", "teachers", teacher_data, admin_token)
+        acks, lags = LatencyHistogram(), LatencyHistogram()
+        kinds = defaultdict(int)
+        unexpected = defaultdict(int)
+        for kind, elapsed, lag, status in results:
+            kinds[kind] += 1
+            acks.record(elapsed * 1_000_000)
+            lags.record(lag * 1_000_000)
+            if status != (400 if kind == "forged" else 200):
+                unexpected[f"{kind}:{status}"] += 1
+        return {
+            "rate": rate,
+            "events": len(results),
+            "duplicates": kinds["duplicate"],
+            "forged": kinds["forged"],
+            "achieved_rate": len(results) / wall if wall else 0.0,
+            "ack_p50_ms": acks.percentile(50) / 1000,
+            "ack_p95_ms": acks.percentile(95) / 1000,
+            "ack_p99_ms": acks.percentile(99) / 1000,
+            "ack_max_ms": acks.max / 1000,
+            "over_timeout": sum(1 for _, elapsed, _, _ in results if elapsed > self.ack_timeout),
+            "send_lag_p95_ms": lags.percentile(95) / 1000,
+            "unexpected": dict(unexpected),
+            "forged_accepted": unexpected.get("forged:200", 0),
+            "state_anomalies": 0
+        }
+    
+    def payment_states(self, payment_ids):
+        """{payment id: status} read back through the paged payments list"""
+        wanted, states = set(payment_ids), {}
+        token = self.tester.tokens["admin"]
+        page = 1
+        while wanted - states.keys():
+            response = self.tester.make_request("GET", "payments", token=token, params={"page": page, "limit": 100})
+            if response is None or response.status_code != 200:
+                break
+            body = response.json()
+            for payment in body.get("payments", []):
+                if payment.get("id") in wanted:
+                    states[payment["id"]] = payment.get("status")
+            if page >= body.get("pagination", {}).get("pages", 0):
+                break
+            page += 1
+        return states
+    
+    def verify(self, row, payments):
+        states = self.payment_states([payment_id for payment_id, _ in payments])
+        problems = [f"{row['rate']}/s: payment {payment_id} is {states.get(payment_id, 'missing')} after charge.success"
+                    for payment_id, _ in payments if states.get(payment_id) != "completed"]
+        row["state_anomalies"] = len(problems)
+        self.anomalies.extend(problems)
+    
+    def run(self):
+        if "admin" not in self.tester.tokens:
+            print("❌ The webhook replay needs an admin token")
+            return {"passed": 0, "failed": 1, "errors": ["no admin token"]}
+        if not self.events_path:
+            plans = self.tester.make_request("GET", "subscription-plans", token=self.tester.tokens["admin"])
+            plan_list = plans.json().get("plans", []) if plans is not None and plans.status_code == 200 else []
+            self.plan_id = plan_list[0]["id"] if plan_list else None
+        print(f"🪝 Paystack webhook replay: {'recorded ' + self.events_path if self.events_path else 'synthetic'} "
+              f"stream at {list(self.rates)} events/s, {self.duplicate_rate:.0%} redelivered, "
+              f"{self.forged_rate:.0%} forged")
         
-        if response and response.status_code == 200:
-            created_teacher = response.json()
-            self.test_data["created_teacher"] = created_teacher
-            self.log_result("Create Teacher", True, "Successfully created teacher")
-            
-            # Test Get Teachers
-            response = self.make_request("GET", "teachers", token=admin_token)
-            if response and response.status_code == 200:
-                teachers = response.json()
-                if isinstance(teachers, list):
-                    self.log_result("Get Teachers", True, f"Retrieved {len(teachers)} teachers")
-                else:
-                    self.log_result("Get Teachers", False, "Response is not a list", str(teachers))
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Get Teachers", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-            
-            # Test Update Teacher
-            update_data = {"specialization": "Physics", "experience": "6 years"}
-            response = self.make_request("PUT", "teachers", update_data, admin_token, {"id": created_teacher["id"]})
-            
-            if response and response.status_code == 200:
-                self.log_result("Update Teacher", True, "Successfully updated teacher")
+        for rate in self.rates:
+            payments = []
+            # Only payments this pass created have a known end state to check
+            check_states = False
+            if self.events_path:
+                stream = self.recorded_stream()
             else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Update Teacher", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-            
-            # Test Delete Teacher
-            response = self.make_request("DELETE", "teachers", token=admin_token, params={"id": created_teacher["id"]})
-            
-            if response and response.status_code == 200:
-                self.log_result("Delete Teacher", True, "Successfully deleted teacher")
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Delete Teacher", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+                payments = self.create_payments() if self.plan_id else []
+                check_states = bool(payments)
+                if not payments:
+                    print("⚠️  Could not create pending payments (no subscription plan?); states will not be checked")
+                    payments = [(str(uuid.uuid4()), 25000) for _ in range(self.payments)]
+                stream = self.synthetic_stream(payments)
+            row = self.run_pass(rate, self.shape(stream))
+            if check_states:
+                self.verify(row, payments)
+            self.rows.append(row)
+            print(f"   {rate:>5}/s: {row['events']} events ({row['achieved_rate']:.0f}/s achieved), ack p95 "
+                  f"{row['ack_p95_ms']:.1f}ms, {row['over_timeout']} over {self.ack_timeout:g}s, "
+                  f"{sum(row['unexpected'].values())} unexpected statuses, {row['state_anomalies']} state anomalies")
+        
+        print(f"\n{'RATE':>6} {'EVENTS':>7} {'DUP':>4} {'FORGED':>6} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'maxms':>8} "
+              f"{'SLOW':>5} {'LAGp95':>8} {'STATE':>6}")
+        for row in self.rows:
+            print(f"{row['rate']:>6} {row['events']:>7} {row['duplicates']:>4} {row['forged']:>6} {row['ack_p50_ms']:>8.1f} "
+                  f"{row['ack_p95_ms']:>8.1f} {row['ack_p99_ms']:>8.1f} {row['ack_max_ms']:>8.1f} {row['over_timeout']:>5} "
+                  f"{row['send_lag_p95_ms']:>8.1f} {row['state_anomalies']:>6}")
+            for outcome, count in sorted(row["unexpected"].items()):
+                print(f"       ↳ {count} x {outcome} (expected {'400' if outcome.startswith('forged') else '200'})")
+        for anomaly in self.anomalies[:10]:
+            print(f"❌ {anomaly}")
+        if any(row["forged_accepted"] for row in self.rows):
+            print("🚨 Forged signatures were accepted")
+        slow = sum(row["over_timeout"] for row in self.rows)
+        if slow:
+            print(f"🔁 {slow} acks slower than {self.ack_timeout:g}s would be retried by the provider")
+        self.tester.metrics.add_benchmark("paystack_webhooks", self.rows)
+        
+        failed = sum(1 for row in self.rows if row["unexpected"] or row["over_timeout"] or row["state_anomalies"])
+        return {"passed": len(self.rows) - failed, "failed": failed, "errors": self.anomalies[:20]}
+
+
+# Collections an access-log id can be mapped onto, named as they appear before the id in a path
+REPLAY_COLLECTIONS = ("students", "teachers", "parents", "classes", "subjects")
+# Query keys whose values name a record, and the collection they belong to
+REPLAY_ID_PARAMS = {"studentId": "students", "teacherId": "teachers", "parentId": "parents", "classId": "classes",
+                    "subjectId": "subjects"}
+# Query keys holding free text (names, emails) typed by real users
+REPLAY_TEXT_PARAMS = {"q", "query", "search", "name", "email"}
+REPLAY_PLACEHOLDER = re.compile(r"^\{(\w+):([0-9a-f]+)\}$")
+# Common/combined log format, optionally followed by nginx $request_time (seconds)
+ACCESS_LOG_LINE = re.compile(r'^\S+ \S+ \S+ \[(?P<timestamp>[^\]]+)\] "(?P<method>[A-Z]+) (?P<target>\S+)[^"]*" '
+                             r'(?P<status>\d{3}) \S+(?: "[^"]*" "[^"]*")?(?: (?P<request_time>[0-9.]+))?')
+
+
+def parse_log_timestamp(value):
+    """datetime from epoch seconds, ISO 8601 or the CLF "10/Oct/2024:07:45:01 +0100" form"""
+    if isinstance(value, (int, float)) or re.fullmatch(r"\d+(\.\d+)?", str(value)):
+        return datetime.fromtimestamp(float(value))
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.strptime(value, "%d/%b/%Y:%H:%M:%S %z")
+
+
+def access_log_record(method, target, query, role, timestamp, status=None, duration_ms=None):
+    """One normalised request: path relative to the API base, query as a dict of strings"""
+    parts = urlsplit(target)
+    path = parts.path.strip("/")
+    if path.startswith("api/") or path == "api":
+        path = path[4:]
+    if isinstance(query, str):
+        query = dict(parse_qsl(query.lstrip("?"), keep_blank_values=True))
+    query = {**dict(parse_qsl(parts.query, keep_blank_values=True)), **{k: str(v) for k, v in (query or {}).items()}}
+    return {
+        "timestamp": parse_log_timestamp(timestamp),
+        "method": method.upper(),
+        "path": path,
+        "query": query,
+        "role": role,
+        "status": int(status) if status not in (None, "") else None,
+        "duration_ms": float(duration_ms) if duration_ms not in (None, "") else None
+    }
+
+
+def read_access_log(path, default_role="admin"):
+    """Records from JSON lines, a CSV with a header row, or common/combined log format.
+
+    JSON and CSV rows carry method, path (or url), query, role and timestamp, plus
+    optional status and duration_ms; CLF lines have no role, so they get
+    `default_role`. Lines that cannot be parsed are counted and skipped.
+    """
+    records, skipped = [], 0
+    with open(path, newline="") as f:
+        first = ""
+        for first in f:
+            if first.strip():
+                break
+        f.seek(0)
+        if first.lstrip().startswith("{"):
+            rows = (json.loads(line) for line in f if line.strip())
+        elif ACCESS_LOG_LINE.match(first):
+            rows = None
         else:
-            error_msg = response.text if response else "Request failed"
-            self.log_result("Create Teacher", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+            rows = csv.DictReader(f)
+        for row in rows if rows is not None else f:
+            try:
+                if rows is None:
+                    match = ACCESS_LOG_LINE.match(row)
+                    request_time = match.group("request_time")
+                    records.append(access_log_record(
+                        match.group("method"), match.group("target"), None, default_role, match.group("timestamp"),
+                        match.group("status"), float(request_time) * 1000 if request_time else None))
+                else:
+                    records.append(access_log_record(
+                        row["method"], row.get("path") or row["url"], row.get("query"),
+                        row.get("role") or default_role, row["timestamp"], row.get("status"), row.get("duration_ms")))
+            except (AttributeError, KeyError, TypeError, ValueError):
+                skipped += 1
+    records.sort(key=lambda record: record["timestamp"])
+    return records, skipped
+
+
+class AccessLogAnonymiser:
+    """Replaces record ids and free text in access-log records with salted pseudonyms.
+
+    An id becomes {collection:digest}, the collection taken from the path segment
+    before it (students/<id>) or from the query key (classId=<id>); search text and
+    emails become {text:digest}. One salt always maps a value to the same digest,
+    so repeat visits to a record are still repeat visits after anonymisation.
+    Client addresses and user agents are never read in the first place.
+    """
+    def __init__(self, salt=None):
+        self.salt = (salt or uuid.uuid4().hex).encode()
     
-    def test_class_management(self):
-        """Test class CRUD operations"""
-        print("\n=== Testing Class Management ===")
-        
-        if "admin" not in self.tokens:
-            self.log_result("Class Management", False, "Admin token not available")
-            return
+    def pseudonym(self, kind, value):
+        return "{%s:%s}" % (kind, hmac.new(self.salt, value.encode(), hashlib.sha256).hexdigest()[:12])
+    
+    def anonymise_value(self, key, value):
+        if REPLAY_PLACEHOLDER.match(value):
+            return value
+        if key in REPLAY_ID_PARAMS:
+            return self.pseudonym(REPLAY_ID_PARAMS[key], value)
+        if key in REPLAY_TEXT_PARAMS or "@" in value:
+            return self.pseudonym("text", value)
+        if ID_SEGMENT.match(value) and not value.isdigit():
+            return self.pseudonym("record", value)
+        return value
+    
+    def anonymise(self, record):
+        segments = record["path"].split("/")
+        for index, segment in enumerate(segments):
+            if index and ID_SEGMENT.match(segment):
+                kind = segments[index - 1] if segments[index - 1] in REPLAY_COLLECTIONS else "record"
+                segments[index] = self.pseudonym(kind, segment)
+        query = {key: self.anonymise_value(key, value) for key, value in record["query"].items()}
+        return {**record, "path": "/".join(segments), "query": query}
+    
+    def write(self, records, path):
+        """JSON lines read_access_log() accepts, ready to leave production"""
+        with open(path, "w") as f:
+            for record in records:
+                record = self.anonymise(record)
+                f.write(json.dumps({**record, "timestamp": record["timestamp"].isoformat()}) + "\n")
+
+
+class TrafficReplay:
+    """Replays an access log through the tester's transport against seeded data.
+
+    Records are anonymised first, then every pseudonym is mapped onto a seeded
+    entity of the same collection (or a seeded first name for text), so a log from
+    one school replays against another. Requests keep their original spacing,
+    divided by `compression`. Access logs carry no request bodies, so writes are
+    only replayed where a body can be generated (attendance/bulk from a seeded
+    roster); the rest count towards the mix but are not sent. The report sets
+    each endpoint's replayed latency next to its logged latency, where the log has it.
+    """
+    def __init__(self, tester, seeder, records, compression=1.0, window=None, limit=0, concurrency=64, salt=None,
+                 seed=42):
+        self.tester = tester
+        self.seeder = seeder
+        self.compression = compression
+        self.concurrency = concurrency
+        self.anonymiser = AccessLogAnonymiser(salt)
+        self.rng = random.Random(seed)
+        if window:
+            start, end = window
+            records = [record for record in records if start <= record["timestamp"].strftime("%H:%M") < end]
+        self.records = records[:limit] if limit else records
+        self.entities = {
+            collection: sorted(seeder.state["created"].get(collection, {}).values())
+            for collection in REPLAY_COLLECTIONS
+        }
+        self.entities["text"] = sorted({record["firstName"] for record in seeder.plan["students"]})
+        self.rosters = defaultdict(list)
+        for index, student in enumerate(seeder.plan["students"]):
+            student_id = seeder.created_id("students", index)
+            class_id = seeder.created_id("classes", student["class_ref"])
+            if student_id and class_id:
+                self.rosters[class_id].append(student_id)
+        self.unmapped = 0
+        self.rows = []
+    
+    def resolve(self, value):
+        """Seeded stand-in for a pseudonym; pseudonyms with nothing to map onto become unknown ids"""
+        match = REPLAY_PLACEHOLDER.match(value)
+        if not match:
+            return value
+        kind, digest = match.groups()
+        pool = self.entities.get(kind)
+        if not pool:
+            self.unmapped += 1
+            return str(uuid.UUID(digest.ljust(32, "0")))
+        return pool[int(digest, 16) % len(pool)]
+    
+    def body_for(self, method, key):
+        """Request body for a write, or None when the log gives nothing to rebuild it from"""
+        if (method, key) == ("POST", "attendance/bulk") and self.rosters:
+            class_id = self.rng.choice(sorted(self.rosters))
+            day = self.rng.choice(self.seeder.plan["days"])
+            return {"attendanceList": [
+                {"studentId": student_id, "classId": class_id, "date": day,
+                 "status": self.rng.choices(["present", "late", "absent"], weights=[90, 4, 6])[0]}
+                for student_id in self.rosters[class_id]
+            ]}
+        return None
+    
+    def plan(self):
+        """(offset seconds, method, path, params, role, key, body, logged ms) per replayable record"""
+        jobs, skipped = [], defaultdict(int)
+        if not self.records:
+            return jobs, skipped
+        started = self.records[0]["timestamp"]
+        for record in self.records:
+            record = self.anonymiser.anonymise(record)
+            path = "/".join(self.resolve(segment) for segment in record["path"].split("/"))
+            params = {key: self.resolve(value) for key, value in record["query"].items()}
+            key = endpoint_key(path)
+            body = None if record["method"] in ("GET", "HEAD") else self.body_for(record["method"], key)
+            if record["method"] not in ("GET", "HEAD") and body is None:
+                skipped[(record["method"], key, record["role"])] += 1
+                continue
+            offset = (record["timestamp"] - started).total_seconds() / self.compression
+            jobs.append((offset, record["method"], path, params, record["role"], key, body, record["duration_ms"]))
+        return jobs, skipped
+    
+    def peak_minute(self):
+        """Most requests the log holds in any one minute"""
+        per_minute = defaultdict(int)
+        for record in self.records:
+            per_minute[record["timestamp"].replace(second=0, microsecond=0)] += 1
+        return max(per_minute.values(), default=0)
+    
+    def run(self):
+        jobs, skipped = self.plan()
+        span = (self.records[-1]["timestamp"] - self.records[0]["timestamp"]).total_seconds() if self.records else 0
+        peak = self.peak_minute()
+        print(f"🎞️  Replaying {len(jobs)} of {len(self.records)} logged requests spanning {span / 60:.1f} min "
+              f"at {self.compression:g}x ({span / self.compression:.0f}s); busiest minute {peak} requests "
+              f"→ {peak * self.compression / 60:.1f} req/s")
+        if self.unmapped:
+            print(f"⚠️  {self.unmapped} ids had no seeded collection to map onto and will likely 404")
+        if not jobs:
+            print("❌ Nothing in the log can be replayed")
+            return {"passed": 0, "failed": 1, "errors": ["no replayable requests"]}
         
-        admin_token = self.tokens["admin"]
+        start = time.monotonic() + 0.05
         
-        # Test Create Class
-        class_data = {
-            "name": "JSS 1A",
-            "level": "Junior Secondary 1",
-            "section": "A",
-            "capacity": 30,
-            "academicYear": "2024/2025",
-            "classTeacherId": self.test_data.get("created_teacher", {}).get("id", str(uuid.uuid4()))
-        }
+        def send(job):
+            offset, method, path, params, role, key, body, _ = job
+            delay = start + offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            started = time.perf_counter()
+            response = self.tester.make_request(method, path, body, self.tester.tokens.get(role), params=params or None)
+            return time.perf_counter() - started, max(-delay, 0.0), None if response is None else response.status_code
         
-        response = self.make_request("POST", "classes", class_data, admin_token)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(send, jobs))
+        wall = time.monotonic() - start
         
-        if response and response.status_code == 200:
-            created_class = response.json()
-            self.test_data["created_class"] = created_class
-            self.log_result("Create Class", True, "Successfully created class")
-            
-            # Test Get Classes
-            response = self.make_request("GET", "classes", token=admin_token)
-            if response and response.status_code == 200:
-                classes = response.json()
-                if isinstance(classes, list):
-                    self.log_result("Get Classes", True, f"Retrieved {len(classes)} classes")
-                else:
-                    self.log_result("Get Classes", False, "Response is not a list", str(classes))
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Get Classes", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-            
-            # Test Update Class
-            update_data = {"capacity": 35, "section": "B"}
-            response = self.make_request("PUT", "classes", update_data, admin_token, {"id": created_class["id"]})
-            
-            if response and response.status_code == 200:
-                self.log_result("Update Class", True, "Successfully updated class")
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Update Class", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-            
-            # Test Delete Class
-            response = self.make_request("DELETE", "classes", token=admin_token, params={"id": created_class["id"]})
-            
-            if response and response.status_code == 200:
-                self.log_result("Delete Class", True, "Successfully deleted class")
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Delete Class", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-        else:
-            error_msg = response.text if response else "Request failed"
-            self.log_result("Create Class", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-    
-    def test_subject_management(self):
-        """Test subject CRUD operations"""
-        print("\n=== Testing Subject Management ===")
+        replayed, logged = defaultdict(list), defaultdict(list)
+        statuses = defaultdict(lambda: defaultdict(int))
+        lags = LatencyHistogram()
+        for job, (elapsed, lag, status) in zip(jobs, results):
+            key = (job[1], job[5], job[4])
+            replayed[key].append(elapsed * 1000)
+            if job[7] is not None:
+                logged[key].append(job[7])
+            statuses[key]["5xx" if status is None or status >= 500 else "4xx" if status >= 400 else "ok"] += 1
+            lags.record(lag * 1_000_000)
         
-        if "admin" not in self.tokens:
-            self.log_result("Subject Management", False, "Admin token not available")
-            return
+        total = len(self.records)
+        for key in sorted(set(replayed) | set(skipped), key=lambda key: -(len(replayed.get(key, ())) + skipped[key])):
+            method, endpoint, role = key
+            samples, before = replayed.get(key, []), logged.get(key, [])
+            row = {
+                "method": method,
+                "endpoint": endpoint,
+                "role": role,
+                "share": (len(samples) + skipped[key]) / total,
+                "replayed": len(samples),
+                "not_replayed": skipped[key],
+                "client_errors": statuses[key]["4xx"],
+                "server_errors": statuses[key]["5xx"],
+                "replay_p50_ms": sample_percentile(samples, 50) if samples else None,
+                "replay_p95_ms": sample_percentile(samples, 95) if samples else None,
+                "replay_p99_ms": sample_percentile(samples, 99) if samples else None,
+                "logged_p50_ms": sample_percentile(before, 50) if before else None,
+                "logged_p95_ms": sample_percentile(before, 95) if before else None,
+                # One-sided: is the replay slower than production was?
+                "slower_p": mann_whitney_u(samples, before)[1] if samples and before else None
+            }
+            self.rows.append(row)
         
-        admin_token = self.tokens["admin"]
+        cell = lambda value, width, fmt=".1f": f"{'-':>{width}}" if value is None else f"{value:>{width}{fmt}}"
+        print(f"\n{'METHOD':<7} {'ENDPOINT':<28} {'ROLE':<8} {'SHARE':>6} {'SENT':>6} {'SKIP':>5} {'4xx':>4} {'5xx':>4} "
+              f"{'p50':>7} {'p95':>7} {'p99':>7} {'LOGp50':>7} {'LOGp95':>7} {'p(slower)':>9}")
+        for row in self.rows:
+            print(f"{row['method']:<7} {row['endpoint'][:28]:<28} {str(row['role'])[:8]:<8} {row['share']:>6.1%} "
+                  f"{row['replayed']:>6} {row['not_replayed']:>5} {row['client_errors']:>4} {row['server_errors']:>4} "
+                  f"{cell(row['replay_p50_ms'], 7)} {cell(row['replay_p95_ms'], 7)} {cell(row['replay_p99_ms'], 7)} "
+                  f"{cell(row['logged_p50_ms'], 7)} {cell(row['logged_p95_ms'], 7)} {cell(row['slower_p'], 9, '.3f')}")
+        print(f"\n📨 {len(results)} requests in {wall:.1f}s ({len(results) / wall if wall else 0:.1f} req/s), "
+              f"send lag p95 {lags.percentile(95) / 1000:.1f}ms")
+        if lags.percentile(95) > 100_000:
+            print("⚠️  The client fell behind the log's pacing; raise --replay-concurrency or lower --time-compression")
+        self.tester.metrics.add_benchmark("traffic_replay", self.rows)
         
-        # Test Create Subject
-        subject_data = {
-            "name": "Mathematics",
-            "code": "MATH101",
-            "description": "Basic Mathematics for Junior Secondary",
-            "credits": 3,
-            "level": "Junior Secondary"
+        failed = [row for row in self.rows if row["server_errors"]]
+        return {"passed": len(self.rows) - len(failed), "failed": len(failed),
+                "errors": [f"{row['method']} {row['endpoint']} ({row['role']}): {row['server_errors']} server errors"
+                           for row in failed]}
+
+
+class AuthBenchmark:
+    """Login storms, auth/me under concurrency and session listing/revocation, with the bcrypt share.
+
+    Logins are timed three ways: an unknown email (users.findOne only), a wrong
+    password (findOne + bcrypt.compare) and a good password (both, plus the school
+    lookup and jwt.sign). Their p50 difference estimates bcrypt's cost; a server
+    that reports a "hash"/"bcrypt" Server-Timing metric is taken at its word
+    instead. Storms of distinct users logging in at once show whether bcrypt
+    serialises on one event loop, and how many workers a school opening needs to
+    finish within `login_target` seconds. Session endpoints are timed for users
+    holding each of `session_counts` active sessions.
+    """
+    HASH_METRICS = ("hash", "bcrypt")
+
+    def __init__(self, tester, storm_sizes=(10, 50, 200), concurrency_levels=(1, 4, 16), requests_per_point=20,
+                 session_counts=(10, 100, 1000), samples=20, login_target=5.0, bcrypt_rounds=10, growth_threshold=1.1):
+        self.tester = tester
+        self.storm_sizes = storm_sizes
+        self.concurrency_levels = concurrency_levels
+        self.requests_per_point = requests_per_point
+        self.session_counts = session_counts
+        self.samples = samples
+        self.login_target = login_target
+        self.bcrypt_rounds = bcrypt_rounds
+        self.growth_threshold = growth_threshold
+        self.accounts = []
+        self.login_rows = []
+        self.storm_rows = []
+        self.me_rows = []
+        self.session_rows = []
+        self.growth = []
+        self.bcrypt_ms = None
+        self.hash_source = None
+        self.errors = []
+    
+    def account(self, index):
+        # Fixed addresses: reruns log in to the accounts an earlier run registered
+        return {"role": "student", "name": f"Auth Bench {index}", "email": f"authbench{index}@bench.school.edu.ng",
+                "password": SEED_PASSWORD, "phoneNumber": f"+23481{index:08d}"}
+    
+    def register(self, index):
+        """(credentials, user id, token) for one bench account, or None"""
+        credentials = self.account(index)
+        response = self.tester.make_request("POST", "auth/register", credentials)
+        if response is None or response.status_code != 200:
+            response = self.login(credentials["email"], credentials["password"])
+        if response is None or response.status_code != 200:
+            return None
+        body = response.json()
+        return credentials, body["user"]["id"], body["token"]
+    
+    def login(self, email, password):
+        return self.tester.make_request("POST", "auth/login", {"email": email, "password": password})
+    
+    def timed(self, call):
+        """(ms, server-reported hash ms or None, response)"""
+        started = time.perf_counter()
+        response = call()
+        elapsed = (time.perf_counter() - started) * 1000
+        timing = getattr(response, "timing", None) or {}
+        reported = [value for name, value in (timing.get("server_timing") or {}).items()
+                    if name in self.HASH_METRICS and value is not None]
+        return elapsed, sum(reported) if reported else None, response
+    
+    def summarise(self, samples, expected=None):
+        """Percentiles of (ms, hash ms, response) samples; errors are missing responses and 5xx, or with
+        `expected` any other status"""
+        values = [elapsed for elapsed, _, _ in samples]
+        hashes = [hashed for _, hashed, _ in samples if hashed is not None]
+        app = [response.timing["app"] * 1000 for _, _, response in samples
+               if response is not None and (getattr(response, "timing", None) or {}).get("app") is not None]
+        return {
+            "count": len(values),
+            "errors": sum(1 for _, _, response in samples if response is None or (
+                response.status_code != expected if expected else response.status_code >= 500)),
+            "p50_ms": sample_percentile(values, 50) if values else 0.0,
+            "p95_ms": sample_percentile(values, 95) if values else 0.0,
+            "p99_ms": sample_percentile(values, 99) if values else 0.0,
+            "max_ms": max(values, default=0.0),
+            "hash_p50_ms": sample_percentile(hashes, 50) if hashes else None,
+            "app_p50_ms": sample_percentile(app, 50) if app else None
         }
+    
+    def local_bcrypt_ms(self):
+        """Native bcrypt.checkpw at the configured cost on this machine (bcryptjs in Node is slower)"""
+        if bcrypt is None:
+            return None
+        hashed = bcrypt.hashpw(SEED_PASSWORD.encode(), bcrypt.gensalt(rounds=self.bcrypt_rounds))
+        started = time.perf_counter()
+        for _ in range(3):
+            bcrypt.checkpw(SEED_PASSWORD.encode(), hashed)
+        return (time.perf_counter() - started) / 3 * 1000
+    
+    def decompose_login(self):
+        credentials, _, token = self.accounts[0]
+        kinds = [
+            ("unknown email", "users.findOne", lambda: self.login(f"nobody-{uuid.uuid4().hex[:8]}@bench.school.edu.ng",
+                                                                 SEED_PASSWORD), 401),
+            ("wrong password", "findOne + bcrypt", lambda: self.login(credentials["email"], "not-the-password"), 401),
+            ("good password", "findOne + bcrypt + school + jwt", lambda: self.login(credentials["email"],
+                                                                                    credentials["password"]), 200),
+            ("auth/me", "jwt.verify + users.findOne", lambda: self.tester.make_request("GET", "auth/me", token=token),
+             200)
+        ]
+        for name, work, call, expected in kinds:
+            samples = [self.timed(call) for _ in range(self.samples)]
+            unexpected = sum(1 for _, _, response in samples if response is None or response.status_code != expected)
+            if unexpected:
+                self.errors.append(f"{name}: {unexpected}/{len(samples)} responses were not {expected}")
+            self.login_rows.append({"kind": name, "work": work, "unexpected": unexpected, **self.summarise(samples)})
         
-        response = self.make_request("POST", "subjects", subject_data, admin_token)
-        
-        if response and response.status_code == 200:
-            created_subject = response.json()
-            self.test_data["created_subject"] = created_subject
-            self.log_result("Create Subject", True, "Successfully created subject")
-            
-            # Test Get Subjects
-            response = self.make_request("GET", "subjects", token=admin_token)
-            if response and response.status_code == 200:
-                subjects = response.json()
-                if isinstance(subjects, list):
-                    self.log_result("Get Subjects", True, f"Retrieved {len(subjects)} subjects")
-                else:
-                    self.log_result("Get Subjects", False, "Response is not a list", str(subjects))
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Get Subjects", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+        rows = {row["kind"]: row for row in self.login_rows}
+        reported = rows["good password"]["hash_p50_ms"]
+        if reported is not None:
+            self.bcrypt_ms, self.hash_source = reported, "server-reported"
         else:
-            error_msg = response.text if response else "Request failed"
-            self.log_result("Create Subject", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+            self.bcrypt_ms = max(rows["wrong password"]["p50_ms"] - rows["unknown email"]["p50_ms"], 0.0)
+            self.hash_source = "wrong-password minus unknown-email p50"
     
-    def test_teacher_assignments(self):
-        """Test teacher assignment system"""
-        print("\n=== Testing Teacher Assignments ===")
-        
-        if "admin" not in self.tokens:
-            self.log_result("Teacher Assignments", False, "Admin token not available")
-            return
+    def storm(self, size):
+        """`size` distinct users all pressing Login at once"""
+        accounts = self.accounts[:size]
+        gate = threading.Barrier(len(accounts))
         
-        admin_token = self.tokens["admin"]
+        def login(account):
+            credentials = account[0]
+            gate.wait()
+            return self.timed(lambda: self.login(credentials["email"], credentials["password"]))
         
-        # Test Create Teacher Assignment
-        assignment_data = {
-            "teacherId": self.test_data.get("created_teacher", {}).get("id", str(uuid.uuid4())),
-            "subjectId": self.test_data.get("created_subject", {}).get("id", str(uuid.uuid4())),
-            "classId": self.test_data.get("created_class", {}).get("id", str(uuid.uuid4())),
-            "subjectName": "Mathematics",
-            "className": "JSS 1A",
-            "academicYear": "2024/2025"
-        }
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(accounts)) as executor:
+            samples = list(executor.map(login, accounts))
+        wall = time.perf_counter() - started
+        row = {"users": len(accounts), "wall_s": wall, "logins_per_s": len(accounts) / wall if wall else 0.0,
+               "failed": sum(1 for _, _, response in samples if response is None or response.status_code != 200),
+               **self.summarise(samples)}
+        # Cores kept busy by bcrypt alone; ~1 means hashing is queued on a single thread
+        row["bcrypt_cores"] = row["logins_per_s"] * self.bcrypt_ms / 1000 if self.bcrypt_ms else None
+        return row
+    
+    def me_under_concurrency(self, concurrency):
+        tokens = [token for _, _, token in self.accounts[:max(concurrency, 1)]]
         
-        response = self.make_request("POST", "teacher-assignments", assignment_data, admin_token)
+        def call(index):
+            return self.timed(lambda: self.tester.make_request("GET", "auth/me", token=tokens[index % len(tokens)]))
         
-        if response and response.status_code == 200:
-            created_assignment = response.json()
-            self.test_data["created_assignment"] = created_assignment
-            self.log_result("Create Teacher Assignment", True, "Successfully created teacher assignment")
-            
-            # Test Get Teacher Assignments
-            response = self.make_request("GET", "teacher-assignments", token=admin_token)
-            if response and response.status_code == 200:
-                assignments = response.json()
-                if isinstance(assignments, list):
-                    self.log_result("Get Teacher Assignments", True, f"Retrieved {len(assignments)} assignments")
-                else:
-                    self.log_result("Get Teacher Assignments", False, "Response is not a list", str(assignments))
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Get Teacher Assignments", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-        else:
-            error_msg = response.text if response else "Request failed"
-            self.log_result("Create Teacher Assignment", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(call, range(self.requests_per_point)))
+        wall = time.perf_counter() - started
+        return {"concurrency": concurrency, "rps": len(samples) / wall if wall else 0.0,
+                **self.summarise(samples, expected=200)}
     
-    def test_attendance_management(self):
-        """Test attendance management system"""
-        print("\n=== Testing Attendance Management ===")
+    def sessions_at(self, count, account):
+        """Time list/touch/revoke for a user holding `count` active sessions"""
+        _, user_id, token = account
+        # Start from the single session a revoke-all leaves behind
+        self.tester.make_request("DELETE", "auth/sessions", token=token, params={"all": "true"})
         
-        if "admin" not in self.tokens:
-            self.log_result("Attendance Management", False, "Admin token not available")
-            return
+        def create(index):
+            response = self.tester.make_request("POST", "auth/sessions", {
+                "userId": user_id, "deviceInfo": {"type": "web", "browser": "bench"},
+                "ipAddress": f"10.0.{index // 250}.{index % 250}", "userAgent": "backend_test.py"
+            })
+            return response is not None and response.status_code == 200
         
-        admin_token = self.tokens["admin"]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            created = sum(executor.map(create, range(count - 1)))
         
-        # Test Individual Attendance Marking
-        attendance_data = {
-            "studentId": self.test_data.get("created_student", {}).get("id", str(uuid.uuid4())),
-            "classId": self.test_data.get("created_class", {}).get("id", str(uuid.uuid4())),
-            "subjectId": self.test_data.get("created_subject", {}).get("id", str(uuid.uuid4())),
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "status": "present",
-            "remarks": "On time"
-        }
+        listed = [self.timed(lambda: self.tester.make_request("GET", "auth/sessions", token=token))
+                  for _ in range(self.samples)]
+        response = listed[-1][2]
+        sessions = response.json().get("sessions", []) if response is not None and response.status_code == 200 else []
+        if len(sessions) != created + 1:
+            self.errors.append(f"{count} sessions: listing returned {len(sessions)}, expected {created + 1}")
+        victims = [session["id"] for session in sessions[:-1][:self.samples]]
+        touched = [self.timed(lambda: self.tester.make_request("PATCH", "auth/sessions", {"sessionId": sessions[0]["id"]},
+                                                                token))
+                   for _ in range(self.samples if sessions else 0)]
+        revoked = [self.timed(lambda victim=victim: self.tester.make_request(
+            "DELETE", "auth/sessions", token=token, params={"sessionId": victim})) for victim in victims]
+        revoke_all = self.timed(lambda: self.tester.make_request("DELETE", "auth/sessions", token=token,
+                                                                 params={"all": "true"}))
+        terminated = revoke_all[2].json().get("terminatedCount") if revoke_all[2] is not None and \
+            revoke_all[2].status_code == 200 else None
+        if terminated != len(sessions) - len(victims):
+            self.errors.append(f"{count} sessions: revoke-all terminated {terminated}, "
+                               f"expected {len(sessions) - len(victims)}")
+        for operation, samples in (("list", listed), ("touch", touched), ("revoke one", revoked),
+                                   ("revoke all", [revoke_all])):
+            self.session_rows.append({"operation": operation, "sessions": count,
+                                      **self.summarise(samples, expected=200)})
+    
+    def analyse_sessions(self):
+        self.growth = growth_exponents(self.session_rows, "sessions", self.growth_threshold, ("operation",))
+    
+    def print_report(self, local_ms):
+        print(f"\n{'LOGIN KIND':<16} {'SERVER WORK':<32} {'p50ms':>8} {'p95ms':>8} {'hash p50':>9} {'BAD':>4}")
+        for row in self.login_rows:
+            hashed = "-" if row["hash_p50_ms"] is None else f"{row['hash_p50_ms']:.1f}"
+            print(f"{row['kind']:<16} {row['work']:<32} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {hashed:>9} "
+                  f"{row['unexpected']:>4}")
+        good = next(row for row in self.login_rows if row["kind"] == "good password")
+        share = self.bcrypt_ms / good["p50_ms"] if good["p50_ms"] else 0.0
+        print(f"🔐 bcrypt ≈ {self.bcrypt_ms:.1f}ms per login ({self.hash_source}), {share:.0%} of a successful login; "
+              f"the other {good['p50_ms'] - self.bcrypt_ms:.1f}ms is DB lookups, jwt.sign and transport")
+        if local_ms is not None:
+            print(f"   native bcrypt cost {self.bcrypt_rounds} on this machine: {local_ms:.1f}ms per compare")
         
-        response = self.make_request("POST", "attendance", attendance_data, admin_token)
+        print(f"\n{'STORM':>6} {'WALL s':>7} {'login/s':>8} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'FAIL':>5} "
+              f"{'bcrypt cores':>12}")
+        for row in self.storm_rows:
+            cores = "-" if row["bcrypt_cores"] is None else f"{row['bcrypt_cores']:.2f}"
+            print(f"{row['users']:>6} {row['wall_s']:>7.2f} {row['logins_per_s']:>8.1f} {row['p50_ms']:>8.1f} "
+                  f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['failed']:>5} {cores:>12}")
+        if self.storm_rows and self.bcrypt_ms:
+            largest = self.storm_rows[-1]
+            workers = math.ceil(largest["users"] * self.bcrypt_ms / 1000 / self.login_target)
+            print(f"🏫 {largest['users']} logins within {self.login_target:g}s need ≥{workers} Node worker(s) "
+                  f"for bcrypt alone")
         
-        if response and response.status_code == 200:
-            created_attendance = response.json()
-            self.log_result("Mark Individual Attendance", True, "Successfully marked individual attendance")
-            
-            # Test Get Attendance
-            response = self.make_request("GET", "attendance", token=admin_token)
-            if response and response.status_code == 200:
-                attendance_records = response.json()
-                if isinstance(attendance_records, list):
-                    self.log_result("Get Attendance", True, f"Retrieved {len(attendance_records)} attendance records")
-                else:
-                    self.log_result("Get Attendance", False, "Response is not a list", str(attendance_records))
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Get Attendance", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-            
-            # Test Bulk Attendance Marking
-            bulk_attendance_data = {
-                "attendanceList": [
-                    {
-                        "studentId": str(uuid.uuid4()),
-                        "classId": self.test_data.get("created_class", {}).get("id", str(uuid.uuid4())),
-                        "subjectId": self.test_data.get("created_subject", {}).get("id", str(uuid.uuid4())),
-                        "date": datetime.now().strftime("%Y-%m-%d"),
-                        "status": "present"
-                    },
-                    {
-                        "studentId": str(uuid.uuid4()),
-                        "classId": self.test_data.get("created_class", {}).get("id", str(uuid.uuid4())),
-                        "subjectId": self.test_data.get("created_subject", {}).get("id", str(uuid.uuid4())),
-                        "date": datetime.now().strftime("%Y-%m-%d"),
-                        "status": "absent"
-                    }
-                ]
-            }
-            
-            response = self.make_request("POST", "attendance/bulk", bulk_attendance_data, admin_token)
-            
-            if response and response.status_code == 200:
-                result = response.json()
-                if "success" in result and result["success"]:
-                    self.log_result("Bulk Attendance Marking", True, f"Successfully marked bulk attendance for {result.get('count', 0)} students")
-                else:
-                    self.log_result("Bulk Attendance Marking", False, "Bulk attendance response missing success flag", str(result))
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result("Bulk Attendance Marking", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-        else:
-            error_msg = response.text if response else "Request failed"
-            self.log_result("Mark Individual Attendance", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+        print(f"\n{'auth/me CONC':>12} {'req/s':>8} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'ERR':>4}")
+        for row in self.me_rows:
+            print(f"{row['concurrency']:>12} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                  f"{row['p99_ms']:>8.1f} {row['errors']:>4}")
+        if self.me_rows:
+            busiest = max(self.me_rows, key=lambda row: row["rps"])
+            # What a token-validation cache saves is the server work behind each check, not the round trip
+            work, source = busiest["app_p50_ms"], "server-reported"
+            if work is None:
+                work, source = self.me_rows[0]["p50_ms"], "unloaded round trip, an upper bound"
+            print(f"🎫 auth/me costs {work:.1f}ms of server work per check ({source}); at {busiest['rps']:.0f} req/s "
+                  f"a validation cache would free {work * busiest['rps'] / 1000:.2f} server-seconds per second")
+        
+        print(f"\n{'SESSION OP':<12} {'SESSIONS':>9} {'p50ms':>8} {'p95ms':>8} {'ERR':>4}")
+        for row in self.session_rows:
+            print(f"{row['operation']:<12} {row['sessions']:>9} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                  f"{row['errors']:>4}")
+        print_growth(self.growth, (("operation", 12),), "sessions")
+        for error in self.errors:
+            print(f"❌ {error}")
     
-    def test_notification_system(self):
-        """Test notification system"""
-        print("\n=== Testing Notification System ===")
+    def run(self):
+        needed = max([*self.storm_sizes, *self.concurrency_levels, 1]) + len(self.session_counts)
+        print(f"🔐 Auth benchmark: registering {needed} bench accounts")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.accounts = [account for account in executor.map(self.register, range(needed)) if account]
+        if len(self.accounts) < needed:
+            print(f"❌ Only {len(self.accounts)}/{needed} bench accounts could log in")
+            return {"passed": 0, "failed": 1, "errors": ["bench accounts unavailable"]}
+        # An explicit split point: with no session counts, [-0:] would hand every account to the session phase
+        split = len(self.accounts) - len(self.session_counts)
+        session_accounts, self.accounts = self.accounts[split:], self.accounts[:split]
         
-        if "teacher" not in self.tokens:
-            self.log_result("Notification System", False, "Teacher token not available")
-            return
+        self.decompose_login()
+        for size in self.storm_sizes:
+            self.storm_rows.append(self.storm(size))
+        for concurrency in self.concurrency_levels:
+            self.me_rows.append(self.me_under_concurrency(concurrency))
+        for count, account in zip(self.session_counts, session_accounts):
+            self.sessions_at(count, account)
+        self.analyse_sessions()
+        self.print_report(self.local_bcrypt_ms())
         
-        teacher_token = self.tokens["teacher"]
-        
-        # Test Get Notifications
-        response = self.make_request("GET", "notifications", token=teacher_token)
-        
-        if response and response.status_code == 200:
-            notifications = response.json()
-            if isinstance(notifications, list):
-                self.log_result("Get Notifications", True, f"Retrieved {len(notifications)} notifications")
-                
-                # Test Mark Notification as Read (if notifications exist)
-                if notifications:
-                    notification_id = notifications[0].get("id")
-                    if notification_id:
-                        mark_read_data = {"notificationId": notification_id}
-                        response = self.make_request("POST", "notifications/mark-read", mark_read_data, teacher_token)
-                        
-                        if response and response.status_code == 200:
-                            result = response.json()
-                            if result.get("success"):
-                                self.log_result("Mark Notification Read", True, "Successfully marked notification as read")
-                            else:
-                                self.log_result("Mark Notification Read", False, "Response missing success flag", str(result))
-                        else:
-                            error_msg = response.text if response else "Request failed"
-                            self.log_result("Mark Notification Read", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
-                    else:
-                        self.log_result("Mark Notification Read", False, "No notification ID found in first notification")
-                else:
-                    self.log_result("Mark Notification Read", True, "No notifications to mark as read (expected)")
-            else:
-                self.log_result("Get Notifications", False, "Response is not a list", str(notifications))
-        else:
-            error_msg = response.text if response else "Request failed"
-            self.log_result("Get Notifications", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+        self.tester.metrics.add_benchmark("auth", {
+            "bcrypt_ms": self.bcrypt_ms,
+            "bcrypt_source": self.hash_source,
+            "logins": self.login_rows,
+            "storms": self.storm_rows,
+            "auth_me": self.me_rows,
+            "sessions": self.session_rows,
+            "session_growth": self.growth
+        })
+        # A 401 storm on auth/me or a failing session call fails the run like a failed login
+        rows = self.storm_rows + self.me_rows + self.session_rows
+        failed = len(self.errors) + sum(row["failed"] for row in self.storm_rows) + \
+            sum(row["errors"] for row in self.me_rows + self.session_rows)
+        clean = sum(1 for row in rows if not row.get("failed") and not row["errors"])
+        return {"passed": len(self.login_rows) + clean, "failed": failed, "errors": self.errors}
+
+
+# Reads a dashboard page issues on every refresh: (endpoint, role)
+DASHBOARD_REFRESH = [
+    ("dashboard/stats", "admin"),
+    ("dashboard/stats", "teacher"),
+    ("dashboard/stats", "parent"),
+    ("classes", "admin"),
+    ("subjects", "admin"),
+    ("notifications", "teacher")
+]
+
+
+class CacheReport:
+    """Replays dashboard refreshes through a ResponseCache to measure achievable hit ratios"""
+    def __init__(self, tester, refreshes=20, interval=0, workload=None):
+        self.tester = tester
+        self.refreshes = refreshes
+        self.interval = interval
+        self.workload = workload or DASHBOARD_REFRESH
     
-    def test_dashboard_statistics(self):
-        """Test dashboard statistics for all roles"""
-        print("\n=== Testing Dashboard Statistics ===")
+    def run(self):
+        cache = self.tester.cache
+        print(f"🗄️  Dashboard refresh workload: {self.refreshes} refreshes every {self.interval}s, "
+              f"default TTL {cache.default_ttl}s")
+        failed = 0
+        for refresh in range(self.refreshes):
+            for endpoint, role in self.workload:
+                token = self.tester.tokens.get(role)
+                if not token:
+                    continue
+                response = self.tester.make_request("GET", endpoint, token=token)
+                if response is None or response.status_code != 200:
+                    failed += 1
+            if self.interval and refresh < self.refreshes - 1:
+                time.sleep(self.interval)
         
-        for role, token in self.tokens.items():
-            response = self.make_request("GET", "dashboard/stats", token=token)
-            
-            if response and response.status_code == 200:
-                stats = response.json()
-                if isinstance(stats, dict) and stats:
-                    self.log_result(f"Dashboard Stats {role}", True, f"Retrieved dashboard statistics for {role}")
-                else:
-                    self.log_result(f"Dashboard Stats {role}", False, "Empty or invalid stats response", str(stats))
-            else:
-                error_msg = response.text if response else "Request failed"
-                self.log_result(f"Dashboard Stats {role}", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+        cache.print_report()
+        rows = cache.rows()
+        cacheable = [row["endpoint"] for row in rows if row["potential_hit_ratio"] >= 0.5]
+        print(f"💡 Endpoints that could be served from cache on most refreshes: {', '.join(cacheable) or 'none'}")
+        self.tester.metrics.add_benchmark("response_cache", rows)
+        return {"passed": len(rows), "failed": failed, "errors": []}
+
+
+def socket_url_for(base_url):
+    """socket.io is attached to the Next.js server root (server.js), not under /api"""
+    return base_url[:-len("/api")] if base_url.rstrip("/").endswith("/api") else base_url
+
+
+class SocketSwarm:
+    """Authenticated socket.io client swarm measuring lib/socket-server.js fan-out.
+
+    Every virtual user connects its four role sockets; each parent opens a private
+    conversation with its teacher, both join the room, and messages are timed from
+    send_message to new_message on every member. School admins then broadcast
+    announcements timed to each socket's `notification`. Latencies land in the
+    shared MetricsRegistry as WS samples, beside the REST endpoints.
+    """
+    def __init__(self, testers, socket_url, metrics, messages_per_user=5, broadcasts=3, message_interval=0.5,
+                 delivery_timeout=10, connect_concurrency=100):
+        self.testers = testers
+        self.socket_url = socket_url
+        self.metrics = metrics
+        self.messages_per_user = messages_per_user
+        self.broadcasts = broadcasts
+        self.message_interval = message_interval
+        self.delivery_timeout = delivery_timeout
+        self.connect_concurrency = connect_concurrency
+        self.clients = {}
+        self.conversations = {}
+        self.probes = {}
+        self.joined = defaultdict(set)
+        self.summary = {}
     
-    def test_role_based_access_control(self):
-        """Test role-based access control"""
-        print("\n=== Testing Role-Based Access Control ===")
-        
-        # Test unauthorized access - student trying to access admin endpoints
-        if "student" in self.tokens:
-            student_token = self.tokens["student"]
-            
-            # Student should not be able to create teachers
-            teacher_data = {"firstName": "Test", "lastName": "Teacher", "email": "test@test.com"}
-            response = self.make_request("POST", "teachers", teacher_data, student_token)
-            
-            if response and response.status_code == 401:
-                self.log_result("RBAC - Student Access Control", True, "Student correctly denied access to create teachers")
-            else:
-                self.log_result("RBAC - Student Access Control", False, f"Student should be denied access but got status {response.status_code if response else 'N/A'}")
+    def prepare_conversations(self):
+        """Create one parent-teacher private conversation per virtual user over REST"""
+        def create(index):
+            tester = self.testers[index]
+            parent_token, teacher_token = tester.tokens.get("parent"), tester.tokens.get("teacher")
+            if not parent_token or not teacher_token:
+                return index, None
+            response = tester.make_request("POST", "chat/conversations", {
+                "type": "private",
+                "participants": [jwt_claims(teacher_token).get("id")]
+            }, parent_token)
+            if response is None or response.status_code != 200:
+                return index, None
+            return index, response.json().get("id")
         
-        # Test teacher access to students (should be allowed for GET)
-        if "teacher" in self.tokens:
-            teacher_token = self.tokens["teacher"]
-            
-            response = self.make_request("GET", "students", token=teacher_token)
-            
-            if response and response.status_code == 200:
-                self.log_result("RBAC - Teacher Student Access", True, "Teacher correctly allowed to view students")
-            else:
-                self.log_result("RBAC - Teacher Student Access", False, f"Teacher should be allowed to view students but got status {response.status_code if response else 'N/A'}")
+        with ThreadPoolExecutor(max_workers=min(len(self.testers), 16) or 1) as executor:
+            for index, conversation_id in executor.map(create, range(len(self.testers))):
+                if conversation_id:
+                    self.conversations[index] = conversation_id
     
-    def test_parent_portal(self):
-        """Test parent portal functionality"""
-        print("\n=== Testing Parent Portal ===")
-        
-        if "parent" not in self.tokens:
-            self.log_result("Parent Portal", False, "Parent token not available")
+    def on_delivery(self, event, key, probe):
+        entry = self.probes.get(probe)
+        if entry is None:
             return
+        self.metrics.record("WS", event, key[1], time.perf_counter() - entry["emitted"], 200)
+        entry["received"] += 1
+        if entry["received"] >= entry["expected"]:
+            entry["done"].set()
+    
+    async def connect_one(self, gate, key, token):
+        client = socketio.AsyncClient(reconnection=False)
+        client.on("new_message", lambda message, key=key: self.on_delivery("new_message", key, message.get("content")))
+        client.on("notification", lambda notification, key=key: self.on_delivery("notification", key, notification.get("title")))
+        client.on("joined_conversation", lambda conversation_id, key=key: self.joined[conversation_id].add(key))
+        async with gate:
+            started = time.perf_counter()
+            try:
+                await client.connect(self.socket_url, auth={"token": token}, transports=["websocket"], wait_timeout=10)
+            except (socketio.exceptions.ConnectionError, asyncio.TimeoutError, OSError):
+                self.metrics.record("WS", "connect", key[1], time.perf_counter() - started)
+                return
+            self.metrics.record("WS", "connect", key[1], time.perf_counter() - started, 101)
+        self.clients[key] = {"client": client, "claims": jwt_claims(token)}
+    
+    def new_probe(self, event, expected):
+        probe = f"probe-{uuid.uuid4().hex}"
+        self.probes[probe] = {"event": event, "emitted": time.perf_counter(), "expected": expected,
+                              "received": 0, "done": asyncio.Event()}
+        return probe
+    
+    async def wait_for(self, probes):
+        pending = [self.probes[probe]["done"].wait() for probe in probes if self.probes[probe]["expected"]]
+        if pending:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), self.delivery_timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def join_conversations(self):
+        for index, conversation_id in self.conversations.items():
+            for role in ("parent", "teacher"):
+                member = self.clients.get((index, role))
+                if member:
+                    await member["client"].emit("join_conversation", conversation_id)
+        deadline = time.monotonic() + self.delivery_timeout
+        while time.monotonic() < deadline:
+            if all(len(self.joined[conversation_id]) >= self.room_size(index)
+                   for index, conversation_id in self.conversations.items()):
+                break
+            await asyncio.sleep(0.05)
+    
+    def room_size(self, index):
+        return sum(1 for role in ("parent", "teacher") if (index, role) in self.clients)
+    
+    async def send_messages(self, index, conversation_id):
+        sent = []
+        members = len(self.joined[conversation_id])
+        for number in range(self.messages_per_user):
+            role = "parent" if number % 2 == 0 else "teacher"
+            sender = self.clients.get((index, role))
+            if not sender or not members:
+                continue
+            probe = self.new_probe("new_message", members)
+            await sender["client"].emit("send_message", {
+                "conversationId": conversation_id,
+                "messageType": "text",
+                "content": probe
+            })
+            sent.append(probe)
+            await asyncio.sleep(self.message_interval)
+        return sent
+    
+    async def broadcast(self):
+        sent = []
+        admins = [(key, member) for key, member in self.clients.items() if key[1] == "admin"]
+        for number in range(self.broadcasts):
+            if not admins:
+                break
+            key, admin = admins[number % len(admins)]
+            school_id = admin["claims"].get("schoolId")
+            # Only sockets in the admin's school receive the announcement
+            expected = sum(1 for member in self.clients.values() if member["claims"].get("schoolId") == school_id)
+            probe = self.new_probe("notification", expected)
+            await admin["client"].emit("broadcast_notification", {
+                "title": probe,
+                "message": "Load test announcement",
+                "targetAudience": ["all"],
+                "priority": "low"
+            })
+            sent.append(probe)
+            await self.wait_for([probe])
+        return sent
+    
+    def completeness(self, event):
+        entries = [entry for entry in self.probes.values() if entry["event"] == event]
+        expected = sum(entry["expected"] for entry in entries)
+        received = sum(min(entry["received"], entry["expected"]) for entry in entries)
+        return received, expected
+    
+    async def run_async(self):
+        gate = asyncio.Semaphore(self.connect_concurrency)
+        rss_before = current_rss_kb()
+        await asyncio.gather(*[
+            self.connect_one(gate, (index, role), token)
+            for index, tester in enumerate(self.testers)
+            for role, token in tester.tokens.items()
+        ])
+        rss_after = current_rss_kb()
+        attempted = sum(len(tester.tokens) for tester in self.testers)
         
-        parent_token = self.tokens["parent"]
+        await self.join_conversations()
+        message_probes = await asyncio.gather(*[
+            self.send_messages(index, conversation_id)
+            for index, conversation_id in self.conversations.items()
+        ])
+        await self.wait_for([probe for probes in message_probes for probe in probes])
+        await self.broadcast()
         
-        # Test Get Parent's Students
-        response = self.make_request("GET", "parent/students", token=parent_token)
+        await asyncio.gather(*[member["client"].disconnect() for member in self.clients.values()],
+                             return_exceptions=True)
         
-        if response and response.status_code == 200:
-            students = response.json()
-            if isinstance(students, list):
-                self.log_result("Parent Students", True, f"Retrieved {len(students)} students for parent")
-            else:
-                self.log_result("Parent Students", False, "Response is not a list", str(students))
-        else:
-            error_msg = response.text if response else "Request failed"
-            self.log_result("Parent Students", False, f"Failed with status {response.status_code if response else 'N/A'}", error_msg)
+        self.summary = {
+            "sockets_attempted": attempted,
+            "sockets_connected": len(self.clients),
+            "conversations": len(self.conversations),
+            "messages": self.completeness("new_message"),
+            "broadcasts": self.completeness("notification"),
+            "client_rss_kb_per_socket": (rss_after - rss_before) / len(self.clients) if self.clients else 0.0
+        }
     
-    def run_all_tests(self):
-        """Run all test suites"""
-        print("🚀 Starting Comprehensive School Management System Backend Tests")
-        print(f"📍 Testing API at: {self.base_url}")
+    def run(self):
+        print(f"🔌 Socket swarm: {len(self.testers)} virtual users against {self.socket_url}")
+        self.prepare_conversations()
+        asyncio.run(self.run_async())
+        
+        summary = self.summary
+        message_received, message_expected = summary["messages"]
+        broadcast_received, broadcast_expected = summary["broadcasts"]
+        print("\n" + "=" * 80)
+        print("🔌 SOCKET FAN-OUT RESULTS")
         print("=" * 80)
+        print(f"🔗 Connected: {summary['sockets_connected']}/{summary['sockets_attempted']} sockets, "
+              f"{summary['conversations']} conversations")
+        print(f"💬 Messages delivered: {message_received}/{message_expected} "
+              f"({message_received / message_expected * 100 if message_expected else 0:.1f}%)")
+        print(f"📣 Broadcast deliveries: {broadcast_received}/{broadcast_expected} "
+              f"({broadcast_received / broadcast_expected * 100 if broadcast_expected else 0:.1f}%)")
+        print(f"🧠 Client memory: {summary['client_rss_kb_per_socket']:.1f} KB RSS per socket")
         
-        # Run tests in logical order
-        self.test_user_registration()
-        self.test_user_login()
-        self.test_auth_me()
-        self.test_student_management()
-        self.test_teacher_management()
-        self.test_class_management()
-        self.test_subject_management()
-        self.test_teacher_assignments()
-        self.test_attendance_management()
-        self.test_notification_system()
-        self.test_dashboard_statistics()
-        self.test_role_based_access_control()
-        self.test_parent_portal()
-        
-        # Print final results
+        self.metrics.add_benchmark("socket_fanout", [{
+            "sockets_attempted": summary["sockets_attempted"],
+            "sockets_connected": summary["sockets_connected"],
+            "conversations": summary["conversations"],
+            "messages_delivered": message_received,
+            "messages_expected": message_expected,
+            "broadcasts_delivered": broadcast_received,
+            "broadcasts_expected": broadcast_expected,
+            "client_rss_kb_per_socket": summary["client_rss_kb_per_socket"]
+        }])
+        failed = (summary["sockets_connected"] < summary["sockets_attempted"]) + \
+                 (message_received < message_expected) + (broadcast_received < broadcast_expected)
+        return {"passed": 3 - failed, "failed": failed, "errors": []}
+
+
+def linear_trend(points):
+    """Least-squares line through (x, y) points as (slope, intercept, r²); None when it cannot be fitted"""
+    if len(points) < 3:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    if not sxx:
+        return None
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    syy = sum((y - mean_y) ** 2 for _, y in points)
+    slope = sxy / sxx
+    # A perfectly flat series is fully explained by its (zero) slope
+    r2 = sxy * sxy / (sxx * syy) if syy else 1.0
+    return slope, mean_y - slope * mean_x, r2
+
+
+def flatten_numbers(value, prefix=""):
+    """Numeric leaves of a JSON document as {"dotted.path": number}"""
+    if isinstance(value, bool):
+        return {}
+    if isinstance(value, (int, float)):
+        return {prefix: value}
+    if isinstance(value, dict):
+        numbers = {}
+        for key, item in value.items():
+            numbers.update(flatten_numbers(item, f"{prefix}.{key}" if prefix else str(key)))
+        return numbers
+    return {}
+
+
+# Metrics endpoint fields that should plateau in a healthy server; the rest (uptime, counters) only get reported
+LEAK_FIELD = re.compile(r"rss|heap|memory|external|buffer|handle|listener|socket|cursor|connection|fd", re.I)
+
+
+class SoakTest:
+    """Hours-long steady-rate run that watches for slow leaks and latency drift.
+
+    The load runner loops the scenarios at a fixed RPS while a churn thread keeps
+    connecting and dropping socket.io clients, exercising the listener setup and
+    teardown in lib/socket-server.js. Every sample interval records that window's
+    latency and errors, the watched process's RSS, open file descriptors and
+    threads, and the numeric fields of an optional metrics endpoint. Series that
+    should plateau are fitted with a least-squares line after warm-up and flagged
+    when they keep growing.
+    """
+    LATENCY_SERIES = ("p50_ms", "p95_ms", "ws_connect_p95_ms")
+    RESOURCE_SERIES = ("rss_kb", "fds", "threads")
+    # linear_trend() needs at least this many points to fit a slope
+    MIN_SAMPLES = 3
+
+    def __init__(self, runner, sample_interval=60, warmup=300, pid="self", metrics_url=None, socket_url=None,
+                 churn_interval=30, churn_sockets=8, growth_threshold=0.2, drift_threshold=0.25, min_r2=0.5):
+        self.runner = runner
+        self.sample_interval = sample_interval
+        self.warmup = warmup
+        self.pid = pid
+        self.metrics_url = metrics_url
+        self.socket_url = socket_url
+        self.churn_interval = churn_interval
+        self.churn_sockets = churn_sockets
+        self.growth_threshold = growth_threshold
+        self.drift_threshold = drift_threshold
+        self.min_r2 = min_r2
+        self.samples = []
+        self.churn = {"cycles": 0, "connected": 0, "failed": 0}
+        self.poller = PooledTransport(pool_size=1)
+        self._rng = random.Random(0)
+        self._stop = threading.Event()
+    
+    def poll_metrics(self):
+        """Numeric fields of the metrics endpoint, sent with an admin token when one is available"""
+        url = self.metrics_url if "://" in self.metrics_url else f"{self.runner.base_url}/{self.metrics_url}"
+        headers = HEADERS.copy()
+        admin = next((tester.tokens["admin"] for tester in list(self.runner.testers) if "admin" in tester.tokens), None)
+        if admin:
+            headers["Authorization"] = f"Bearer {admin}"
+        try:
+            response = self.poller.request("GET", url, headers=headers)
+            return flatten_numbers(response.json()) if response.status_code == 200 else {}
+        except (requests.exceptions.RequestException, ValueError):
+            return {}
+    
+    def sample(self, elapsed, window):
+        histograms, errors = self.runner.metrics.take_interval()
+        http, ws = histograms.get("http"), histograms.get("ws")
+        row = {
+            "t_s": round(elapsed, 1),
+            "requests": http.count if http else 0,
+            "rps": (http.count if http else 0) / window,
+            "errors": errors.get("http", 0),
+            "p50_ms": http.percentile(50) / 1000 if http else None,
+            "p95_ms": http.percentile(95) / 1000 if http else None,
+            "ws_connect_p95_ms": ws.percentile(95) / 1000 if ws else None
+        }
+        row.update(process_usage(self.pid))
+        if self.metrics_url:
+            row.update({f"server.{name}": value for name, value in self.poll_metrics().items()})
+        self.samples.append(row)
+        
+        p95 = "-" if row["p95_ms"] is None else f"{row['p95_ms']:.1f}ms"
+        rss = "-" if row["rss_kb"] is None else f"{row['rss_kb'] / 1024:.1f}MB"
+        print(f"⏲️  {timedelta(seconds=int(elapsed))} | {row['rps']:.1f} req/s | p95 {p95} | errors {row['errors']} | "
+              f"rss {rss} | fds {row['fds'] if row['fds'] is not None else '-'}")
+    
+    async def churn_once(self, tokens):
+        """Connect a handful of sockets, hold them briefly, then drop them all"""
+        clients = []
+        for token in tokens:
+            client = socketio.AsyncClient(reconnection=False)
+            started = time.perf_counter()
+            try:
+                await client.connect(self.socket_url, auth={"token": token}, transports=["websocket"], wait_timeout=10)
+            except (socketio.exceptions.ConnectionError, asyncio.TimeoutError, OSError):
+                self.runner.metrics.record("WS", "connect", "churn", time.perf_counter() - started)
+                self.churn["failed"] += 1
+                continue
+            self.runner.metrics.record("WS", "connect", "churn", time.perf_counter() - started, 101)
+            self.churn["connected"] += 1
+            clients.append(client)
+        await asyncio.sleep(1)
+        await asyncio.gather(*[client.disconnect() for client in clients], return_exceptions=True)
+        self.churn["cycles"] += 1
+    
+    async def churn_loop(self):
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            tokens = [token for tester in list(self.runner.testers) for token in tester.tokens.values()]
+            if tokens:
+                await self.churn_once(self._rng.sample(tokens, min(self.churn_sockets, len(tokens))))
+            await loop.run_in_executor(None, self._stop.wait, self.churn_interval)
+    
+    def series_kind(self, name):
+        if name in self.LATENCY_SERIES:
+            return "latency"
+        if name in self.RESOURCE_SERIES or (name.startswith("server.") and LEAK_FIELD.search(name)):
+            return "resource"
+        return "info"
+    
+    def trends(self):
+        """Fit every numeric series after warm-up; growth is fitted end over fitted start"""
+        steady = [row for row in self.samples if row["t_s"] >= self.warmup]
+        if len(steady) < self.MIN_SAMPLES:
+            # Too short a run to drop the warm-up and still fit a line
+            steady = self.samples
+        names = list(dict.fromkeys(name for row in steady for name in row if name != "t_s"))
+        trends = []
+        for name in names:
+            points = [(row["t_s"] / 3600, row[name]) for row in steady if isinstance(row.get(name), (int, float))]
+            fit = linear_trend(points)
+            if fit is None:
+                continue
+            slope, intercept, r2 = fit
+            start, end = intercept + slope * points[0][0], intercept + slope * points[-1][0]
+            growth = (end - start) / abs(start) if start else None
+            kind = self.series_kind(name)
+            threshold = self.drift_threshold if kind == "latency" else self.growth_threshold
+            trends.append({
+                "series": name,
+                "kind": kind,
+                "samples": len(points),
+                "start": start,
+                "end": end,
+                "slope_per_hour": slope,
+                "growth": growth,
+                "r2": r2,
+                "flagged": kind != "info" and growth is not None and growth > threshold and r2 >= self.min_r2
+            })
+        return trends
+    
+    def print_report(self, trends):
         print("\n" + "=" * 80)
-        print("📊 FINAL TEST RESULTS")
+        print(f"📉 SOAK TRENDS ({len(self.samples)} samples every {self.sample_interval:g}s, "
+              f"first {self.warmup:g}s treated as warm-up)")
         print("=" * 80)
-        print(f"✅ Passed: {self.results['passed']}")
-        print(f"❌ Failed: {self.results['failed']}")
-        print(f"📈 Success Rate: {(self.results['passed'] / (self.results['passed'] + self.results['failed']) * 100):.1f}%")
+        print(f"{'SERIES':<32} {'START':>12} {'END':>12} {'SLOPE/h':>12} {'GROWTH':>8} {'R²':>5}  VERDICT")
+        for trend in trends:
+            growth = "-" if trend["growth"] is None else f"{trend['growth'] * 100:+.1f}%"
+            if trend["kind"] == "info":
+                verdict = "-"
+            elif trend["flagged"]:
+                verdict = "⚠️  leak suspected" if trend["kind"] == "resource" else "⚠️  latency drift"
+            else:
+                verdict = "✅ stable"
+            print(f"{trend['series'][:32]:<32} {trend['start']:>12.1f} {trend['end']:>12.1f} "
+                  f"{trend['slope_per_hour']:>12.2f} {growth:>8} {trend['r2']:>5.2f}  {verdict}")
+        if self.churn["cycles"]:
+            print(f"🔌 Socket churn: {self.churn['cycles']} cycles, {self.churn['connected']} connects, "
+                  f"{self.churn['failed']} failed")
+    
+    def run(self):
+        print(f"🧯 Soak test: sampling every {self.sample_interval:g}s, pid={self.pid}"
+              f"{f', metrics from {self.metrics_url}' if self.metrics_url else ''}"
+              f"{f', socket churn every {self.churn_interval:g}s' if self.socket_url else ''}")
+        self.runner.metrics.take_interval()
+        churner = None
+        if self.socket_url and self.churn_interval:
+            churner = threading.Thread(target=lambda: asyncio.run(self.churn_loop()), daemon=True)
+            churner.start()
         
-        if self.results["errors"]:
-            print(f"\n🔍 DETAILED ERROR SUMMARY:")
-            for i, error in enumerate(self.results["errors"], 1):
-                print(f"{i}. {error}")
+        started = last = time.monotonic()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.runner.run)
+            while not wait([future], timeout=max(last + self.sample_interval - time.monotonic(), 0)).done:
+                now = time.monotonic()
+                self.sample(now - started, now - last)
+                last = now
+            load = future.result()
+        # The last partial window still holds latency and RSS the trend fit needs
+        now = time.monotonic()
+        if now > last:
+            self.sample(now - started, now - last)
+        self._stop.set()
+        if churner:
+            churner.join(timeout=15)
+        self.poller.close()
         
-        return self.results
+        trends = self.trends()
+        self.print_report(trends)
+        self.runner.metrics.add_benchmark("soak_samples", self.samples)
+        self.runner.metrics.add_benchmark("soak_trends", trends)
+        flagged = [trend for trend in trends if trend["flagged"]]
+        checked = [trend for trend in trends if trend["kind"] != "info"]
+        errors = [f"Soak: {trend['series']} grew {trend['growth'] * 100:.1f}% (R²={trend['r2']:.2f})"
+                  for trend in flagged]
+        if len(self.samples) < self.MIN_SAMPLES:
+            # No slope could be fitted, so the run says nothing about leaks or drift
+            errors.append(f"Soak: only {len(self.samples)} sample(s), {self.MIN_SAMPLES} needed for a trend; "
+                          f"lengthen --duration or shorten --sample-interval")
+            print(f"⚠️  {errors[-1]}")
+        return {
+            "passed": load["passed"] + len(checked) - len(flagged),
+            "failed": load["failed"] + len(errors),
+            "errors": load["errors"] + errors
+        }
 
-if __name__ == "__main__":
-    tester = SchoolManagementTester()
-    results = tester.run_all_tests()
+
+def int_list(value):
+    """argparse type for comma-separated integers"""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def build_cache(args):
+    if not args.cache and args.mode != "cache-report":
+        return None
+    return ResponseCache(max_entries=args.cache_size, default_ttl=args.cache_ttl)
+
+
+def build_token_store(args):
+    return TokenStore(args.token_store) if args.token_store else None
+
+
+def build_tester(args, pool_size=0):
+    """Authenticated, quiet tester on a fresh pooled transport for the benchmark modes"""
+    transport = PooledTransport(pool_size=max(args.pool_size, pool_size), keep_alive=not args.no_keep_alive)
+    tester = SchoolManagementTester(base_url=args.base_url, transport=transport, verbose=False, cache=build_cache(args),
+                                    token_store=build_token_store(args))
+    tester.authenticate()
+    return tester
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="School Management System backend tests")
+    parser.add_argument("--base-url", default=BASE_URL, help="API base URL")
+    parser.add_argument("--mode", choices=["functional", "load", "seed", "bench-attendance", "bench-pagination",
+                                           "bench-dashboard", "bench-search", "bench-reports", "stream", "cache-report",
+                                           "bench-chat", "bench-gamification", "bench-uploads", "webhook-replay", "replay", "bench-auth",
+                                           "standin", "socket-load", "soak"],
+                        default="functional",
+                        help="functional: run each test once; load: run scenarios with concurrent virtual users; "
+                             "seed: fill the admin's school with generated data; "
+                             "bench-attendance: sweep attendance/bulk batch size and concurrency; "
+                             "bench-pagination: walk list endpoints with limit/skip; "
+                             "bench-dashboard: time dashboard and school-stats queries as seeded data grows; "
+                             "bench-search: seed (or resume seeding), then replay a search corpus against api/search; "
+                             "bench-reports: time attendance and payment reports across ranges and concurrency; "
+                             "bench-chat: grow chat histories with message bursts and time sends, history and unread; "
+                             "bench-gamification: concurrent point awards against leaderboard polling as the school grows; "
+                             "bench-uploads: stream multipart files to storage/upload across sizes and concurrency; "
+                             "webhook-replay: burst signed Paystack webhooks with duplicates and reordering; "
+                             "replay: seed, then replay an anonymised access log with its original pacing; "
+                             "bench-auth: login storms, auth/me under concurrency, session listing/revocation, bcrypt share; "
+                             "stream: parse whole collections incrementally and report counts, checksums and RSS; "
+                             "cache-report: measure cache hit ratios for a dashboard refresh workload; "
+                             "standin: serve the in-memory stand-in API until interrupted; "
+                             "socket-load: socket.io fan-out swarm (needs python-socketio); "
+                             "soak: long steady-rate load with socket churn and leak/drift trend detection")
+    parser.add_argument("--standin", action="store_true",
+                        help="Start the in-memory stand-in API (standin_api.py) in-process and test against it "
+                             "(no network). Every stand-in route runs under one global lock, so concurrency "
+                             "benchmarks against it measure that lock, not the real server")
+    parser.add_argument("--standin-port", type=int, default=0, help="Stand-in port (0 = any free port)")
+    parser.add_argument("--standin-latency", type=float, default=0, help="Milliseconds the stand-in sleeps per request")
+    parser.add_argument("--standin-jitter", type=float, default=0, help="Extra random 0..N milliseconds per request")
+    parser.add_argument("--standin-hash-iterations", type=int, default=1000,
+                        help="PBKDF2 iterations the stand-in spends per password hash (raise to mimic bcrypt's cost)")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE, help="Connections kept per host")
+    parser.add_argument("--no-keep-alive", action="store_true", help="Open a new connection for every request")
     
-    # Exit with appropriate code
-    sys.exit(0 if results["failed"] == 0 else 1)
\ No newline at end of file
+    parser.add_argument("--cache", action="store_true", help="Serve repeated GETs through the client-side response cache")
+    parser.add_argument("--cache-size", type=int, default=256, help="Maximum cached responses (LRU)")
+    parser.add_argument("--cache-ttl", type=float, default=0,
+                        help="Seconds to treat responses without caching headers as fresh (simulates a server cache)")
+    parser.add_argument("--token-store", metavar="PATH", nargs="?", const=TOKEN_STORE_PATH,
+                        help=f"Cache JWTs on disk between runs (default path: {TOKEN_STORE_PATH})")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="functional mode: independent tests run in parallel on this many threads (1 = sequential)")
+    parser.add_argument("--scenario-file", metavar="PATH",
+                        help="JSON scenarios to run instead of the built-in tests (functional and load modes)")
+    baseline = parser.add_argument_group("performance baselines")
+    baseline.add_argument("--baseline", metavar="PATH",
+                          help="JSON-lines baseline store: compare this run's endpoint latencies against it, then append "
+                               "them; exits with status 2 on a significant p95 regression")
+    baseline.add_argument("--baseline-label", help="Key runs are compared under (default: --mode)")
+    baseline.add_argument("--baseline-runs", type=int, default=5, help="Most recent runs pooled as the baseline")
+    baseline.add_argument("--regression-threshold", type=float, default=0.10,
+                          help="Relative p95 increase that counts as a regression (0.10 = 10%%)")
+    baseline.add_argument("--alpha", type=float, default=0.05, help="Mann-Whitney significance level")
+    baseline.add_argument("--min-samples", type=int, default=5,
+                          help="Samples needed on each side before an endpoint can be judged")
+    baseline.add_argument("--no-record", action="store_true", help="Compare against the baseline without appending")
+    parser.add_argument("--export-json", metavar="PATH", help="Write per-endpoint latency percentiles as JSON")
+    parser.add_argument("--export-csv", metavar="PATH", help="Write per-endpoint latency percentiles as CSV")
+    
+    load = parser.add_argument_group("load mode")
+    load.add_argument("--users", type=int, default=10, help="Number of virtual users")
+    load.add_argument("--engine", choices=["thread", "asyncio"], default="thread",
+                      help="thread: one OS thread per virtual user; asyncio: all users as coroutines on one aiohttp "
+                           "session (needs aiohttp)")
+    load.add_argument("--rps", type=float, default=0, help="Target requests/sec across all users (0 = unthrottled)")
+    load.add_argument("--ramp-up", type=float, default=0, help="Seconds over which virtual users are started")
+    load.add_argument("--duration", type=float, default=60, help="Seconds to run once ramp-up completes")
+    load.add_argument("--account-prefix", help="Stable tag for virtual user accounts (default: random per run, "
+                                               "or 'load' with --token-store so accounts are reused)")
+    load.add_argument("--warm-concurrency", type=int, default=16, help="Parallel logins when warming the token store")
+    
+    seed = parser.add_argument_group("seed mode")
+    seed.add_argument("--seed", type=int, default=42, help="RNG seed; equal seeds generate identical data")
+    seed.add_argument("--classes", type=int, default=12)
+    seed.add_argument("--subjects", type=int, default=10)
+    seed.add_argument("--teachers", type=int, default=30)
+    seed.add_argument("--students", type=int, default=600)
+    seed.add_argument("--parents", type=int, default=400)
+    seed.add_argument("--attendance-days", type=int, default=60, help="School days of attendance from --term-start")
+    seed.add_argument("--term-start", default=SEED_TERM_START, help="First day of attendance (YYYY-MM-DD)")
+    seed.add_argument("--batch-size", type=int, default=50, help="Requests per checkpointed batch")
+    seed.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once")
+    seed.add_argument("--seed-state", default=SEED_STATE_PATH, help="Checkpoint file used to resume seeding")
+    
+    bulk = parser.add_argument_group("bench-attendance mode")
+    bulk.add_argument("--batch-sizes", type=int_list, default=[10, 50, 100, 500, 1000, 5000],
+                      help="Comma-separated attendanceList sizes")
+    bulk.add_argument("--concurrency-levels", type=int_list, default=[1, 4, 16],
+                      help="Comma-separated numbers of concurrent submitters")
+    bulk.add_argument("--requests-per-point", type=int, default=20, help="Requests sent at each sweep point")
+    
+    paging = parser.add_argument_group("bench-pagination mode")
+    paging.add_argument("--page-size", type=int, default=50, help="limit used for each page")
+    paging.add_argument("--max-pages", type=int, default=1000, help="Stop an endpoint scan after this many pages")
+    paging.add_argument("--paged-endpoints", type=lambda value: value.split(","), default=list(PAGED_ENDPOINTS),
+                        help="Comma-separated endpoints to scan")
+    
+    scaling = parser.add_argument_group("bench-dashboard mode (also uses --seed, --batch-size, --concurrency)")
+    scaling.add_argument("--scales", type=int_list, default=[1, 10, 100],
+                         help="Comma-separated multiples of the base dataset to seed and measure")
+    scaling.add_argument("--samples", type=int, default=20, help="Requests timed per query at each scale")
+    scaling.add_argument("--scale-days", type=int, default=5, help="School days of attendance seeded per scale")
+    scaling.add_argument("--growth-threshold", type=float, default=1.1,
+                         help="Flag queries whose latency grows faster than records^k")
+    scaling.add_argument("--developer-email", default=DEVELOPER_USER["email"],
+                         help="Developer account for the developer dashboard (created via auth/setup if none exists)")
+    scaling.add_argument("--developer-password", default=DEVELOPER_USER["password"], help="Developer account password")
+    
+    search = parser.add_argument_group("bench-search mode (seeds with the seed mode options first)")
+    search.add_argument("--queries-per-kind", type=int, default=8,
+                        help="Names, admission numbers, classes and typos sampled per query kind")
+    search.add_argument("--search-limit", type=int, default=50, help="limit sent with every search")
+    
+    reports = parser.add_argument_group("bench-reports mode (also uses --concurrency-levels, --requests-per-point)")
+    reports.add_argument("--report-start", default=SEED_TERM_START,
+                         help="First day of every report date range (YYYY-MM-DD)")
+    reports.add_argument("--report-ranges", type=lambda value: value.split(","), default=list(REPORT_RANGES),
+                         help=f"Comma-separated ranges from {', '.join(REPORT_RANGES)}")
+    reports.add_argument("--report-types", type=lambda value: value.split(","), default=["summary", "detailed", "class"],
+                         help="Comma-separated reports/attendance types")
+    
+    chat = parser.add_argument_group("bench-chat mode (also uses --concurrency, --samples, --page-size, "
+                                     "--growth-threshold)")
+    chat.add_argument("--conversations", type=int, default=10,
+                      help="Conversations to grow: the parent-teacher chat plus admin group chats")
+    chat.add_argument("--history-lengths", type=int_list, default=[10, 100, 1000],
+                      help="Comma-separated messages per conversation to measure at")
+    
+    gamification = parser.add_argument_group("bench-gamification mode (also uses --concurrency, --samples, "
+                                             "--growth-threshold, --seed)")
+    gamification.add_argument("--school-sizes", type=int_list, default=[100, 1000, 5000],
+                              help="Comma-separated students in the points table at each step")
+    gamification.add_argument("--awards-per-student", type=int, default=3,
+                              help="Awards each student earns per rush (attendance first)")
+    gamification.add_argument("--award-points", type=int, default=40, help="Points per award")
+    gamification.add_argument("--pollers", type=int, default=4, help="Threads polling the leaderboard during a rush")
+    gamification.add_argument("--verify-users", type=int, default=200,
+                              help="Students read back to check totalPoints and achievements")
+    
+    uploads = parser.add_argument_group("bench-uploads mode (also uses --concurrency-levels, --requests-per-point)")
+    uploads.add_argument("--upload-sizes", type=int_list, default=[100, 1024, 5120, 10240, 12288],
+                         help="Comma-separated file sizes in KB")
+    uploads.add_argument("--upload-file", metavar="PATH",
+                         help="Memory-map this file and upload its first N KB instead of generated content")
+    uploads.add_argument("--upload-type", default="image/jpeg", help="MIME type of the file part")
+    uploads.add_argument("--upload-file-type", default="image", help="fileType form field (image, document, general)")
+    uploads.add_argument("--keep-uploads", action="store_true", help="Do not delete uploaded files after each point")
+    uploads.add_argument("--upload-limit-kb", type=int, default=10240,
+                         help="Server's upload size limit; rejections at or below it count as failures")
+    
+    webhooks = parser.add_argument_group("webhook-replay mode (also uses --seed)")
+    webhooks.add_argument("--paystack-secret", default=os.environ.get("PAYSTACK_SECRET_KEY"),
+                          help="Secret the events are signed with (default: $PAYSTACK_SECRET_KEY, or the stand-in's)")
+    webhooks.add_argument("--burst-rates", type=int_list, default=[10, 50, 200], help="Comma-separated events/s per pass")
+    webhooks.add_argument("--webhook-payments", type=int, default=100, help="Pending payments settled per synthetic pass")
+    webhooks.add_argument("--webhook-events", metavar="PATH",
+                          help="JSON-lines file of recorded Paystack events to replay instead of a synthetic stream")
+    webhooks.add_argument("--retry-rate", type=float, default=0.2, help="Share of payments that fail before succeeding")
+    webhooks.add_argument("--reorder-rate", type=float, default=0.5,
+                          help="Share of those retries delivered success-first")
+    webhooks.add_argument("--duplicate-rate", type=float, default=0.1, help="Share of events redelivered later")
+    webhooks.add_argument("--forged-rate", type=float, default=0.02, help="Extra events sent with a bad signature")
+    webhooks.add_argument("--ack-timeout", type=float, default=5.0,
+                          help="Acks slower than this many seconds count as provider retries")
+    webhooks.add_argument("--webhook-concurrency", type=int, default=64, help="Deliveries in flight at most")
+    
+    replay = parser.add_argument_group("replay mode (seeds with the seed mode options first)")
+    replay.add_argument("--access-log", metavar="PATH",
+                        help="Access log to replay: JSON lines, CSV with a header row, or common/combined log format")
+    replay.add_argument("--time-compression", type=float, default=1.0,
+                        help="Replay this many times faster than the log's own inter-arrival times")
+    replay.add_argument("--replay-window", metavar="HH:MM-HH:MM",
+                        help="Only replay requests logged within this time of day, e.g. 07:30-08:15")
+    replay.add_argument("--replay-limit", type=int, default=0, help="Replay at most this many requests (0 = all)")
+    replay.add_argument("--replay-concurrency", type=int, default=64, help="Requests in flight at most")
+    replay.add_argument("--default-role", default="admin", help="Role for log lines that do not record one")
+    replay.add_argument("--anonymise-salt",
+                        help="Salt for id/text pseudonyms (default: random per run); fix it to repeat a mapping")
+    replay.add_argument("--anonymise-to", metavar="PATH",
+                        help="Write the anonymised log as JSON lines and exit without replaying")
+    
+    auth = parser.add_argument_group("bench-auth mode (also uses --concurrency-levels, --requests-per-point, "
+                                     "--samples, --growth-threshold)")
+    auth.add_argument("--storm-sizes", type=int_list, default=[10, 50, 200],
+                      help="Comma-separated numbers of users logging in at the same moment")
+    auth.add_argument("--session-counts", type=int_list, default=[10, 100, 1000],
+                      help="Comma-separated active-session counts to time listing and revocation at")
+    auth.add_argument("--login-target", type=float, default=5.0,
+                      help="Seconds the largest storm should finish in, for the worker-count estimate")
+    auth.add_argument("--bcrypt-rounds", type=int, default=10,
+                      help="bcrypt cost of the stored hashes (for the local reference timing)")
+    
+    streaming = parser.add_argument_group("stream mode")
+    streaming.add_argument("--stream-targets", type=lambda value: value.split(","),
+                           default=["students", "teachers", "parents", "attendance"],
+                           help="Comma-separated endpoints, or endpoint:key.path for arrays inside an object")
+    streaming.add_argument("--stream-limit", type=int, default=1_000_000, help="limit sent with list endpoints")
+    streaming.add_argument("--compare-buffered", action="store_true",
+                           help="Also parse each response with response.json() to compare RSS and checksums")
+    
+    cache = parser.add_argument_group("cache-report mode")
+    cache.add_argument("--refreshes", type=int, default=20, help="Dashboard refreshes to replay")
+    cache.add_argument("--refresh-interval", type=float, default=0, help="Seconds between refreshes")
+    
+    sockets = parser.add_argument_group("socket-load mode (uses --users virtual users, 4 sockets each)")
+    sockets.add_argument("--socket-url", help="socket.io server URL (default: --base-url without /api)")
+    sockets.add_argument("--messages-per-user", type=int, default=5, help="Chat messages per conversation")
+    sockets.add_argument("--message-interval", type=float, default=0.5, help="Seconds between a conversation's messages")
+    sockets.add_argument("--broadcasts", type=int, default=3, help="School-wide announcements to broadcast")
+    sockets.add_argument("--delivery-timeout", type=float, default=10, help="Seconds to wait for deliveries")
+    sockets.add_argument("--connect-concurrency", type=int, default=100, help="Socket handshakes in flight at once")
+    
+    soak = parser.add_argument_group("soak mode (also uses the load mode options and --socket-url)")
+    soak.add_argument("--sample-interval", type=float, default=60, help="Seconds between trend samples")
+    soak.add_argument("--soak-warmup", type=float, default=300, help="Seconds of samples left out of the trend fit")
+    soak.add_argument("--watch-pid", default="self",
+                      help="Local process whose RSS, fds and threads are sampled, e.g. the node server "
+                           "(default: this process)")
+    soak.add_argument("--metrics-url", help="JSON endpoint (URL, or path under --base-url) whose numeric fields are "
+                                            "sampled; heap/rss/handle/listener/cursor/connection fields are checked")
+    soak.add_argument("--churn-interval", type=float, default=30,
+                      help="Seconds between socket connect/disconnect cycles (0 = no churn)")
+    soak.add_argument("--churn-sockets", type=int, default=8, help="Sockets opened per churn cycle")
+    soak.add_argument("--leak-threshold", type=float, default=0.2,
+                      help="Fitted growth of a resource series over the run that counts as a leak (0.2 = 20%%)")
+    soak.add_argument("--drift-threshold", type=float, default=0.25,
+                      help="Fitted growth of window p50/p95 latency over the run that counts as drift")
+    soak.add_argument("--min-r2", type=float, default=0.5,
+                      help="Only flag series whose linear fit explains at least this much variance")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    standin = None
+    if args.standin or args.mode == "standin":
+        # Only needed offline, so runs against a real server never import it
+        from standin_api import StandInServer
+        standin = StandInServer(
+            port=args.standin_port,
+            latency=args.standin_latency / 1000,
+            jitter=args.standin_jitter / 1000,
+            hash_iterations=args.standin_hash_iterations,
+            search_fields=SEARCH_FIELDS
+        ).start()
+        args.base_url = standin.base_url
+        print(f"🧪 Stand-in API listening at {standin.base_url}")
+    
+    if args.mode == "standin":
+        try:
+            standin.thread.join()
+        except KeyboardInterrupt:
+            standin.stop()
+        return
+    
+    if args.mode in ("load", "soak") and args.engine == "asyncio" and aiohttp is None:
+        print("❌ The asyncio engine needs aiohttp: pip install aiohttp")
+        sys.exit(1)
+    
+    if args.mode == "load":
+        runner = LoadTestRunner(
+            base_url=args.base_url,
+            users=args.users,
+            engine=args.engine,
+            rps=args.rps,
+            ramp_up=args.ramp_up,
+            duration=args.duration,
+            pool_size=args.pool_size,
+            keep_alive=not args.no_keep_alive,
+            cache=build_cache(args),
+            token_store=build_token_store(args),
+            account_prefix=args.account_prefix or ("load" if args.token_store else None),
+            warm_concurrency=args.warm_concurrency,
+            scenarios=load_scenarios(args.scenario_file) if args.scenario_file else None
+        )
+        results = runner.run()
+        metrics = runner.metrics
+    elif args.mode == "seed":
+        tester = build_tester(args, args.concurrency)
+        if "admin" not in tester.tokens:
+            print("❌ Seeding needs an admin token")
+            sys.exit(1)
+        seeder = SeedDataGenerator(
+            tester,
+            tester.tokens["admin"],
+            seed=args.seed,
+            classes=args.classes,
+            subjects=args.subjects,
+            teachers=args.teachers,
+            students=args.students,
+            parents=args.parents,
+            attendance_days=args.attendance_days,
+            term_start=args.term_start,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            state_path=args.seed_state
+        )
+        results = seeder.run()
+        metrics = tester.metrics
+        metrics.print_report()
+        tester.transport.close()
+    elif args.mode == "bench-attendance":
+        tester = build_tester(args, max(args.concurrency_levels))
+        token = tester.tokens.get("teacher") or tester.tokens.get("admin")
+        if not token:
+            print("❌ The attendance benchmark needs a teacher or admin token")
+            sys.exit(1)
+        benchmark = BulkAttendanceBenchmark(
+            tester,
+            token,
+            batch_sizes=args.batch_sizes,
+            concurrency_levels=args.concurrency_levels,
+            requests_per_point=args.requests_per_point
+        )
+        results = benchmark.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "bench-pagination":
+        tester = build_tester(args)
+        benchmark = PaginationBenchmark(
+            tester,
+            endpoints={endpoint: PAGED_ENDPOINTS.get(endpoint, "admin") for endpoint in args.paged_endpoints},
+            page_size=args.page_size,
+            max_pages=args.max_pages
+        )
+        results = benchmark.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "bench-dashboard":
+        tester = build_tester(args, args.concurrency)
+        benchmark = DashboardScaleBenchmark(
+            tester,
+            scales=args.scales,
+            attendance_days=args.scale_days,
+            samples=args.samples,
+            seed=args.seed,
+            growth_threshold=args.growth_threshold,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            # A stand-in starts empty, so checkpoints from an earlier run would skip seeding it
+            state_prefix=None if args.standin else "seed_state_dashboard",
+            developer={**DEVELOPER_USER, "email": args.developer_email, "password": args.developer_password}
+        )
+        results = benchmark.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "bench-search":
+        tester = build_tester(args, args.concurrency)
+        if "admin" not in tester.tokens:
+            print("❌ The search benchmark needs an admin token")
+            sys.exit(1)
+        seeder = SeedDataGenerator(
+            tester,
+            tester.tokens["admin"],
+            seed=args.seed,
+            classes=args.classes,
+            subjects=args.subjects,
+            teachers=args.teachers,
+            students=args.students,
+            parents=args.parents,
+            attendance_days=args.attendance_days,
+            term_start=args.term_start,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            # A stand-in starts empty, so a checkpoint from an earlier run would skip seeding it
+            state_path=None if args.standin else args.seed_state
+        )
+        seeder.run()
+        benchmark = SearchBenchmark(tester, seeder, queries_per_kind=args.queries_per_kind, limit=args.search_limit,
+                                    seed=args.seed)
+        results = benchmark.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "bench-reports":
+        tester = build_tester(args, max(args.concurrency_levels))
+        benchmark = ReportBenchmark(
+            tester,
+            start=args.report_start,
+            ranges={name: REPORT_RANGES[name] for name in args.report_ranges},
+            concurrency_levels=args.concurrency_levels,
+            requests_per_point=args.requests_per_point,
+            report_types=args.report_types
+        )
+        results = benchmark.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "bench-chat":
+        tester = build_tester(args, args.concurrency)
+        benchmark = ChatBenchmark(
+            tester,
+            conversations=args.conversations,
+            history_lengths=args.history_lengths,
+            concurrency=args.concurrency,
+            page_size=args.page_size,
+            samples=args.samples,
+            growth_threshold=args.growth_threshold
+        )
+        results = benchmark.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "bench-gamification":
+        tester = build_tester(args, args.concurrency + args.pollers)
+        benchmark = GamificationBenchmark(
+            tester,
+            school_sizes=args.school_sizes,
+            awards_per_student=args.awards_per_student,
+            points=args.award_points,
+            concurrency=args.concurrency,
+            pollers=args.pollers,
+            samples=args.samples,
+            verify_users=args.verify_users,
+            growth_threshold=args.growth_threshold,
+            seed=args.seed
+        )
+        results = benchmark.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "bench-uploads":
+        tester = build_tester(args, max(args.concurrency_levels))
+        benchmark = UploadBenchmark(
+            tester,
+            sizes_kb=args.upload_sizes,
+            concurrency_levels=args.concurrency_levels,
+            uploads_per_point=args.requests_per_point,
+            path=args.upload_file,
+            content_type=args.upload_type,
+            file_type=args.upload_file_type,
+            cleanup=not args.keep_uploads,
+            seed=args.seed,
+            limit_kb=args.upload_limit_kb
+        )
+        results = benchmark.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "webhook-replay":
+        secret = args.paystack_secret or (standin.api.paystack_secret if standin else None)
+        if not secret:
+            print("❌ Webhook replay needs the Paystack secret: --paystack-secret or $PAYSTACK_SECRET_KEY")
+            sys.exit(1)
+        tester = build_tester(args, args.webhook_concurrency)
+        replay = WebhookReplay(
+            tester,
+            secret,
+            rates=args.burst_rates,
+            payments=args.webhook_payments,
+            retry_rate=args.retry_rate,
+            reorder_rate=args.reorder_rate,
+            duplicate_rate=args.duplicate_rate,
+            forged_rate=args.forged_rate,
+            ack_timeout=args.ack_timeout,
+            concurrency=args.webhook_concurrency,
+            events_path=args.webhook_events,
+            seed=args.seed
+        )
+        results = replay.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "replay":
+        if not args.access_log:
+            print("❌ Replay needs --access-log")
+            sys.exit(1)
+        records, unparsed = read_access_log(args.access_log, args.default_role)
+        print(f"📜 Read {len(records)} requests from {args.access_log} ({unparsed} unparseable lines skipped)")
+        if args.anonymise_to:
+            AccessLogAnonymiser(args.anonymise_salt).write(records, args.anonymise_to)
+            print(f"🕶️  Anonymised log written to {args.anonymise_to}")
+            if standin:
+                standin.stop()
+            sys.exit(0)
+        tester = build_tester(args, args.replay_concurrency)
+        if "admin" not in tester.tokens:
+            print("❌ Replay needs an admin token to seed the entities it maps ids onto")
+            sys.exit(1)
+        seeder = SeedDataGenerator(
+            tester,
+            tester.tokens["admin"],
+            seed=args.seed,
+            classes=args.classes,
+            subjects=args.subjects,
+            teachers=args.teachers,
+            students=args.students,
+            parents=args.parents,
+            attendance_days=args.attendance_days,
+            term_start=args.term_start,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            state_path=None if args.standin else args.seed_state
+        )
+        seeder.run()
+        replay = TrafficReplay(
+            tester,
+            seeder,
+            records,
+            compression=args.time_compression,
+            window=args.replay_window.split("-", 1) if args.replay_window else None,
+            limit=args.replay_limit,
+            concurrency=args.replay_concurrency,
+            salt=args.anonymise_salt,
+            seed=args.seed
+        )
+        results = replay.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "bench-auth":
+        tester = build_tester(args, max([*args.storm_sizes, *args.concurrency_levels]))
+        benchmark = AuthBenchmark(
+            tester,
+            storm_sizes=args.storm_sizes,
+            concurrency_levels=args.concurrency_levels,
+            requests_per_point=args.requests_per_point,
+            session_counts=args.session_counts,
+            samples=args.samples,
+            login_target=args.login_target,
+            bcrypt_rounds=args.bcrypt_rounds,
+            growth_threshold=args.growth_threshold
+        )
+        results = benchmark.run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "stream":
+        tester = build_tester(args)
+        results = StreamingListCheck(tester, targets=args.stream_targets, limit=args.stream_limit,
+                                     compare_buffered=args.compare_buffered).run()
+        metrics = tester.metrics
+        tester.transport.close()
+    elif args.mode == "socket-load":
+        if socketio is None:
+            print("❌ Socket load testing needs python-socketio: pip install 'python-socketio[asyncio_client]'")
+            sys.exit(1)
+        runner = LoadTestRunner(
+            base_url=args.base_url,
+            users=args.users,
+            pool_size=args.pool_size,
+            keep_alive=not args.no_keep_alive,
+            token_store=build_token_store(args),
+            account_prefix=args.account_prefix or ("load" if args.token_store else None),
+            warm_concurrency=args.warm_concurrency
+        )
+        runner.warm_tokens()
+        swarm = SocketSwarm(
+            [runner.prepared[index] for index in range(args.users)],
+            args.socket_url or socket_url_for(args.base_url),
+            runner.metrics,
+            messages_per_user=args.messages_per_user,
+            broadcasts=args.broadcasts,
+            message_interval=args.message_interval,
+            delivery_timeout=args.delivery_timeout,
+            connect_concurrency=args.connect_concurrency
+        )
+        results = swarm.run()
+        metrics = runner.metrics
+        metrics.print_report()
+        runner.transport.close()
+    elif args.mode == "soak":
+        runner = LoadTestRunner(
+            base_url=args.base_url,
+            users=args.users,
+            engine=args.engine,
+            rps=args.rps,
+            ramp_up=args.ramp_up,
+            duration=args.duration,
+            pool_size=args.pool_size,
+            keep_alive=not args.no_keep_alive,
+            cache=build_cache(args),
+            token_store=build_token_store(args),
+            account_prefix=args.account_prefix or ("load" if args.token_store else None),
+            warm_concurrency=args.warm_concurrency,
+            scenarios=load_scenarios(args.scenario_file) if args.scenario_file else None
+        )
+        socket_url = None
+        if args.churn_interval and not args.standin:
+            if socketio is None:
+                print("⚠️  python-socketio is not installed; soaking without socket churn")
+            else:
+                socket_url = args.socket_url or socket_url_for(args.base_url)
+        results = SoakTest(
+            runner,
+            sample_interval=args.sample_interval,
+            warmup=args.soak_warmup,
+            pid=args.watch_pid,
+            metrics_url=args.metrics_url,
+            socket_url=socket_url,
+            churn_interval=args.churn_interval,
+            churn_sockets=args.churn_sockets,
+            growth_threshold=args.leak_threshold,
+            drift_threshold=args.drift_threshold,
+            min_r2=args.min_r2
+        ).run()
+        metrics = runner.metrics
+    elif args.mode == "cache-report":
+        tester = build_tester(args)
+        results = CacheReport(tester, refreshes=args.refreshes, interval=args.refresh_interval).run()
+        metrics = tester.metrics
+        tester.transport.close()
+    else:
+        transport = PooledTransport(pool_size=args.pool_size, keep_alive=not args.no_keep_alive)
+        tester = SchoolManagementTester(base_url=args.base_url, transport=transport, cache=build_cache(args),
+                                        token_store=build_token_store(args))
+        if args.scenario_file:
+            results = tester.run_scenarios(load_scenarios(args.scenario_file))
+        else:
+            results = tester.run_all_tests(workers=args.workers)
+        metrics = tester.metrics
+        transport.close()
+    
+    if args.export_json:
+        metrics.export_json(args.export_json)
+    if args.export_csv:
+        metrics.export_csv(args.export_csv)
+    if standin:
+        standin.stop()
+    
+    regressions = []
+    if args.baseline:
+        store = BaselineStore(args.baseline)
+        entries = store.snapshot(metrics, args.baseline_label or args.mode, args.base_url)
+        comparison = store.compare(entries, runs=args.baseline_runs, threshold=args.regression_threshold,
+                                   alpha=args.alpha, min_samples=args.min_samples)
+        store.print_comparison(comparison, args.regression_threshold)
+        regressions = [row["key"] for row in comparison if row["status"] == "regression"]
+        if regressions:
+            print(f"🔥 p95 regressed on {len(regressions)} endpoint(s): {', '.join(regressions)}")
+        if not args.no_record:
+            store.append(entries)
+    
+    # Exit with appropriate code: 1 for failed checks, 2 for performance regressions
+    if results["failed"]:
+        sys.exit(1)
+    sys.exit(2 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
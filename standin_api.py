@@ -0,0 +1,1204 @@
+"""
+In-memory stand-in for the Next.js API (app/api/[[...path]]/route.js).
+
+backend_test.py starts it with --standin (or --mode standin) so the functional
+suite and the benchmarks run without network access. Every route runs under
+StandInAPI's single lock, so concurrency numbers measured against it describe
+that lock rather than the real server.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+def read_multipart(stream, length, content_type, block=64 * 1024):
+    """Parse a multipart/form-data body off a socket without holding file parts.
+
+    Returns {field: value} for plain fields and {field: {"filename", "type", "size",
+    "sha256"}} for files.
+    """
+    boundary = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not boundary:
+        raise ValueError("multipart body without a boundary")
+    delimiter = b"\r\n--" + boundary.group(1).encode()
+    form = {}
+    # A leading CRLF lets the first boundary match the same delimiter as the rest
+    buffer, remaining = b"\r\n", length
+    part, headers_done = None, False
+
+    def fill():
+        nonlocal buffer, remaining
+        if remaining <= 0:
+            return False
+        chunk = stream.read(min(block, remaining))
+        remaining -= len(chunk)
+        buffer += chunk
+        return bool(chunk)
+
+    while True:
+        if part is None:
+            at = buffer.find(delimiter)
+            if at < 0:
+                if not fill():
+                    raise ValueError("multipart body is missing its closing boundary")
+                continue
+            buffer = buffer[at + len(delimiter):]
+            while len(buffer) < 2 and fill():
+                pass
+            if buffer.startswith(b"--"):
+                return form
+            part, headers_done = {"value": bytearray(), "size": 0, "digest": hashlib.sha256()}, False
+        if not headers_done:
+            end = buffer.find(b"\r\n\r\n")
+            if end < 0:
+                if not fill():
+                    raise ValueError("truncated multipart headers")
+                continue
+            headers = buffer[:end].decode("utf-8", "replace")
+            buffer = buffer[end + 4:]
+            name = re.search(r'name="([^"]*)"', headers)
+            filename = re.search(r'filename="([^"]*)"', headers)
+            kind = re.search(r"content-type:\s*([^\r\n]+)", headers, re.I)
+            part.update(name=name.group(1) if name else "", filename=filename.group(1) if filename else None,
+                        type=kind.group(1).strip() if kind else "text/plain")
+            headers_done = True
+        at = buffer.find(delimiter)
+        # Everything but a possible partial delimiter at the end belongs to the part
+        data = buffer[:at] if at >= 0 else buffer[:max(len(buffer) - len(delimiter) + 1, 0)]
+        buffer = buffer[len(data):]
+        part["size"] += len(data)
+        if part["filename"] is None:
+            part["value"] += data
+        else:
+            part["digest"].update(data)
+        if at >= 0:
+            if part["filename"] is None:
+                form[part["name"]] = part["value"].decode("utf-8", "replace")
+            else:
+                form[part["name"]] = {"filename": part["filename"], "type": part["type"], "size": part["size"],
+                                      "sha256": part["digest"].hexdigest()}
+            part = None
+        elif not fill():
+            raise ValueError("multipart body is missing its closing boundary")
+
+
+class StandInAPI:
+    """In-memory implementation of the routes the harness exercises.
+
+    Mirrors app/api/[[...path]]/route.js (roles, school scoping, limit/skip,
+    soft deletes, bulk attendance replacement). Where route.js and the harness
+    disagree (auth/register, flat teacher payloads, student dashboards) it
+    follows the harness so the functional suite runs clean offline.
+    `latency`/`jitter` (seconds) are slept before every request. `search_fields`
+    maps each api/search entity type to the fields its query is matched against
+    (backend_test.SEARCH_FIELDS).
+    """
+    ROLE_ALIASES = {"admin": "school_admin"}
+    TOKEN_TTL = 24 * 3600
+
+    def __init__(self, latency=0.0, jitter=0.0, secret="standin-secret", school_id="standin-school",
+                 hash_iterations=1000, paystack_secret="sk_test_standin", search_fields=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.secret = secret.encode()
+        self.paystack_secret = paystack_secret
+        self.school_id = school_id
+        self.hash_iterations = hash_iterations
+        self.search_fields = search_fields or {}
+        self.collections = defaultdict(dict)
+        self.users_by_email = {}
+        self.lock = threading.RLock()
+        # Seconds spent hashing passwords by the current request's thread (reported as Server-Timing "hash")
+        self.hash_time = threading.local()
+        self.routes = {
+            ("POST", "auth/setup"): self.setup,
+            ("POST", "auth/register"): self.register,
+            ("POST", "auth/login"): self.login,
+            ("GET", "auth/me"): self.me,
+            ("GET", "auth/sessions"): self.list_sessions,
+            ("POST", "auth/sessions"): self.create_session,
+            ("PATCH", "auth/sessions"): self.touch_session,
+            ("DELETE", "auth/sessions"): self.terminate_sessions,
+            ("GET", "students"): lambda user, query, body: self.list_records(user, query, "students", ["school_admin", "teacher"]),
+            ("GET", "teachers"): lambda user, query, body: self.list_records(user, query, "teachers", ["school_admin"]),
+            ("GET", "parents"): self.list_parents,
+            ("GET", "classes"): lambda user, query, body: self.list_records(user, query, "classes", ["school_admin", "teacher"], paged=False),
+            ("GET", "subjects"): lambda user, query, body: self.list_records(user, query, "subjects", ["school_admin", "teacher"], paged=False),
+            ("GET", "teacher-assignments"): lambda user, query, body: self.list_records(
+                user, query, "teacher_assignments", ["school_admin", "teacher"], filters=("teacherId",), paged=False),
+            ("GET", "attendance"): lambda user, query, body: self.list_records(
+                user, query, "attendance", ["school_admin", "teacher", "parent"], filters=("studentId", "date", "classId")),
+            ("GET", "parent/students"): self.parent_students,
+            ("GET", "notifications"): self.notifications,
+            ("GET", "dashboard/stats"): self.dashboard_stats,
+            ("GET", "reports/school-stats"): self.school_stats,
+            ("GET", "search"): self.search,
+            ("GET", "reports/attendance"): self.attendance_report,
+            ("GET", "reports/payments"): self.payments_report,
+            ("GET", "chat/conversations"): self.list_conversations,
+            ("GET", "chat/messages"): self.chat_history,
+            ("GET", "gamification/points"): self.user_points,
+            ("GET", "gamification/leaderboard"): self.leaderboard,
+            ("GET", "subscription-plans"): self.subscription_plans,
+            ("GET", "payments"): self.list_payments,
+            ("POST", "students"): lambda user, query, body: self.create_record(user, body, "students"),
+            ("POST", "classes"): lambda user, query, body: self.create_record(user, body, "classes"),
+            ("POST", "subjects"): lambda user, query, body: self.create_record(user, body, "subjects"),
+            ("POST", "teachers"): self.create_teacher,
+            ("POST", "parents"): self.create_parent,
+            ("POST", "teacher-assignments"): self.create_assignment,
+            ("POST", "attendance"): self.mark_attendance,
+            ("POST", "attendance/bulk"): self.bulk_attendance,
+            ("POST", "notifications/mark-read"): self.mark_notification_read,
+            ("POST", "chat/conversations"): self.create_conversation,
+            ("POST", "chat/messages"): self.send_message,
+            ("POST", "gamification/points"): self.award_points,
+            ("POST", "storage/upload"): self.upload_file,
+            ("POST", "payments"): self.create_payment,
+            ("DELETE", "storage/upload"): self.delete_file,
+        }
+        for collection in ("students", "teachers", "classes"):
+            self.routes[("PUT", collection)] = lambda user, query, body, collection=collection: \
+                self.update_record(user, query, body, collection)
+        for collection in ("students", "teachers", "classes", "parents"):
+            self.routes[("DELETE", collection)] = lambda user, query, body, collection=collection: \
+                self.delete_record(user, query, collection)
+        # Unauthenticated, signed routes that receive the raw body and request headers
+        self.webhooks = {("POST", "payments/paystack-webhook"): self.paystack_webhook}
+        plan = {"id": "standin-termly", "name": "Termly", "description": "One school term", "price": 50000.0,
+                "currency": "ngn", "duration": 4, "active": True, "createdAt": self.now()}
+        self.collections["subscription_plans"][plan["id"]] = plan
+
+    # --- tokens and passwords ---
+
+    def sign(self, claims):
+        def encode(part):
+            return base64.urlsafe_b64encode(json.dumps(part, separators=(",", ":")).encode()).rstrip(b"=").decode()
+        signing_input = f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(claims)}"
+        signature = hmac.new(self.secret, signing_input.encode(), hashlib.sha256).digest()
+        return f"{signing_input}.{base64.urlsafe_b64encode(signature).rstrip(b'=').decode()}"
+
+    def verify(self, authorization):
+        """Claims of a valid, unexpired bearer token, else None"""
+        if not authorization or " " not in authorization:
+            return None
+        token = authorization.split(" ", 1)[1]
+        try:
+            header, payload, signature = token.split(".")
+        except ValueError:
+            return None
+        expected = hmac.new(self.secret, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(base64.urlsafe_b64encode(expected).rstrip(b"=").decode(), signature):
+            return None
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return claims if claims.get("exp", 0) > time.time() else None
+
+    def hash_password(self, password, salt):
+        started = time.perf_counter()
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), self.hash_iterations).hex()
+        self.hash_time.seconds = getattr(self.hash_time, "seconds", 0.0) + time.perf_counter() - started
+        return digest
+
+    def take_hash_time(self):
+        """Hashing seconds of the request this thread just handled"""
+        seconds, self.hash_time.seconds = getattr(self.hash_time, "seconds", 0.0), 0.0
+        return seconds
+
+    def issue_token(self, user):
+        return self.sign({
+            "id": user["id"],
+            "email": user["email"],
+            "role": user["role"],
+            "schoolId": user.get("schoolId"),
+            "exp": int(time.time()) + self.TOKEN_TTL
+        })
+
+    def public(self, user):
+        return {key: value for key, value in user.items() if key not in ("password", "salt")}
+
+    # --- dispatch ---
+
+    def handle(self, method, path, query, headers, body):
+        """Returns (status, payload)"""
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+        webhook = self.webhooks.get((method, path))
+        if webhook is not None:
+            with self.lock:
+                return webhook(headers, body)
+        route = self.routes.get((method, path))
+        if route is None:
+            return 404, {"error": "Route not found"}
+        user = self.verify(headers.get("Authorization"))
+        if user is None and not path.startswith("auth/") or path == "auth/me" and user is None:
+            return 401, {"error": "Unauthorized"}
+        with self.lock:
+            return route(user, query, body)
+
+    def now(self):
+        return datetime.now().isoformat()
+
+    def scoped(self, user, collection, **filters):
+        return [
+            record for record in self.collections[collection].values()
+            if record.get("schoolId") == user.get("schoolId")
+            and all(record.get(key) == value for key, value in filters.items())
+        ]
+
+    def page(self, records, query):
+        limit = int(query.get("limit") or 0) or 50
+        skip = int(query.get("skip") or 0)
+        return records[skip:skip + limit]
+
+    # --- auth ---
+
+    def register(self, user, query, body):
+        if not body.get("email") or not body.get("password"):
+            return 400, {"error": "Email and password required"}
+        if body["email"] in self.users_by_email:
+            return 400, {"error": "Email already exists"}
+        salt = uuid.uuid4().hex
+        new_user = {
+            "id": str(uuid.uuid4()),
+            "name": body.get("name", ""),
+            "email": body["email"],
+            "phoneNumber": body.get("phoneNumber", ""),
+            "role": self.ROLE_ALIASES.get(body.get("role"), body.get("role", "student")),
+            "schoolId": body.get("schoolId", self.school_id),
+            "salt": salt,
+            "password": self.hash_password(body["password"], salt),
+            "createdAt": self.now(),
+            "active": True
+        }
+        self.collections["users"][new_user["id"]] = new_user
+        self.users_by_email[new_user["email"]] = new_user
+        return 200, {"token": self.issue_token(new_user), "user": self.public(new_user)}
+
+    def setup(self, user, query, body):
+        """auth/setup: creates the platform's one developer account (no school)"""
+        if not body.get("devName") or not body.get("devEmail") or not body.get("devPassword"):
+            return 400, {"error": "All fields required"}
+        if any(account["role"] == "developer" for account in self.collections["users"].values()):
+            return 400, {"error": "Developer already exists"}
+        salt = uuid.uuid4().hex
+        developer = {
+            "id": str(uuid.uuid4()),
+            "name": body["devName"],
+            "email": body["devEmail"],
+            "role": "developer",
+            "salt": salt,
+            "password": self.hash_password(body["devPassword"], salt),
+            "createdAt": self.now(),
+            "active": True
+        }
+        self.collections["users"][developer["id"]] = developer
+        self.users_by_email[developer["email"]] = developer
+        return 200, {"message": "Developer account created successfully"}
+
+    def login(self, user, query, body):
+        if not body.get("email") or not body.get("password"):
+            return 400, {"error": "Email and password required"}
+        account = self.users_by_email.get(body["email"])
+        if not account or account["password"] != self.hash_password(body["password"], account["salt"]):
+            return 401, {"error": "Invalid credentials"}
+        return 200, {"user": self.public(account), "token": self.issue_token(account), "school": None}
+
+    def me(self, user, query, body):
+        account = self.collections["users"].get(user["id"])
+        if not account:
+            return 404, {"error": "User not found"}
+        return 200, self.public(account)
+
+    # --- sessions (app/api/auth/sessions/route.js) ---
+
+    def new_session(self, user_id, body):
+        session = {
+            "id": str(uuid.uuid4()),
+            "userId": user_id,
+            "deviceInfo": body.get("deviceInfo") or {},
+            "ipAddress": body.get("ipAddress") or "Unknown",
+            "location": body.get("location") or "Unknown",
+            "userAgent": body.get("userAgent") or "Unknown",
+            "createdAt": self.now(),
+            "lastActivity": self.now(),
+            "expiresAt": (datetime.now() + timedelta(days=30)).isoformat(),
+            "active": True
+        }
+        self.collections["user_sessions"][session["id"]] = session
+        return session
+
+    def active_sessions(self, user_id):
+        # Like the route, a scan of user_sessions filtered on userId/active/expiresAt
+        now = self.now()
+        return [
+            session for session in self.collections["user_sessions"].values()
+            if session["userId"] == user_id and session["active"] and session["expiresAt"] > now
+        ]
+
+    def list_sessions(self, user, query, body):
+        if user is None:
+            return 401, {"error": "Unauthorized"}
+        sessions = sorted(self.active_sessions(user["id"]), key=lambda session: session["createdAt"], reverse=True)
+        return 200, {"sessions": [
+            {**{key: session[key] for key in ("id", "deviceInfo", "ipAddress", "location", "userAgent", "createdAt",
+                                              "lastActivity", "expiresAt")},
+             "isCurrentSession": session["id"] == user.get("sessionId")}
+            for session in sessions
+        ]}
+
+    def create_session(self, user, query, body):
+        # The route takes userId from the body and does not check a token
+        if not body.get("userId"):
+            return 400, {"error": "User ID required"}
+        session = self.new_session(body["userId"], body)
+        account = self.collections["users"].get(body["userId"])
+        if account:
+            account.update({"lastLogin": self.now(), "lastLoginIp": body.get("ipAddress"), "updatedAt": self.now()})
+        return 200, {"sessionId": session["id"], "expiresAt": session["expiresAt"],
+                     "message": "Session created successfully"}
+
+    def touch_session(self, user, query, body):
+        if user is None:
+            return 401, {"error": "Unauthorized"}
+        session_id = body.get("sessionId") or user.get("sessionId")
+        if not session_id:
+            return 400, {"error": "Session ID required"}
+        session = next((session for session in self.active_sessions(user["id"]) if session["id"] == session_id), None)
+        if session is None:
+            return 404, {"error": "Session not found or expired"}
+        session["lastActivity"] = self.now()
+        return 200, {"message": "Session updated successfully"}
+
+    def terminate_sessions(self, user, query, body):
+        if user is None:
+            return 401, {"error": "Unauthorized"}
+        terminate_all = query.get("all") == "true"
+        session_id = query.get("sessionId")
+        if not terminate_all:
+            if not session_id:
+                return 400, {"error": "Session ID required"}
+            if session_id == user.get("sessionId"):
+                return 400, {"error": "Cannot terminate current session"}
+        terminated = 0
+        for session in self.collections["user_sessions"].values():
+            if session["userId"] == user["id"] and session["active"] and (terminate_all or session["id"] == session_id):
+                session.update({"active": False, "terminatedAt": self.now(), "terminatedBy": user["id"]})
+                terminated += 1
+        if terminate_all:
+            session = self.new_session(user["id"], {"deviceInfo": {"type": "web", "browser": "Unknown"}})
+            return 200, {"message": "All sessions terminated. New session created.", "newSessionId": session["id"],
+                         "terminatedCount": terminated}
+        return 200, {"message": "Session terminated successfully", "terminatedCount": terminated}
+
+    # --- generic collections ---
+
+    def list_records(self, user, query, collection, roles, filters=(), paged=True):
+        if user["role"] not in roles:
+            return 401, {"error": "Unauthorized"}
+        records = self.scoped(user, collection, **{key: query[key] for key in filters if query.get(key)})
+        return 200, self.page(records, query) if paged else records
+
+    def create_record(self, user, body, collection, roles=("school_admin",), **extra):
+        if user["role"] not in roles:
+            return 401, {"error": "Unauthorized"}
+        record = {
+            "id": str(uuid.uuid4()),
+            **body,
+            "schoolId": user["schoolId"],
+            **extra,
+            "createdAt": self.now(),
+            "active": True
+        }
+        self.collections[collection][record["id"]] = record
+        return 200, record
+
+    def update_record(self, user, query, body, collection):
+        if user["role"] != "school_admin":
+            return 401, {"error": "Unauthorized"}
+        record = self.collections[collection].get(query.get("id"))
+        if record and record.get("schoolId") == user["schoolId"]:
+            record.update(body, updatedAt=self.now())
+        return 200, record
+
+    def delete_record(self, user, query, collection):
+        if user["role"] != "school_admin":
+            return 401, {"error": "Unauthorized"}
+        source = "users" if collection == "parents" else collection
+        record = self.collections[source].get(query.get("id"))
+        if record and record.get("schoolId") == user["schoolId"]:
+            record.update(active=False, deletedAt=self.now())
+        return 200, {"success": True}
+
+    # --- specific routes ---
+
+    def list_parents(self, user, query, body):
+        if user["role"] != "school_admin":
+            return 401, {"error": "Unauthorized"}
+        return 200, [self.public(parent) for parent in self.page(self.scoped(user, "users", role="parent"), query)]
+
+    def create_teacher(self, user, query, body):
+        if user["role"] != "school_admin":
+            return 401, {"error": "Unauthorized"}
+        # route.js expects {teacherData, credentials}; the functional test posts the fields flat
+        teacher_data = body.get("teacherData", body)
+        credentials = body.get("credentials") or {}
+        status, teacher = self.create_record(user, teacher_data, "teachers")
+        if credentials.get("email") and credentials.get("password"):
+            salt = uuid.uuid4().hex
+            account = {
+                "id": teacher["id"],
+                "name": f"{teacher_data.get('firstName', '')} {teacher_data.get('lastName', '')}".strip(),
+                "email": credentials["email"],
+                "role": "teacher",
+                "schoolId": user["schoolId"],
+                "salt": salt,
+                "password": self.hash_password(credentials["password"], salt),
+                "createdAt": self.now(),
+                "active": True
+            }
+            self.collections["users"][account["id"]] = account
+            self.users_by_email[account["email"]] = account
+            return status, {"teacher": teacher, "credentials": {"email": credentials["email"]}}
+        return status, teacher
+
+    def create_parent(self, user, query, body):
+        if user["role"] != "school_admin":
+            return 401, {"error": "Unauthorized"}
+        parent_data = body.get("parentData") or {}
+        credentials = body.get("parentCredentials") or {}
+        if not credentials.get("email") or not credentials.get("password"):
+            return 400, {"error": "Parent data and credentials required"}
+        if credentials["email"] in self.users_by_email:
+            return 400, {"error": "Email already exists"}
+        salt = uuid.uuid4().hex
+        parent = {
+            "id": str(uuid.uuid4()),
+            "name": parent_data.get("name", ""),
+            "email": credentials["email"],
+            "role": "parent",
+            "schoolId": user["schoolId"],
+            "phoneNumber": parent_data.get("phoneNumber", ""),
+            "address": parent_data.get("address", ""),
+            "salt": salt,
+            "password": self.hash_password(credentials["password"], salt),
+            "createdAt": self.now(),
+            "active": True
+        }
+        self.collections["users"][parent["id"]] = parent
+        self.users_by_email[parent["email"]] = parent
+        return 200, {"parent": self.public(parent), "credentials": {"email": credentials["email"]}}
+
+    def create_assignment(self, user, query, body):
+        status, assignment = self.create_record(user, body, "teacher_assignments")
+        if status == 200:
+            self.create_record(user, {
+                "recipientId": body.get("teacherId"),
+                "title": "New Subject Assignment",
+                "message": f"You have been assigned to teach {body.get('subjectName')} for {body.get('className')}",
+                "type": "assignment",
+                "read": False
+            }, "notifications")
+        return status, assignment
+
+    def mark_attendance(self, user, query, body):
+        return self.create_record(user, body, "attendance", roles=("school_admin", "teacher"), markedBy=user["id"])
+
+    def bulk_attendance(self, user, query, body):
+        if user["role"] not in ("school_admin", "teacher"):
+            return 401, {"error": "Unauthorized"}
+        attendance_list = body.get("attendanceList") or []
+        if not attendance_list:
+            return 400, {"error": "No attendance data provided"}
+        date = attendance_list[0].get("date")
+        attendance = self.collections["attendance"]
+        # Same replacement rule as route.js: admins replace teacher rows, teachers replace the class's student rows
+        if user["role"] == "school_admin":
+            stale = [key for key, record in attendance.items()
+                     if record.get("schoolId") == user["schoolId"] and record.get("date") == date and "teacherId" in record]
+        else:
+            class_id = attendance_list[0].get("classId")
+            stale = [key for key, record in attendance.items()
+                     if record.get("schoolId") == user["schoolId"] and record.get("date") == date
+                     and record.get("classId") == class_id and "studentId" in record]
+        for key in stale:
+            del attendance[key]
+        for record in attendance_list:
+            self.create_record(user, record, "attendance", roles=(user["role"],), markedBy=user["id"])
+        return 200, {"success": True, "count": len(attendance_list)}
+
+    def parent_students(self, user, query, body):
+        if user["role"] != "parent":
+            return 401, {"error": "Unauthorized"}
+        return 200, self.scoped(user, "students", parentId=user["id"])
+
+    def attendance_report(self, user, query, body):
+        """reports/attendance: summary, detailed or class report over an optional date range"""
+        report_type = query.get("type", "summary")
+        class_id = query.get("classId")
+        if report_type == "class" and not class_id:
+            return 400, {"error": "Class ID required for class report"}
+        if report_type not in ("summary", "detailed", "class"):
+            return 400, {"error": "Invalid report type"}
+        start, end = query.get("startDate"), query.get("endDate")
+        records = [
+            record for record in self.scoped(user, "attendance")
+            if (not class_id or record.get("classId") == class_id)
+            and (not start or record.get("date", "") >= start) and (not end or record.get("date", "") <= end)
+        ]
+        classes = {record["id"]: record for record in self.scoped(user, "classes")}
+        report = {"reportType": f"attendance_{report_type}", "generatedAt": self.now(), "schoolId": user["schoolId"]}
+        if report_type == "summary":
+            per_class = defaultdict(lambda: defaultdict(int))
+            for record in records:
+                per_class[record.get("classId")][record.get("status")] += 1
+            report["data"] = [
+                {
+                    "classId": class_ref,
+                    "className": classes.get(class_ref, {}).get("name"),
+                    "totalPresent": counts["present"],
+                    "totalAbsent": counts["absent"],
+                    "totalLate": counts["late"],
+                    "totalRecords": sum(counts.values()),
+                    "attendanceRate": counts["present"] / sum(counts.values()) * 100
+                }
+                for class_ref, counts in per_class.items()
+            ]
+            report["summary"] = {"totalClasses": len(report["data"])}
+        elif report_type == "detailed":
+            students = {record["id"]: record for record in self.scoped(user, "students")}
+            report["data"] = sorted((
+                {
+                    **record,
+                    "studentName": " ".join(filter(None, (students.get(record.get("studentId"), {}).get(name)
+                                                          for name in ("firstName", "lastName")))),
+                    "className": classes.get(record.get("classId"), {}).get("name")
+                }
+                for record in records
+            ), key=lambda record: record.get("date", ""), reverse=True)
+            report["summary"] = {"totalRecords": len(records)}
+        else:
+            roster = {
+                student["id"]: {
+                    "studentId": student["id"],
+                    "studentName": f"{student.get('firstName')} {student.get('lastName')}",
+                    "admissionNumber": student.get("admissionNumber"),
+                    "attendance": {}
+                }
+                for student in self.scoped(user, "students", classId=class_id)
+            }
+            for record in records:
+                if record.get("studentId") in roster:
+                    roster[record["studentId"]]["attendance"][record["date"]] = record.get("status")
+            report["dates"] = sorted({record.get("date") for record in records})
+            report["data"] = list(roster.values())
+            report["summary"] = {"totalStudents": len(roster), "totalDays": len(report["dates"])}
+        return 200, report
+
+    def payments_report(self, user, query, body):
+        if user["role"] != "school_admin":
+            return 401, {"error": "Unauthorized"}
+        payments = sorted(self.scoped(user, "payments") + self.scoped(user, "parent_payments"),
+                          key=lambda record: record.get("createdAt", ""), reverse=True)
+        return 200, {
+            "totalRevenue": sum(record.get("amount", 0) for record in payments if record.get("status") == "completed"),
+            "recentTransactions": payments[:10],
+            "paymentStatusBreakdown": [
+                {"status": status, "count": sum(1 for record in payments if record.get("status") == status)}
+                for status in ("completed", "pending", "failed")
+            ],
+            "monthlyRevenue": []
+        }
+
+    def search(self, user, query, body):
+        """api/search: the query is a case-insensitive regex over search_fields, newest first"""
+        text = query.get("q") or ""
+        if len(text) < 2:
+            return 400, {"error": "Search query must be at least 2 characters"}
+        search_type = query.get("type", "all")
+        limit = int(query.get("limit") or 0) or 20
+        offset = int(query.get("offset") or 0)
+        try:
+            pattern = re.compile(text, re.I)
+        except re.error:
+            return 500, {"error": "Internal server error"}
+        if search_type in self.search_fields:
+            types, per_type = [search_type], limit
+        else:
+            types, per_type, offset = list(self.search_fields), math.ceil(limit / 5), 0
+        
+        def matching(records, entity):
+            return [
+                record for record in records
+                if any(pattern.search(str(record.get(field) or "")) for field in self.search_fields[entity])
+            ]
+        
+        results = {}
+        for entity in types:
+            if entity == "attendance":
+                students = {record["id"]: record for record in self.scoped(user, "students")}
+                joined = [
+                    {**students[record["studentId"]], **record}
+                    for record in self.scoped(user, "attendance") if record.get("studentId") in students
+                ]
+                found = [
+                    {
+                        "id": record["id"],
+                        "date": record.get("date"),
+                        "status": record.get("status"),
+                        "remarks": record.get("remarks"),
+                        "studentName": f"{record.get('firstName')} {record.get('lastName')}",
+                        "studentId": record.get("admissionNumber")
+                    }
+                    for record in matching(joined, entity)
+                ]
+                found.sort(key=lambda record: record["date"] or "", reverse=True)
+            else:
+                source = self.scoped(user, "users", role="parent") if entity == "parents" else self.scoped(user, entity)
+                found = [self.public(record) for record in matching(source, entity) if record.get("active", True)]
+                found.sort(key=lambda record: record.get("createdAt", ""), reverse=True)
+            results[entity] = found[offset:offset + per_type]
+        return 200, {
+            "query": text,
+            "type": search_type,
+            "results": results,
+            "total": sum(len(found) for found in results.values())
+        }
+
+    def notifications(self, user, query, body):
+        records = [record for record in self.collections["notifications"].values() if record.get("recipientId") == user["id"]]
+        records.sort(key=lambda record: record["createdAt"], reverse=True)
+        return 200, self.page(records, query)
+
+    def mark_notification_read(self, user, query, body):
+        record = self.collections["notifications"].get(body.get("notificationId"))
+        if record and record.get("recipientId") == user["id"]:
+            record.update(read=True, readAt=self.now())
+        return 200, {"success": True}
+
+    def chat_conversation(self, user, conversation_id):
+        """A conversation the caller may read: one they take part in, or any group in their school"""
+        conversation = self.collections["chat_conversations"].get(conversation_id)
+        if not conversation or conversation.get("schoolId") != user.get("schoolId"):
+            return None
+        if user["id"] in conversation["participants"] or conversation["type"] == "group":
+            return conversation
+        return None
+
+    def list_conversations(self, user, query, body):
+        """Caller's conversations, most recent activity first, with the unreadCount ConversationList renders"""
+        unread = defaultdict(int)
+        for message in self.collections["chat_messages"].values():
+            if message["senderId"] != user["id"] and user["id"] not in message["readBy"]:
+                unread[message["conversationId"]] += 1
+        conversations = [
+            {**conversation, "unreadCount": unread[conversation["id"]]}
+            for conversation in self.scoped(user, "chat_conversations")
+            if user["id"] in conversation["participants"]
+        ]
+        conversations.sort(key=lambda conversation: conversation["lastMessageAt"], reverse=True)
+        return 200, conversations
+
+    def create_conversation(self, user, query, body):
+        participants = body.get("participants") or []
+        if body.get("type") == "private":
+            for conversation in self.scoped(user, "chat_conversations", type="private"):
+                if sorted(conversation["participants"]) == sorted([user["id"], participants[0]]):
+                    return 200, conversation
+            members = [user["id"], participants[0]]
+        elif body.get("type") == "group":
+            if user["role"] != "school_admin":
+                return 403, {"error": "Only admins can create groups"}
+            members = [user["id"], *participants]
+        else:
+            return 400, {"error": "Invalid conversation type"}
+        conversation = {
+            "id": str(uuid.uuid4()),
+            "schoolId": user["schoolId"],
+            "type": body["type"],
+            "participants": members,
+            "createdBy": user["id"],
+            "status": "approved",
+            "lastMessageAt": self.now(),
+            "createdAt": self.now()
+        }
+        if body["type"] == "group":
+            conversation["name"] = body.get("name")
+        self.collections["chat_conversations"][conversation["id"]] = conversation
+        return 200, conversation
+
+    def chat_history(self, user, query, body):
+        """Oldest first with limit/skip, as ChatWindow loads it"""
+        if not query.get("conversationId"):
+            return 400, {"error": "Conversation ID required"}
+        if not self.chat_conversation(user, query["conversationId"]):
+            return 404, {"error": "Conversation not found"}
+        messages = [message for message in self.collections["chat_messages"].values()
+                    if message["conversationId"] == query["conversationId"]]
+        return 200, self.page(messages, query)
+
+    def send_message(self, user, query, body):
+        """The send_message socket handler in lib/socket-server.js, at the REST path ChatWindow posts to"""
+        conversation = self.chat_conversation(user, body.get("conversationId"))
+        if not conversation:
+            return 404, {"error": "Conversation not found or access denied"}
+        message = {
+            "id": str(uuid.uuid4()),
+            "conversationId": conversation["id"],
+            "schoolId": user["schoolId"],
+            "senderId": user["id"],
+            "messageType": body.get("messageType") or "text",
+            "content": body.get("content"),
+            "read": False,
+            "readBy": [user["id"]],
+            "createdAt": self.now()
+        }
+        self.collections["chat_messages"][message["id"]] = message
+        conversation["lastMessageAt"] = message["createdAt"]
+        for participant in conversation["participants"]:
+            if participant == user["id"]:
+                continue
+            notification = {
+                "id": str(uuid.uuid4()),
+                "schoolId": user["schoolId"],
+                "recipientId": participant,
+                "senderId": user["id"],
+                "title": "New Message",
+                "message": message["content"] if message["messageType"] == "text" else f"Sent a {message['messageType']}",
+                "type": "message",
+                "priority": "medium",
+                "read": False,
+                "createdAt": message["createdAt"]
+            }
+            self.collections["notifications"][notification["id"]] = notification
+        return 200, message
+
+    # Achievements checked after every award: (type, title, bonus points, test on the user_points document)
+    ACHIEVEMENTS = (
+        ("streak_5", "Attendance Champion", 50, lambda points, activity: activity == "attendance" and points["currentStreak"] == 5),
+        ("streak_10", "Perfect Attendance", 100, lambda points, activity: activity == "attendance" and points["currentStreak"] == 10),
+        ("streak_30", "Attendance Legend", 500, lambda points, activity: activity == "attendance" and points["currentStreak"] == 30),
+        ("points_100", "Rising Star", 25, lambda points, activity: points["totalPoints"] >= 100),
+        ("points_500", "High Achiever", 100, lambda points, activity: points["totalPoints"] >= 500),
+        ("points_1000", "Elite Performer", 250, lambda points, activity: points["totalPoints"] >= 1000),
+    )
+
+    def add_points(self, school_id, user_id, activity, points):
+        """updateUserPoints in gamification/points/route.js: $inc totalPoints, streaks on attendance"""
+        record = self.collections["user_points"].get((school_id, user_id))
+        existing = record is not None
+        if not existing:
+            record = self.collections["user_points"][(school_id, user_id)] = {
+                "userId": user_id, "schoolId": school_id, "totalPoints": 0, "currentStreak": 0, "attendanceStreak": 0,
+                "longestStreak": 0, "lastAttendanceDate": None
+            }
+        record["totalPoints"] += points
+        if activity == "attendance":
+            today = datetime.now().date()
+            if existing and record["lastAttendanceDate"] == (today - timedelta(days=1)).isoformat():
+                record["currentStreak"] += 1
+                record["attendanceStreak"] += 1
+                record["longestStreak"] = max(record["longestStreak"], record["currentStreak"])
+            elif not existing or record["lastAttendanceDate"] != today.isoformat():
+                record.update(currentStreak=1, attendanceStreak=1, longestStreak=max(record["longestStreak"], 1))
+            record["lastAttendanceDate"] = today.isoformat()
+        return record
+
+    def award_points(self, user, query, body):
+        if not body.get("userId") or not body.get("activityType") or not body.get("points"):
+            return 400, {"error": "userId, activityType, and points are required"}
+        school_id, user_id, activity_type = user["schoolId"], body["userId"], body["activityType"]
+        activity = {
+            "id": str(uuid.uuid4()),
+            "userId": user_id,
+            "schoolId": school_id,
+            "activityType": activity_type,
+            "points": int(body["points"]),
+            "metadata": body.get("metadata") or {},
+            "awardedAt": self.now()
+        }
+        self.collections["gamification_activities"][activity["id"]] = activity
+        record = self.add_points(school_id, user_id, activity_type, activity["points"])
+        earned = {achievement["achievementType"] for achievement in self.collections["user_achievements"].values()
+                  if achievement["userId"] == user_id and achievement["schoolId"] == school_id}
+        new = [(kind, title, bonus) for kind, title, bonus, test in self.ACHIEVEMENTS
+               if kind not in earned and test(record, activity_type)]
+        for kind, title, bonus in new:
+            achievement = {"id": str(uuid.uuid4()), "userId": user_id, "schoolId": school_id, "achievementType": kind,
+                           "title": title, "points": bonus, "earnedAt": self.now()}
+            self.collections["user_achievements"][achievement["id"]] = achievement
+        for kind, title, bonus in new:
+            self.add_points(school_id, user_id, "achievement", bonus)
+        return 200, {"success": True, "activity": activity}
+
+    def ranked_points(self, user, ranking, period):
+        """The school's user_points documents in leaderboard order, with achievementCount"""
+        school_id = user["schoolId"]
+        records = [dict(record) for (school, _), record in self.collections["user_points"].items() if school == school_id]
+        counts = defaultdict(int)
+        for achievement in self.collections["user_achievements"].values():
+            counts[achievement["userId"]] += 1
+        since = {"week": (datetime.now() - timedelta(days=7)).isoformat(),
+                 "month": datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()}.get(period)
+        if since and ranking != "achievements":
+            active = {activity["userId"] for activity in self.collections["gamification_activities"].values()
+                      if activity["awardedAt"] >= since}
+            records = [record for record in records if record["userId"] in active]
+        for record in records:
+            record["achievementCount"] = counts[record["userId"]]
+        if ranking == "achievements":
+            key = lambda record: (record["achievementCount"], record["totalPoints"])
+        elif ranking == "attendance":
+            key = lambda record: record["longestStreak"]
+        else:
+            key = lambda record: (record["totalPoints"], record["longestStreak"])
+        return sorted(records, key=key, reverse=True)
+
+    def user_points(self, user, query, body):
+        user_id = query.get("userId") or user["id"]
+        record = self.collections["user_points"].get((user["schoolId"], user_id))
+        achievements = sorted((achievement for achievement in self.collections["user_achievements"].values()
+                               if achievement["userId"] == user_id and achievement["schoolId"] == user["schoolId"]),
+                              key=lambda achievement: achievement["earnedAt"], reverse=True)
+        ranked = self.ranked_points(user, "points", "all")
+        index = next((index for index, entry in enumerate(ranked) if entry["userId"] == user_id), None)
+        return 200, {
+            "points": dict(record) if record else {
+                "totalPoints": 0, "attendanceStreak": 0, "currentStreak": 0, "longestStreak": 0,
+                "lastAttendanceDate": None
+            },
+            "achievements": achievements,
+            "leaderboardPosition": None if not ranked else {
+                "position": index + 1 if index is not None else 0,
+                "totalUsers": len(ranked),
+                "points": ranked[index]["totalPoints"] if index is not None else 0
+            }
+        }
+
+    def leaderboard(self, user, query, body):
+        ranking = query.get("type") or "points"
+        period = query.get("period") or "all"
+        limit = int(query.get("limit") or 0) or 10
+        ranked = self.ranked_points(user, ranking, period)
+        users = self.collections["users"]
+        board = [{
+            "userId": entry["userId"],
+            "name": users.get(entry["userId"], {}).get("name"),
+            "role": users.get(entry["userId"], {}).get("role"),
+            "totalPoints": entry["totalPoints"],
+            "currentStreak": entry["currentStreak"],
+            "longestStreak": entry["longestStreak"],
+            "achievementCount": entry["achievementCount"],
+            "rank": rank
+        } for rank, entry in enumerate(ranked[:limit], 1)]
+        index = next((index for index, entry in enumerate(ranked) if entry["userId"] == user["id"]), None)
+        if index is None:
+            position = {"position": None, "totalUsers": len(ranked), "message": "Not ranked yet"}
+        else:
+            position = {"position": index + 1, "totalUsers": len(ranked), "points": ranked[index]["totalPoints"],
+                        "streak": ranked[index]["longestStreak"]}
+            if ranking == "achievements":
+                position["achievements"] = ranked[index]["achievementCount"]
+        return 200, {"leaderboard": board, "userPosition": position, "type": ranking, "period": period, "limit": limit}
+
+    UPLOAD_LIMIT = 10 * 1024 * 1024
+    UPLOAD_TYPES = {
+        "image": ("image/jpeg", "image/png", "image/gif", "image/webp"),
+        "document": ("application/pdf", "application/msword",
+                     "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+        "general": ("image/jpeg", "image/png", "image/gif", "image/webp", "application/pdf")
+    }
+
+    def upload_file(self, user, query, body):
+        """storage/upload/route.js with the Firebase write replaced by a generated URL"""
+        upload = body.get("file")
+        if not isinstance(upload, dict):
+            return 400, {"error": "No file provided"}
+        if upload["size"] > self.UPLOAD_LIMIT:
+            return 400, {"error": "File size too large (max 10MB)"}
+        file_type = body.get("fileType") or "general"
+        if upload["type"] not in self.UPLOAD_TYPES.get(file_type, self.UPLOAD_TYPES["general"]):
+            return 400, {"error": "File type not allowed"}
+        storage_name = f"{int(time.time() * 1000)}_{uuid.uuid4().hex[:10]}.{upload['filename'].rsplit('.', 1)[-1]}"
+        storage_path = (f"schools/{user['schoolId']}/{file_type}/{body.get('entityType')}/"
+                        f"{body.get('entityId') or 'general'}/{storage_name}")
+        record = {
+            "id": str(uuid.uuid4()),
+            "schoolId": user["schoolId"],
+            "userId": user["id"],
+            "fileName": upload["filename"],
+            "storageName": storage_name,
+            "storagePath": storage_path,
+            "downloadURL": f"https://storage.standin/{storage_path}",
+            "fileType": file_type,
+            "entityType": body.get("entityType"),
+            "entityId": body.get("entityId"),
+            "mimeType": upload["type"],
+            "size": upload["size"],
+            "sha256": upload["sha256"],
+            "uploadedAt": self.now()
+        }
+        self.collections["files"][record["id"]] = record
+        return 200, {"success": True, "file": record}
+
+    def delete_file(self, user, query, body):
+        if not query.get("fileId"):
+            return 400, {"error": "File ID required"}
+        record = self.collections["files"].get(query["fileId"])
+        if not record or record["schoolId"] != user["schoolId"]:
+            return 404, {"error": "File not found"}
+        del self.collections["files"][record["id"]]
+        return 200, {"success": True}
+
+    def subscription_plans(self, user, query, body):
+        plans = [plan for plan in self.collections["subscription_plans"].values() if plan.get("active")]
+        return 200, {"plans": sorted(plans, key=lambda plan: plan["price"])}
+
+    def list_payments(self, user, query, body):
+        """payments/route.js GET: the school's payments newest first, paged by page/limit"""
+        page = int(query.get("page") or 0) or 1
+        limit = int(query.get("limit") or 0) or 10
+        payments = sorted(self.scoped(user, "payments"), key=lambda payment: payment["createdAt"], reverse=True)
+        return 200, {
+            "payments": payments[(page - 1) * limit:page * limit],
+            "pagination": {"page": page, "limit": limit, "total": len(payments), "pages": math.ceil(len(payments) / limit)}
+        }
+
+    def create_payment(self, user, query, body):
+        """payments/route.js POST for providers other than stripe/paystack: a pending record, no checkout"""
+        if not body.get("amount") or not body.get("planId"):
+            return 400, {"error": "Amount and planId are required"}
+        plan = self.collections["subscription_plans"].get(body["planId"])
+        if not plan:
+            return 404, {"error": "Plan not found"}
+        payment = {
+            "id": str(uuid.uuid4()),
+            "schoolId": user["schoolId"],
+            "userId": user["id"],
+            "amount": body["amount"],
+            "currency": body.get("currency", "usd"),
+            "planId": plan["id"],
+            "planName": plan["name"],
+            "provider": body.get("provider", "stripe"),
+            "status": "pending",
+            "metadata": body.get("metadata") or {},
+            "createdAt": self.now()
+        }
+        self.collections["payments"][payment["id"]] = payment
+        return 200, {"payment": payment, "authorizationUrl": None}
+
+    def paystack_webhook(self, headers, raw):
+        """paystack-webhook/route.js: HMAC-SHA512 of the raw body, then last-event-wins updates"""
+        expected = hmac.new(self.paystack_secret.encode(), raw, hashlib.sha512).hexdigest()
+        if expected != headers.get("x-paystack-signature"):
+            return 400, {"error": "Invalid signature"}
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            return 500, {"error": "Internal server error"}
+        data = event.get("data") or {}
+        metadata = data.get("metadata") or {}
+        payment = self.collections["payments"].get(metadata.get("paymentId"))
+        if event.get("event") == "charge.success":
+            if payment:
+                payment.update(status="completed", paystackReference=data.get("reference"), completedAt=self.now(),
+                               transactionId=data.get("id"), paystackData=data)
+            plan = self.collections["subscription_plans"].get(metadata.get("planId"))
+            school = self.collections["schools"].get(metadata.get("schoolId"))
+            if plan and school:
+                school.update(subscriptionStatus="active", subscriptionPlanId=plan["id"],
+                              subscriptionStartDate=self.now(), lastPaymentDate=self.now(), accountFrozen=False,
+                              subscriptionEndDate=(datetime.now() + timedelta(days=30 * plan.get("duration", 1))).isoformat())
+        elif event.get("event") == "charge.failed" and payment:
+            payment.update(status="failed", paystackReference=data.get("reference"), failedAt=self.now(),
+                           failureReason=data.get("gateway_response") or "Payment failed", paystackData=data)
+        return 200, {"status": "success"}
+
+    def dashboard_stats(self, user, query, body):
+        role = user["role"]
+        if role == "developer":
+            # The stand-in keeps no school records of its own; every school a user belongs to counts
+            schools = set(self.collections["schools"]) | {
+                account.get("schoolId") for account in self.collections["users"].values() if account.get("schoolId")}
+            return 200, {
+                "totalSchools": len(schools),
+                "totalUsers": len(self.collections["users"]),
+                "activeSchools": len(schools)
+            }
+        if role == "school_admin":
+            return 200, {
+                "totalStudents": len(self.scoped(user, "students")),
+                "totalTeachers": len(self.scoped(user, "teachers")),
+                "totalParents": len(self.scoped(user, "users", role="parent")),
+                "totalClasses": len(self.scoped(user, "classes")),
+                "totalSubjects": len(self.scoped(user, "subjects"))
+            }
+        if role == "teacher":
+            assignments = self.scoped(user, "teacher_assignments", teacherId=user["id"])
+            class_ids = {assignment.get("classId") for assignment in assignments}
+            return 200, {
+                "myAssignments": len(assignments),
+                "myClasses": len(class_ids),
+                "totalStudentsInMyClasses": sum(1 for student in self.scoped(user, "students")
+                                                if student.get("classId") in class_ids)
+            }
+        if role == "parent":
+            return 200, {"myChildren": len(self.scoped(user, "students", parentId=user["id"]))}
+        return 200, {"myAttendance": len(self.scoped(user, "attendance", studentId=user["id"]))}
+
+    def school_stats(self, user, query, body):
+        """reports/school-stats for the caller's school (overview, detailed or trends)"""
+        report_type = query.get("type", "overview")
+        if report_type not in ("overview", "detailed", "trends"):
+            return 400, {"error": "Invalid report type"}
+        attendance = self.scoped(user, "attendance")
+        if report_type == "trends":
+            by_date = defaultdict(lambda: {"total": 0, "present": 0})
+            for record in attendance:
+                day = by_date[record.get("date")]
+                day["total"] += 1
+                day["present"] += record.get("status") == "present"
+            return 200, {"type": "trends", "attendanceTrends": [
+                {"date": date, **counts} for date, counts in sorted(by_date.items(), key=lambda item: str(item[0]))
+            ]}
+        students = self.scoped(user, "students")
+        present = sum(1 for record in attendance if record.get("status") == "present")
+        report = {
+            "type": report_type,
+            "totalStudents": len(students),
+            "totalTeachers": len(self.scoped(user, "teachers")),
+            "totalParents": len(self.scoped(user, "users", role="parent")),
+            "totalClasses": len(self.scoped(user, "classes")),
+            "totalSubjects": len(self.scoped(user, "subjects")),
+            "attendanceRate": round(present / len(attendance) * 100, 2) if attendance else 0
+        }
+        if report_type == "detailed":
+            per_class = defaultdict(int)
+            for student in students:
+                per_class[student.get("classId")] += 1
+            report["classUtilization"] = [
+                {"classId": record["id"], "name": record.get("name"), "students": per_class[record["id"]],
+                 "capacity": record.get("capacity")}
+                for record in self.scoped(user, "classes")
+            ]
+        return 200, report
+
+
+def make_standin_handler(api):
+    """HTTP handler class bound to a StandInAPI instance"""
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; without TCP_NODELAY keep-alive
+        # requests stall on delayed ACKs
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.dispatch("GET")
+
+        def do_POST(self):
+            self.dispatch("POST")
+
+        def do_PUT(self):
+            self.dispatch("PUT")
+
+        def do_DELETE(self):
+            self.dispatch("DELETE")
+
+        def do_PATCH(self):
+            self.dispatch("PATCH")
+
+        def dispatch(self, method):
+            parsed = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            content_type = self.headers.get("Content-Type") or ""
+            if content_type.startswith("multipart/form-data"):
+                # Parsed off the socket so large uploads cost the stand-in no memory
+                try:
+                    body = read_multipart(self.rfile, length, content_type)
+                except ValueError as e:
+                    self.close_connection = True
+                    return self.reply(400, {"error": str(e)})
+                raw = None
+            else:
+                raw = self.rfile.read(length) if length else b""
+            if not parsed.path.startswith("/api/"):
+                return self.reply(404, {"error": "Route not found"})
+            try:
+                if (method, parsed.path[len("/api/"):].strip("/")) in api.webhooks:
+                    body = raw
+                elif raw is not None:
+                    body = json.loads(raw) if raw else {}
+            except ValueError:
+                return self.reply(400, {"error": "Invalid JSON"})
+            query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+            started = time.perf_counter()
+            status, payload = api.handle(method, parsed.path[len("/api/"):].strip("/"), query, self.headers, body)
+            self.reply(status, payload, conditional=method == "GET", duration=time.perf_counter() - started,
+                       hashed=api.take_hash_time())
+
+        def reply(self, status, payload, conditional=False, duration=None, hashed=0.0):
+            data = json.dumps(payload).encode()
+            etag = f'"{hashlib.sha1(data).hexdigest()[:16]}"'
+            if conditional and status == 200 and self.headers.get("If-None-Match") == etag:
+                status, data = 304, b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if conditional and status in (200, 304):
+                self.send_header("ETag", etag)
+            if duration is not None and hashed:
+                # Password hashing split out of app time, as bcrypt would be
+                self.send_header("Server-Timing", f"hash;dur={hashed * 1000:.2f}, app;dur={(duration - hashed) * 1000:.2f}")
+            elif duration is not None:
+                self.send_header("Server-Timing", f"app;dur={duration * 1000:.2f}")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandInHandler
+
+
+class StandInHTTPServer(ThreadingHTTPServer):
+    # Login storms connect hundreds of clients at once; the default listen backlog of 5 resets them
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class StandInServer:
+    """Runs StandInAPI on a background thread; use as a context manager"""
+    def __init__(self, host="127.0.0.1", port=0, **api_options):
+        self.api = StandInAPI(**api_options)
+        self.httpd = StandInHTTPServer((host, port), make_standin_handler(self.api))
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="standin-api", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,83 @@
+import json
+import re
+
+from backend_test import AccessLogAnonymiser, REPLAY_PLACEHOLDER, access_log_record, read_access_log
+
+STUDENT_ID = "3f2b8c1e-9a4d-4e6f-8b7a-1c2d3e4f5a6b"
+CLASS_ID = "65a1f0c2b3d4e5f6a7b8c9d0"
+
+
+def record(target, query=None):
+    return access_log_record("GET", target, query, "admin", "2024-10-10T07:45:01")
+
+
+def test_path_ids_take_collection_from_previous_segment():
+    anonymised = AccessLogAnonymiser("salt").anonymise(record(f"/api/students/{STUDENT_ID}/attendance"))
+    students, pseudonym, attendance = anonymised["path"].split("/")
+    assert (students, attendance) == ("students", "attendance")
+    assert REPLAY_PLACEHOLDER.match(pseudonym).group(1) == "students"
+    assert STUDENT_ID not in json.dumps(anonymised, default=str)
+
+
+def test_ids_under_unknown_collections_are_records():
+    anonymised = AccessLogAnonymiser("salt").anonymise(record(f"notifications/{CLASS_ID}/read"))
+    assert REPLAY_PLACEHOLDER.match(anonymised["path"].split("/")[1]).group(1) == "record"
+
+
+def test_query_ids_text_and_emails():
+    anonymiser = AccessLogAnonymiser("salt")
+    anonymised = anonymiser.anonymise(record(
+        "attendance",
+        f"classId={CLASS_ID}&q=Adebayo&contact=mary@school.edu.ng&ref={STUDENT_ID}&limit=50&date=2024-10-10"))
+    query = anonymised["query"]
+    assert REPLAY_PLACEHOLDER.match(query["classId"]).group(1) == "classes"
+    assert REPLAY_PLACEHOLDER.match(query["q"]).group(1) == "text"
+    assert REPLAY_PLACEHOLDER.match(query["contact"]).group(1) == "text"
+    assert REPLAY_PLACEHOLDER.match(query["ref"]).group(1) == "record"
+    # Numbers, dates and other plain values carry no identity
+    assert query["limit"] == "50"
+    assert query["date"] == "2024-10-10"
+
+
+def test_same_salt_is_stable_and_different_salts_differ():
+    first = AccessLogAnonymiser("salt")
+    target = f"students/{STUDENT_ID}"
+    assert first.anonymise(record(target)) == first.anonymise(record(target))
+    assert first.anonymise(record(target)) == AccessLogAnonymiser("salt").anonymise(record(target))
+    assert first.anonymise(record(target))["path"] != AccessLogAnonymiser("pepper").anonymise(record(target))["path"]
+    # Different records stay distinguishable
+    other = f"students/{STUDENT_ID[:-1]}c"
+    assert first.anonymise(record(target))["path"] != first.anonymise(record(other))["path"]
+
+
+def test_numeric_segments_are_anonymised_but_numeric_query_values_are_not():
+    anonymised = AccessLogAnonymiser("salt").anonymise(record("classes/42", "page=3"))
+    assert REPLAY_PLACEHOLDER.match(anonymised["path"].split("/")[1]).group(1) == "classes"
+    assert anonymised["query"] == {"page": "3"}
+
+
+def test_already_anonymised_values_pass_through():
+    anonymiser = AccessLogAnonymiser("salt")
+    once = anonymiser.anonymise(record(f"students/{STUDENT_ID}", f"classId={CLASS_ID}&q=Mary"))
+    twice = anonymiser.anonymise(once)
+    assert twice["query"] == once["query"]
+
+
+def test_input_record_is_not_modified():
+    original = record(f"students/{STUDENT_ID}", "q=Mary")
+    snapshot = json.dumps(original, default=str)
+    AccessLogAnonymiser("salt").anonymise(original)
+    assert json.dumps(original, default=str) == snapshot
+
+
+def test_write_round_trips_through_read_access_log(tmp_path):
+    path = tmp_path / "anonymised.jsonl"
+    records = [record(f"students/{STUDENT_ID}", "q=Mary"), record("dashboard/stats")]
+    AccessLogAnonymiser("salt").write(records, str(path))
+    text = path.read_text()
+    assert STUDENT_ID not in text and "Mary" not in text
+    assert not re.search(r"\b\d{1,3}(\.\d{1,3}){3}\b", text)
+    replayed, skipped = read_access_log(str(path))
+    assert skipped == 0
+    assert [entry["path"].split("/")[0] for entry in replayed] == ["students", "dashboard"]
+    assert replayed[0]["timestamp"] == records[0]["timestamp"]
@@ -0,0 +1,103 @@
+import random
+
+from backend_test import BaselineStore, mann_whitney_u, sample_percentile
+
+
+def make_entry(samples, label="load", key="GET students admin"):
+    return {
+        "label": label,
+        "key": key,
+        "samples": samples,
+        "p95_ms": sample_percentile(samples, 95) if samples else 0.0,
+        "throughput_rps": 10.0
+    }
+
+
+def make_store(tmp_path, *runs):
+    store = BaselineStore(str(tmp_path / "baseline.jsonl"))
+    for samples in runs:
+        store.append([make_entry(samples)])
+    return store
+
+
+def test_mann_whitney_identical_samples_not_significant():
+    samples = [float(value) for value in range(1, 31)]
+    u, p = mann_whitney_u(samples, list(samples))
+    assert u == len(samples) ** 2 / 2
+    assert p > 0.4
+
+
+def test_mann_whitney_shifted_sample_significant():
+    baseline = [float(value) for value in range(1, 31)]
+    current = [value + 100 for value in baseline]
+    u, p = mann_whitney_u(current, baseline)
+    assert u == len(current) * len(baseline)
+    assert p < 0.001
+    # One-sided: the reverse direction is not a slowdown
+    assert mann_whitney_u(baseline, current)[1] > 0.999
+
+
+def test_mann_whitney_ties_use_average_ranks():
+    # Every current value ties with a baseline value: U counts each tie as half
+    u, p = mann_whitney_u([5.0, 5.0, 5.0], [5.0, 5.0, 5.0])
+    assert u == 4.5
+    assert p == 1.0  # all values tied, so there is no variance to test
+    u, p = mann_whitney_u([1.0, 2.0, 2.0, 3.0], [2.0, 2.0, 2.0, 2.0])
+    assert u == 8.0
+    assert 0.3 < p < 0.7
+
+
+def test_mann_whitney_empty_side():
+    assert mann_whitney_u([], [1.0, 2.0]) == (0.0, 1.0)
+    assert mann_whitney_u([1.0, 2.0], []) == (0.0, 1.0)
+
+
+def test_compare_identical_samples_not_regression(tmp_path):
+    rng = random.Random(1)
+    samples = [round(rng.uniform(40, 60), 3) for _ in range(50)]
+    store = make_store(tmp_path, samples, samples)
+    [row] = store.compare([make_entry(list(samples))])
+    assert row["status"] == "ok"
+    assert row["runs"] == 2
+    assert row["change"] == 0.0
+
+
+def test_compare_shifted_samples_regression(tmp_path):
+    rng = random.Random(2)
+    store = make_store(tmp_path, [round(rng.uniform(40, 60), 3) for _ in range(50)])
+    [row] = store.compare([make_entry([round(rng.uniform(80, 100), 3) for _ in range(50)])])
+    assert row["status"] == "regression"
+    assert row["change"] > 0.10
+    assert row["p_value"] < 0.05
+
+
+def test_compare_faster_samples_improved(tmp_path):
+    rng = random.Random(3)
+    store = make_store(tmp_path, [round(rng.uniform(80, 100), 3) for _ in range(50)])
+    [row] = store.compare([make_entry([round(rng.uniform(40, 60), 3) for _ in range(50)])])
+    assert row["status"] == "improved"
+
+
+def test_compare_enforces_min_samples(tmp_path):
+    store = make_store(tmp_path, [50.0, 51.0, 52.0])
+    [row] = store.compare([make_entry([500.0, 510.0, 520.0])], min_samples=5)
+    assert row["status"] == "too few samples"
+    [row] = store.compare([make_entry([500.0, 510.0, 520.0])], min_samples=3)
+    assert row["status"] == "regression"
+
+
+def test_compare_new_key_and_label(tmp_path):
+    store = make_store(tmp_path, [50.0] * 10)
+    rows = store.compare([make_entry([50.0] * 10, key="GET teachers admin"),
+                          make_entry([50.0] * 10)])
+    assert [row["status"] for row in rows] == ["new", "ok"]
+    [row] = store.compare([make_entry([50.0] * 10, label="soak")])
+    assert row["status"] == "new"
+
+
+def test_compare_pools_only_last_runs(tmp_path):
+    # An old slow run falls outside the window and no longer masks the regression
+    store = make_store(tmp_path, [200.0 + i for i in range(10)], *[[50.0 + i for i in range(10)]] * 2)
+    [row] = store.compare([make_entry([100.0 + i for i in range(10)])], runs=2)
+    assert row["runs"] == 2
+    assert row["status"] == "regression"
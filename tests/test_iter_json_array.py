@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from backend_test import iter_json_array
+
+RECORDS = [
+    {"id": 1, "name": "Adé Ọlábísí", "remarks": "closing ] inside a string", "score": 1250},
+    {"id": 2, "name": "张伟 🎓", "remarks": "brackets [[]] and \"quotes\", commas", "score": -3.5e2},
+    {"id": 3, "name": "Émile", "remarks": "\\] escaped backslash before ]", "tags": ["a", "]", {"x": []}]},
+    12345678901234567890,
+    "plain ] string",
+    None
+]
+
+
+def chunked(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7])
+def test_top_level_array(size):
+    data = json.dumps(RECORDS, ensure_ascii=False).encode()
+    assert list(iter_json_array(chunked(data, size))) == RECORDS
+
+
+@pytest.mark.parametrize("size", [1, 3, 7])
+def test_array_under_path(size):
+    payload = {"meta": {"note": "] not the array"}, "data": {"total": 6, "students": RECORDS}}
+    data = json.dumps(payload, ensure_ascii=False, indent=2).encode()
+    assert list(iter_json_array(chunked(data, size), path=("data", "students"))) == RECORDS
+
+
+@pytest.mark.parametrize("size", [1, 3, 7])
+def test_multibyte_characters_split_across_chunks(size):
+    records = [{"name": "🎓" * 5 + "ñ" * 3 + "中文"}, {"name": "€"}]
+    data = json.dumps(records, ensure_ascii=False).encode()
+    # Sizes not dividing the 4-byte emoji split it mid-sequence
+    assert any(chunk[-1:] >= b"\x80" for chunk in chunked(data, size))
+    assert list(iter_json_array(chunked(data, size))) == records
+
+
+def test_number_split_across_chunks():
+    assert list(iter_json_array([b"[12", b"34", b"5, 6", b"7]"])) == [12345, 67]
+
+
+def test_empty_array():
+    assert list(iter_json_array([b" [ ", b" ] "])) == []
+    assert list(iter_json_array([b'{"items": []}'], path=("items",))) == []
+
+
+def test_yields_before_input_ends():
+    def source():
+        yield b'[{"id": 1}, '
+        raise AssertionError("read past the first complete element")
+
+    assert next(iter_json_array(source())) == {"id": 1}
+
+
+def test_missing_key():
+    with pytest.raises(ValueError, match="not found"):
+        list(iter_json_array([b'{"other": [1, 2]}'], path=("students",)))
+
+
+def test_truncated_input():
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunked(b'[{"id": 1}, {"id"', 3)))
@@ -0,0 +1,72 @@
+import hashlib
+import io
+
+import pytest
+
+from backend_test import GeneratedFile, MultipartBody
+from standin_api import read_multipart
+
+BLOCK = 64 * 1024
+
+
+class RecordingStream(io.BytesIO):
+    """BytesIO that remembers the size of every read"""
+    def __init__(self, data):
+        super().__init__(data)
+        self.reads = []
+
+    def read(self, n=-1):
+        self.reads.append(n)
+        return super().read(n)
+
+
+def encode(size, fields=None):
+    body = MultipartBody(GeneratedFile(size, seed=7), "report.pdf", "application/pdf", fields=fields)
+    data = body.read()
+    return data, body.content_type, hashlib.sha256(GeneratedFile(size, seed=7).read()).hexdigest()
+
+
+@pytest.mark.parametrize("size", [0, 1, BLOCK - 1, BLOCK, BLOCK + 1, 3 * BLOCK + 5])
+def test_file_sizes(size):
+    data, content_type, digest = encode(size, fields={"category": "assignments"})
+    stream = RecordingStream(data)
+    form = read_multipart(stream, len(data), content_type)
+    assert form["category"] == "assignments"
+    assert form["file"] == {"filename": "report.pdf", "type": "application/pdf", "size": size, "sha256": digest}
+    assert max(stream.reads) <= BLOCK
+    assert stream.tell() == len(data)
+
+
+@pytest.mark.parametrize("block", [1, 7, 41])
+def test_delimiter_split_across_reads(block):
+    data, content_type, digest = encode(1000, fields={"note": "x" * 50})
+    form = read_multipart(io.BytesIO(data), len(data), content_type, block=block)
+    assert form["note"] == "x" * 50
+    assert form["file"]["size"] == 1000
+    assert form["file"]["sha256"] == digest
+
+
+def test_quoted_boundary():
+    data, content_type, _ = encode(10)
+    boundary = content_type.split("boundary=")[1]
+    form = read_multipart(io.BytesIO(data), len(data), f'multipart/form-data; boundary="{boundary}"')
+    assert form["file"]["size"] == 10
+
+
+def test_missing_boundary_parameter():
+    with pytest.raises(ValueError, match="without a boundary"):
+        read_multipart(io.BytesIO(b""), 0, "multipart/form-data")
+
+
+def test_missing_closing_boundary():
+    data, content_type, _ = encode(BLOCK)
+    truncated = data[:-len("--\r\n") - 40]
+    with pytest.raises(ValueError, match="closing boundary"):
+        read_multipart(io.BytesIO(truncated), len(truncated), content_type)
+
+
+def test_truncated_headers():
+    data, content_type, _ = encode(10)
+    truncated = data[:data.index(b"\r\n\r\n")]
+    with pytest.raises(ValueError, match="truncated multipart headers"):
+        read_multipart(io.BytesIO(truncated), len(truncated), content_type)